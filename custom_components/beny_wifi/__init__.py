@@ -22,10 +22,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # FIXED: Pass entry as the second parameter
     coordinator = BenyWifiUpdateCoordinator(hass, entry, ip_address, port, scan_interval)
     
-    # Perform the first update to ensure connection works
+    # Open UDP endpoint and perform the first update to ensure connection works
     try:
+        await coordinator.async_connect()
         await coordinator.async_config_entry_first_refresh()
     except Exception as ex:
+        await coordinator.async_close()
         _LOGGER.error(f"Error setting up coordinator: {ex}")
         raise ConfigEntryNotReady from ex
     
@@ -40,9 +42,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     
     # setup services
     await async_setup_services(hass)
+
+    # options are read at setup, reload entry when they change
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
     
     return True
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload config entry after options update."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     _LOGGER.info("Unloading Beny WiFi integration")
@@ -52,6 +61,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     
     # Clean up resources
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        await data["coordinator"].async_close()
     
     return unload_ok
\ No newline at end of file
@@ -0,0 +1,330 @@
+"""Charger client without Home Assistant.
+
+Polls and commands a single charger through ChargerTransport: frames,
+retries, response checks and snapshot conversion. The coordinator owns a
+client and delegates to it, Home Assistant scheduling, circuit breaker and
+entity state are left to the coordinator, so the client can also be used
+standalone, e.g. by the fleet poller in tools.
+"""
+import asyncio
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+import logging
+import time
+from typing import Any
+
+from .codec import UNKNOWN_MESSAGE, build_frame, get_message_type
+from .communication import read_message
+from .const import CHARGER_COMMAND, CLIENT_MESSAGE, EXPECTED_RESPONSES, REQUEST_TYPE, SERVER_MESSAGE
+from .conversions import convert_schedule, convert_timer, get_hex
+from .transport import ChargerTransport
+from .validation import SnapshotValidator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Reads are idempotent and retried more eagerly than state changing writes
+READ_RETRIES = 4
+WRITE_RETRIES = 2
+
+# Data request types are polled at own rates, due requests are merged into one refresh
+POLL_MESSAGES = {
+    REQUEST_TYPE.VALUES: CLIENT_MESSAGE.REQUEST_DATA,
+    REQUEST_TYPE.DLB: CLIENT_MESSAGE.REQUEST_DLB,
+    REQUEST_TYPE.SETTINGS: CLIENT_MESSAGE.REQUEST_DATA,
+    REQUEST_TYPE.MODEL: CLIENT_MESSAGE.REQUEST_DATA,
+}
+REQUIRED_REQUESTS = (REQUEST_TYPE.VALUES, REQUEST_TYPE.DLB)
+
+ACCESS_DENIED_ERROR = "device denied request, check pin"
+
+
+class ChargerError(Exception):
+    """Charger did not respond or its response could not be used."""
+
+
+def _utcnow() -> datetime:
+    # clock of standalone client, the coordinator passes homeassistant.util.dt.utcnow
+    return datetime.now(UTC)
+
+
+def snapshot_values(
+    request_type: REQUEST_TYPE, data: dict[str, Any], now: datetime | None = None
+) -> dict[str, Any]:
+    """Convert decoded response of request type to snapshot values.
+
+    Args:
+        request_type (REQUEST_TYPE): request the response answered
+        data (dict): decoded message, converted in place
+        now (datetime, optional): current time in UTC for timer timestamps
+
+    Returns:
+        dict: snapshot values
+
+    """
+    if request_type == REQUEST_TYPE.VALUES:
+        return _values_snapshot(data, now or _utcnow())
+
+    # ORIGINAL v0.7.0 DLB HANDLING - UNCHANGED
+    if request_type == REQUEST_TYPE.DLB:
+        return {
+            'grid_power': float(data['grid_power']) / 10,
+            'house_power': float(data['house_power']) / 10,
+            'ev_power': float(data['ev_power']) / 10,
+            'solar_power': float(data['solar_power']) / 10,
+        }
+
+    if request_type == REQUEST_TYPE.SETTINGS:
+        return {
+            'schedule': data['schedule'],
+            'weekdays': data['weekdays'],
+            'schedule_start': f"{data['timer_start_h']}:{data['timer_start_min']}",
+            'schedule_end': f"{data['timer_end_h']}:{data['timer_end_min']}",
+        }
+
+    return {'model': data['model']}
+
+
+def _values_snapshot(data: dict[str, Any], now: datetime) -> dict[str, Any]:
+    """Convert charger values to snapshot values."""
+    # Set unset state to both start and end time if timer is not set at all
+    if data['timer_state'] == 'UNSET':
+        start = "not_set"
+        end = "not_set"
+    # if timer has START_TIME or START_END_TIME value
+    elif data['timer_state'] != 'END_TIME':
+        # Convert timer values to timestamps
+        start = now.replace(
+            hour=data['timer_start_h'], minute=data['timer_start_min'], second=0, microsecond=0
+        )
+
+        # If start is before current time, move it to the next day
+        if start < now:
+            start += timedelta(days=1)
+
+        if data['timer_state'] == 'START_END_TIME':
+            end = now.replace(
+                hour=data['timer_end_h'], minute=data['timer_end_min'], second=0, microsecond=0
+            )
+
+            # If end is before current time, move it to the next day
+            if end < now:
+                end += timedelta(days=1)
+
+            # If end is also before start, move end to the next day of start
+            if end <= start:
+                end += timedelta(days=1)
+        else:
+            # timer end is not set
+            end = "not_set"
+    else:
+        start = "not_set"
+
+        # Convert timer value to timestamp
+        end = now.replace(
+            hour=data['timer_end_h'], minute=data['timer_end_min'], second=0, microsecond=0
+        )
+
+    data['timer_start'] = start
+    data['timer_end'] = end
+
+    data['charger_state'] = data['state'].lower()
+
+    data['power'] = float(data['power']) / 10
+    data['total_kwh'] = float(data['total_kwh'])
+    data['temperature'] = int(data['temperature'] - 100)
+
+    return data
+
+
+class ChargerClient:
+    """Polls and commands single charger."""
+
+    def __init__(
+        self,
+        ip_address: str,
+        port: int,
+        pin: str,
+        validator: SnapshotValidator | None = None,
+        now: Callable[[], datetime] = _utcnow,
+    ) -> None:
+        """Initialize client, transport is opened on first request.
+
+        Args:
+            ip_address (str): charger address
+            port (int): charger UDP port
+            pin (str): pin as hex, see conversions.convert_pin_to_hex
+            validator (SnapshotValidator, optional): validator of polled values, default bounds if not given
+            now (Callable, optional): clock for timer timestamps of snapshot, current time in UTC by default
+
+        """
+        self.ip_address = ip_address
+        self.transport = ChargerTransport(ip_address, port)
+        self.pin = pin
+        self.validator = validator or SnapshotValidator()
+        self.now = now
+        # last valid response frame and its decoded message per request type
+        self._frames: dict[REQUEST_TYPE, tuple[bytes, dict[str, Any]]] = {}
+
+    def close(self) -> None:
+        """Close transport."""
+        self.transport.close()
+
+    def build_request(self, message: CLIENT_MESSAGE, params: dict | None = None) -> bytes:
+        """Build request frame with pin, frames are cached."""
+        return build_frame(message, {"pin": self.pin, **(params or {})})
+
+    def data_request(self, request_type: REQUEST_TYPE) -> bytes:
+        """Build poll request frame of request type."""
+        return self.build_request(POLL_MESSAGES[request_type], {"request_type": get_hex(request_type.value)})
+
+    async def request(
+        self, request: bytes, retries: int = WRITE_RETRIES, expect=None, timeout: float | None = None
+    ) -> bytes:
+        """Send request and wait for response.
+
+        Timeout per attempt adapts to measured round trip time unless given.
+        If expected response messages are given, request can run concurrently with others.
+
+        Raises:
+            ChargerError: no response after retries or socket error
+
+        """
+        try:
+            return await self.transport.async_request(request, retries, timeout, expect)
+        except asyncio.TimeoutError as err:
+            raise ChargerError(f"timed out after {retries} attempts") from err
+        except OSError as err:
+            raise ChargerError(str(err)) from err
+
+    def parse_response(self, request_type: REQUEST_TYPE, response: bytes) -> dict[str, Any]:
+        """Parse response to snapshot values, frame identical to previous one is not decoded again.
+
+        Raises:
+            ChargerError: checksum not valid, access denied or unknown response
+
+        """
+        frame, data = self._frames.get(request_type, (None, None))
+        if frame != response:
+            start = time.perf_counter()
+            data = read_message(response)
+            self.transport.quality.add_response(data is not None, time.perf_counter() - start)
+
+            if data is None:
+                raise ChargerError("checksum not valid")
+            if data["message_type"] == str(SERVER_MESSAGE.ACCESS_DENIED):
+                raise ChargerError(ACCESS_DENIED_ERROR)
+            if data["message_type"] == UNKNOWN_MESSAGE:
+                raise ChargerError("unknown response message")
+
+            self._frames[request_type] = (response, data)
+        else:
+            self.transport.quality.add_response(True)
+
+        # decoded message is kept for next poll, conversions work on a copy
+        return snapshot_values(request_type, dict(data), self.now())
+
+    async def poll(
+        self,
+        request_types: tuple[REQUEST_TYPE, ...] = REQUIRED_REQUESTS,
+        received: dict[REQUEST_TYPE, bytes] | None = None,
+    ) -> dict[str, Any]:
+        """Poll request types concurrently and merge validated responses to snapshot.
+
+        Args:
+            request_types (tuple): request types polled
+            received (dict, optional): responses already received per request type, these are not requested again
+
+        Raises:
+            ChargerError: values or DLB request failed, failures of others are only logged
+
+        """
+        received = received or {}
+        requested = [request_type for request_type in request_types if request_type not in received]
+        quality = self.transport.quality
+        quality.start_poll()
+        try:
+            responses = await asyncio.gather(
+                *(
+                    self.request(self.data_request(request_type), READ_RETRIES, EXPECTED_RESPONSES[request_type])
+                    for request_type in requested
+                ),
+                return_exceptions=True,
+            )
+        finally:
+            quality.end_poll()
+        responses = {**dict(zip(requested, responses, strict=True)), **received}
+
+        data = {}
+        for request_type in request_types:
+            response = responses[request_type]
+            try:
+                if isinstance(response, BaseException):
+                    raise response
+                data.update(self.validator.validate(self.parse_response(request_type, response)))
+            except Exception as err:
+                if request_type in REQUIRED_REQUESTS:
+                    raise ChargerError(f"{request_type.name.lower()}: {err}") from err
+                _LOGGER.debug("Failed to fetch %s from %s: %s", request_type.name.lower(), self.ip_address, err)
+        return data
+
+    async def _command(self, request: bytes, retries: int = WRITE_RETRIES) -> bytes:
+        """Send command, raise ChargerError if charger denied it."""
+        response = await self.request(request, retries)
+        if get_message_type(response) is SERVER_MESSAGE.ACCESS_DENIED:
+            raise ChargerError(ACCESS_DENIED_ERROR)
+        return response
+
+    async def send_command(self, command: CHARGER_COMMAND) -> None:
+        """Start or stop charging."""
+        await self._command(
+            self.build_request(CLIENT_MESSAGE.SEND_CHARGER_COMMAND, {"charger_command": get_hex(command.value)})
+        )
+
+    async def set_timer(self, start_time: str, end_time: str | None = None) -> None:
+        """Set charging timer, times as HH:MM."""
+        await self._command(self.build_request(CLIENT_MESSAGE.SET_TIMER, convert_timer(start_time, end_time)))
+
+    async def reset_timer(self) -> None:
+        """Reset charging timer."""
+        await self._command(self.build_request(CLIENT_MESSAGE.RESET_TIMER))
+
+    async def set_schedule(self, weekdays: list[bool], start_time: str, end_time: str) -> None:
+        """Set weekly charging schedule, weekdays from Sunday to Saturday like in the set_schedule service."""
+        await self._command(
+            self.build_request(CLIENT_MESSAGE.SET_SCHEDULE, convert_schedule(reversed(weekdays), start_time, end_time))
+        )
+
+    async def request_schedule(self) -> dict[str, Any]:
+        """Read weekly charging schedule."""
+        response = await self._command(self.build_request(CLIENT_MESSAGE.REQUEST_SETTINGS), READ_RETRIES)
+        data = read_message(response, SERVER_MESSAGE.SEND_SETTINGS)
+        if data is None:
+            raise ChargerError("checksum not valid")
+        return {
+            "schedule": data["schedule"],
+            "weekdays": data["weekdays"],
+            "start_time": f"{data['timer_start_h']}:{data['timer_start_min']}",
+            "end_time": f"{data['timer_end_h']}:{data['timer_end_min']}",
+        }
+
+    async def set_max_current(self, max_current: int) -> None:
+        """Set maximum charging current, 6 - 32 A."""
+        if not 6 <= max_current <= 32:
+            raise ValueError("Maximum current must be between 6 and 32 amps")
+        await self._command(self.build_request(CLIENT_MESSAGE.SET_MAX_CURRENT, {"max_current": get_hex(max_current)}))
+
+    async def set_max_session_consumption(self, maximum_consumption: int) -> None:
+        """Set maximum consumption of charging session, kWh."""
+        await self._command(
+            self.build_request(
+                CLIENT_MESSAGE.SET_MAX_SESSION_CONSUMPTION, {"maximum_consumption": get_hex(maximum_consumption)}
+            )
+        )
+
+    async def set_max_monthly_consumption(self, maximum_consumption: int) -> None:
+        """Set maximum monthly consumption, kWh."""
+        await self._command(
+            self.build_request(
+                CLIENT_MESSAGE.SET_MAX_MONTHLY_CONSUMPTION, {"maximum_consumption": get_hex(maximum_consumption, 4)}
+            )
+        )
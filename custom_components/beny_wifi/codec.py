@@ -0,0 +1,375 @@
+"""Compiled frame codec.
+
+Message layouts in const.py are compiled once at import into decoders with fixed
+offsets and precomputed conversions. Decoders work on ascii hex frames both as
+str and as the raw bytes returned by the socket, so received datagrams don't
+need to be decoded to str first.
+
+Frames are identified by their header (message_type byte and message_id) with a
+single dict lookup that resolves straight to the compiled decoder. Identification
+table is in const.MESSAGE_IDS and can be extended with register_message(). Data
+responses sharing a header are told apart by their request type byte
+(const.MESSAGE_REQUEST_TYPES).
+
+Client message hex templates are pre-split into literal and placeholder segments.
+Checksum is accumulated segment by segment while the frame is built, and fully
+built frames are cached, as poll requests are identical between polls.
+"""
+from binascii import Error as BinasciiError, unhexlify
+from collections import Counter
+from enum import Enum
+from functools import lru_cache
+import logging
+import re
+
+from .const import CLIENT_MESSAGE, COMMON, FIELD, MESSAGE_IDS, MESSAGE_REQUEST_TYPES, SERVER_MESSAGE
+from .conversions import convert_weekdays_to_dict, get_model
+
+_LOGGER = logging.getLogger(__name__)
+
+# errors raised by conversions for values that are not valid for the field
+_CONVERSION_ERRORS = (ValueError, KeyError, IndexError)
+
+UNKNOWN_MESSAGE = "UNKNOWN"
+
+# message_type and message_id are adjacent in header, read as one integer
+_HEADER_ID = slice(
+    COMMON.FIXED_PART.value["structure"]["message_type"].start,
+    COMMON.FIXED_PART.value["structure"]["message_id"].stop,
+)
+
+
+def checksum_valid(data: bytes | str) -> bool:
+    """Validate checksum of ascii hex frame.
+
+    Args:
+        data (bytes | str): message as ascii hex
+
+    Returns:
+        bool: checksums match
+
+    """
+    try:
+        return sum(unhexlify(data[:-2])) & 0xFF == int(data[-2:], 16)
+    except (BinasciiError, ValueError):
+        # odd length or non-hex content, frame is broken
+        return False
+
+
+def _enum_names(enum_cls: type[Enum]):
+    """Precompute value to member name lookup for enum class.
+
+    Contiguous enums starting from zero are looked up from tuple, others from dict.
+    """
+    values = [member.value for member in enum_cls]
+    if sorted(values) == list(range(len(values))):
+        return tuple(enum_cls(value).name for value in range(len(values))).__getitem__
+    return {member.value: member.name for member in enum_cls}.__getitem__
+
+
+def _deci(value: int) -> float:
+    return value / 10
+
+
+def _signed_deci(value: int) -> float:
+    # 16-bit two's complement, e.g. grid power is negative when exporting
+    if value >= 0x8000:
+        value -= 0x10000
+    return value / 10
+
+
+def _ip_reader(pos: slice):
+    """Build reader for dotted ip address stored one byte per step."""
+    octets = tuple(slice(i, i + 2) for i in range(pos.start, pos.stop, pos.step))
+
+    def read_ip(data):
+        return ".".join([str(int(data[octet], 16)) for octet in octets])
+
+    return read_ip
+
+
+def _model(data: bytes | str) -> str:
+    # conversion is looked up on every call, like convert_weekdays_to_dict, so it can be patched
+    return get_model(data)
+
+
+def _weekdays(msg: dict) -> None:
+    weekdays = msg["weekdays"]
+    if weekdays is None:
+        return
+    msg["schedule"] = "enabled" if weekdays else "disabled"
+    msg["weekdays"] = convert_weekdays_to_dict(weekdays)
+
+
+_VALUE_CONVERSIONS = {
+    FIELD.DECI: _deci,
+    FIELD.SIGNED_DECI: _signed_deci,
+}
+
+
+class FrameDecoder:
+    """Decoder compiled from a message definition."""
+
+    __slots__ = ("_fields", "_frame_fields", "_post", "message", "name")
+
+    def __init__(self, message: SERVER_MESSAGE | CLIENT_MESSAGE | None) -> None:
+        """Compile message structure to decoding steps."""
+        self.message = message
+        self.name = UNKNOWN_MESSAGE if message is None else str(message)
+
+        # header message_type byte is replaced by the resolved message definition
+        structure = dict(COMMON.FIXED_PART.value["structure"])
+        del structure["message_type"]
+        conversions = {}
+        if message is not None:
+            structure.update(message.value["structure"])
+            conversions = message.value.get("conversions", {})
+
+        fields = []
+        frame_fields = []
+        post = []
+        for param, pos in structure.items():
+            conversion = conversions.get(param)
+            if conversion is FIELD.MODEL:
+                frame_fields.append((param, _model))
+            elif conversion is FIELD.IP:
+                frame_fields.append((param, _ip_reader(pos)))
+            elif conversion is FIELD.WEEKDAYS:
+                fields.append((param, pos, None))
+                post.append(_weekdays)
+            elif isinstance(conversion, type) and issubclass(conversion, Enum):
+                fields.append((param, pos, _enum_names(conversion)))
+            else:
+                fields.append((param, pos, _VALUE_CONVERSIONS.get(conversion)))
+
+        self._fields = tuple(fields)
+        self._frame_fields = tuple(frame_fields)
+        self._post = tuple(post)
+
+    def decode(self, data: bytes | str) -> dict:
+        """Decode ascii hex frame to dict.
+
+        Args:
+            data (bytes | str): message as ascii hex
+
+        Returns:
+            dict: translated parameters
+
+        """
+        msg = {"message_type": self.name}
+        for param, pos, convert in self._fields:
+            try:
+                value = int(data[pos], 16)
+                msg[param] = value if convert is None else convert(value)
+            except _CONVERSION_ERRORS:
+                _LOGGER.error("Invalid value for %s: %s", param, data[pos])
+                msg[param] = None
+
+        for param, read in self._frame_fields:
+            msg[param] = read(data)
+
+        for step in self._post:
+            step(msg)
+
+        return msg
+
+
+UNKNOWN_DECODER = FrameDecoder(None)
+
+DECODERS: dict[SERVER_MESSAGE | CLIENT_MESSAGE, FrameDecoder] = {
+    message: FrameDecoder(message) for message in (*SERVER_MESSAGE, *CLIENT_MESSAGE)
+}
+
+
+def get_decoder(message: SERVER_MESSAGE | CLIENT_MESSAGE | None) -> FrameDecoder:
+    """Get compiled decoder for message definition."""
+    return DECODERS.get(message, UNKNOWN_DECODER)
+
+
+# (message_type << 16 | message_id) -> decoder
+_DISPATCH: dict[int, FrameDecoder] = {}
+# message_id -> decoder, for messages identified by id regardless of message type
+_DISPATCH_ANY_TYPE: dict[int, FrameDecoder] = {}
+# message_id -> request type byte -> decoder, for responses sharing message id
+_DISPATCH_REQUEST_TYPE: dict[int, dict[int, FrameDecoder]] = {}
+_REQUEST_TYPE = slice(10, 12)
+
+# count of frames that could not be identified by (message_type, message_id)
+UNKNOWN_FRAMES: Counter = Counter()
+
+
+def register_message(
+    message_type: int | None,
+    message_id: int,
+    message: SERVER_MESSAGE | CLIENT_MESSAGE,
+    request_type: int | None = None,
+) -> None:
+    """Register message definition for frame header.
+
+    Args:
+        message_type (int | None): message type byte, None matches any message type
+        message_id (int): message id
+        message (SERVER_MESSAGE | CLIENT_MESSAGE): message definition for the frame
+        request_type (int | None): request type byte, frames with message id are then told apart by it
+
+    """
+    decoder = get_decoder(message)
+    if request_type is not None:
+        _DISPATCH_REQUEST_TYPE.setdefault(message_id, {})[request_type] = decoder
+    elif message_type is None:
+        _DISPATCH_ANY_TYPE[message_id] = decoder
+    else:
+        _DISPATCH[message_type << 16 | message_id] = decoder
+
+
+for (_message_type, _message_id), _message in MESSAGE_IDS.items():
+    register_message(_message_type, _message_id, _message)
+for (_message_id, _request_type), _message in MESSAGE_REQUEST_TYPES.items():
+    register_message(None, _message_id, _message, _request_type)
+
+
+def identify(data: bytes | str) -> FrameDecoder | None:
+    """Find decoder for frame by its header.
+
+    Args:
+        data (bytes | str): message as ascii hex
+
+    Returns:
+        FrameDecoder | None: decoder, None if frame is not known
+
+    """
+    try:
+        key = int(data[_HEADER_ID], 16)
+    except ValueError:
+        key = -1
+
+    decoder = None
+    by_request_type = _DISPATCH_REQUEST_TYPE.get(key & 0xFFFF)
+    if by_request_type is not None:
+        try:
+            decoder = by_request_type.get(int(data[_REQUEST_TYPE], 16))
+        except ValueError:
+            pass
+
+    decoder = decoder or _DISPATCH.get(key) or _DISPATCH_ANY_TYPE.get(key & 0xFFFF)
+    if decoder is None:
+        header = (key >> 16, key & 0xFFFF) if key >= 0 else None
+        UNKNOWN_FRAMES[header] += 1
+        if UNKNOWN_FRAMES[header] == 1:
+            _LOGGER.warning("Unknown message (message_type, message_id): %s, frame: %s", header, data)
+    return decoder
+
+
+def get_message_type(data: bytes | str) -> CLIENT_MESSAGE | SERVER_MESSAGE | None:
+    """Get message structure by id.
+
+    Args:
+        data (bytes | str): message as ascii hex
+
+    Returns:
+        CLIENT_MESSAGE | SERVER_MESSAGE | None: message definition, None if not known
+
+    """
+    decoder = identify(data)
+    return decoder.message if decoder else None
+
+
+_PLACEHOLDER = re.compile(r"\[(\w+)\]")
+CHECKSUM_PARAM = "checksum"
+
+
+def _byte_sum(hex_str: str, odd: bool) -> int:
+    """Sum of hex string as bytes, when it starts at odd or even position in frame.
+
+    Nibbles at even positions of the frame are high nibbles of a byte. String starting
+    at odd position is padded from the front to align it with frame bytes.
+    """
+    if odd:
+        hex_str = "0" + hex_str
+    if len(hex_str) & 1:
+        hex_str += "0"
+    return sum(unhexlify(hex_str))
+
+
+class MessageTemplate:
+    """Client message hex template split to literal and placeholder segments."""
+
+    __slots__ = ("_segments", "message")
+
+    def __init__(self, message: CLIENT_MESSAGE) -> None:
+        """Split template to segments and precompute checksums of literals."""
+        self.message = message
+
+        # [literal, param, literal, param, ..., literal]
+        parts = _PLACEHOLDER.split(message.value["hex"])
+        if parts[-2:] != [CHECKSUM_PARAM, ""]:
+            raise ValueError(f"{message.name}: template must end with [{CHECKSUM_PARAM}]")
+
+        # literal position in frame only depends on parity of preceding segments lengths,
+        # so literal sums are precomputed for both alignments
+        self._segments = tuple(
+            (literal, (_byte_sum(literal, False), _byte_sum(literal, True)), param)
+            for literal, param in zip(parts[0:-2:2], [*parts[1:-2:2], None], strict=True)
+        )
+
+    def build(self, params: dict) -> str:
+        """Build message from template.
+
+        Args:
+            params (dict): parameters as dict to be appended to message {"parameter": "value"}
+
+        Returns:
+            str: ascii hex string
+
+        """
+        frame = []
+        checksum = 0
+        odd = False
+        for literal, sums, param in self._segments:
+            frame.append(literal)
+            checksum += sums[odd]
+            odd ^= len(literal) & 1
+
+            if param is None:
+                break
+
+            try:
+                value = params[param]
+                checksum += _byte_sum(value, odd)
+            except KeyError as err:
+                raise ValueError(f"{self.message.name}: missing parameter {param}") from err
+            except BinasciiError as err:
+                raise ValueError(f"{self.message.name}: {param} is not hex: {value}") from err
+
+            frame.append(value)
+            odd ^= len(value) & 1
+
+        frame.append(f"{checksum & 0xFF:02x}")
+        return "".join(frame)
+
+
+TEMPLATES: dict[CLIENT_MESSAGE, MessageTemplate] = {
+    message: MessageTemplate(message) for message in CLIENT_MESSAGE
+}
+
+
+@lru_cache(maxsize=256)
+def _cached_frame(message: CLIENT_MESSAGE, params: tuple) -> bytes:
+    return TEMPLATES[message].build(dict(params)).encode("ascii")
+
+
+def build_frame(message: CLIENT_MESSAGE, params: dict) -> bytes:
+    """Build ascii hex frame ready to be sent to charger.
+
+    Frames are cached by message and parameters, so repeating requests like polls are
+    only built once.
+
+    Args:
+        message (CLIENT_MESSAGE): message type to be built
+        params (dict): parameters as dict {"parameter": "value"}
+
+    Returns:
+        bytes: ascii hex frame
+
+    """
+    return _cached_frame(message, tuple(sorted(params.items())))
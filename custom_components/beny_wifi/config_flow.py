@@ -6,22 +6,41 @@ import socket
 import voluptuous as vol
 
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import async_get as async_get_device_registry
 
 from .communication import build_message, read_message
 from .const import (
     CHARGER_TYPE,
     CLIENT_MESSAGE,
+    CONF_ACTIVE_INTERVAL,
+    CONF_DLB_INTERVAL,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_IDLE_INTERVAL,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_MODEL_INTERVAL,
     CONF_PIN,
+    CONF_RECORD_FRAMES,
     CONF_SERIAL,
+    CONF_SETTINGS_INTERVAL,
+    CONF_SPIKE_WINDOW,
+    DEADBAND_DEFAULTS,
+    DEFAULT_ACTIVE_INTERVAL,
+    DEFAULT_DLB_INTERVAL,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_IDLE_INTERVAL,
+    DEFAULT_MIN_WRITE_INTERVAL,
+    DEFAULT_MODEL_INTERVAL,
     DEFAULT_PORT,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SETTINGS_INTERVAL,
     DLB,
     DLB_CHARGERS,
     DOMAIN,
     IP_ADDRESS,
     MODEL,
     PORT,
+    POWER_LIMIT_FIELDS,
     REQUEST_TYPE,
     SCAN_INTERVAL,
     SERIAL,
@@ -29,6 +48,7 @@ from .const import (
     THREE_PHASE_CHARGERS,
 )
 from .conversions import convert_pin_to_hex, convert_serial_to_hex, get_hex
+from .validation import DEFAULT_BOUNDS, DEFAULT_SPIKE_WINDOW, SPIKE_WINDOWS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -42,6 +62,12 @@ class BenyWifiConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle user initialized config flow."""
         self._errors = {}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Get options flow for this handler."""
+        return BenyWifiOptionsFlow()
+
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
 
@@ -236,3 +262,41 @@ class BenyWifiConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             return dev_data  # noqa: TRY300
 
         return await asyncio.to_thread(sync_socket_communication)
+
+class BenyWifiOptionsFlow(config_entries.OptionsFlow):
+    """Handle options for beny-wifi."""
+
+    async def async_step_init(self, user_input=None):
+        """Manage polling, validation and state write options."""
+
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        intervals = {
+            CONF_ACTIVE_INTERVAL: DEFAULT_ACTIVE_INTERVAL,
+            CONF_IDLE_INTERVAL: DEFAULT_IDLE_INTERVAL,
+            CONF_DLB_INTERVAL: DEFAULT_DLB_INTERVAL,
+            CONF_SETTINGS_INTERVAL: DEFAULT_SETTINGS_INTERVAL,
+            CONF_MODEL_INTERVAL: DEFAULT_MODEL_INTERVAL,
+            CONF_HEARTBEAT_INTERVAL: DEFAULT_HEARTBEAT_INTERVAL,
+        }
+
+        schema = {
+            vol.Required(key, default=options.get(key, default)): vol.All(int, vol.Range(min=1))
+            for key, default in intervals.items()
+        }
+        schema[vol.Required(
+            CONF_MIN_WRITE_INTERVAL, default=options.get(CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL)
+        )] = vol.All(int, vol.Range(min=0))
+        for key, default in DEADBAND_DEFAULTS.items():
+            schema[vol.Required(key, default=options.get(key, default))] = vol.All(vol.Coerce(float), vol.Range(min=0))
+        for key, fields in POWER_LIMIT_FIELDS.items():
+            default = DEFAULT_BOUNDS[fields[0]].max
+            schema[vol.Required(key, default=options.get(key, default))] = vol.All(vol.Coerce(float), vol.Range(min=0))
+        schema[vol.Required(
+            CONF_SPIKE_WINDOW, default=options.get(CONF_SPIKE_WINDOW, DEFAULT_SPIKE_WINDOW)
+        )] = vol.In(SPIKE_WINDOWS)
+        schema[vol.Required(CONF_RECORD_FRAMES, default=options.get(CONF_RECORD_FRAMES, False))] = bool
+
+        return self.async_show_form(step_id="init", data_schema=vol.Schema(schema))
@@ -1,12 +1,10 @@
 """Constants for custom component."""
 from enum import Enum  # noqa: D100
-import logging
 from typing import Final
 
-from homeassistant.const import Platform
-
-# Updated to include NUMBER and BUTTON platforms
-PLATFORMS: Final = [Platform.SENSOR, Platform.NUMBER, Platform.BUTTON]
+# Updated to include NUMBER and BUTTON platforms. Values of homeassistant.const.Platform,
+# as strings so that protocol definitions here can be imported without Home Assistant.
+PLATFORMS: Final = ["sensor", "number", "button"]
 
 NAME: Final = "Beny Wifi"
 DOMAIN: Final = "beny_wifi"
@@ -20,62 +18,60 @@ SCAN_INTERVAL: Final = "update_interval"
 DEFAULT_SCAN_INTERVAL: Final = 30
 DEFAULT_PORT = 3333 # default listening port (at least for"BCP-AT1N-L)
 
+# Options, polling cadence by charger state
+CONF_ACTIVE_INTERVAL: Final = "active_interval"
+CONF_IDLE_INTERVAL: Final = "idle_interval"
+# Options, polling rates of other request types
+CONF_DLB_INTERVAL: Final = "dlb_interval"
+CONF_SETTINGS_INTERVAL: Final = "settings_interval"
+CONF_MODEL_INTERVAL: Final = "model_interval"
+
+DEFAULT_ACTIVE_INTERVAL: Final = 5
+DEFAULT_IDLE_INTERVAL: Final = 300
+DEFAULT_DLB_INTERVAL: Final = 2
+DEFAULT_SETTINGS_INTERVAL: Final = 900
+DEFAULT_MODEL_INTERVAL: Final = 86400
+
+# Options, state writes of measurement sensors. Value change within deadband is not
+# written, writes are rate limited and suppressed changes are written by heartbeat.
+CONF_VOLTAGE_DEADBAND: Final = "voltage_deadband"
+CONF_CURRENT_DEADBAND: Final = "current_deadband"
+CONF_POWER_DEADBAND: Final = "power_deadband" # relative, percent of last written value
+CONF_TEMPERATURE_DEADBAND: Final = "temperature_deadband"
+CONF_MIN_WRITE_INTERVAL: Final = "min_write_interval"
+CONF_HEARTBEAT_INTERVAL: Final = "heartbeat_interval"
+
+DEADBAND_DEFAULTS: Final = {
+    CONF_VOLTAGE_DEADBAND: 2.0,
+    CONF_CURRENT_DEADBAND: 0.0,
+    CONF_POWER_DEADBAND: 2.0,
+    CONF_TEMPERATURE_DEADBAND: 1.0,
+}
+DEFAULT_MIN_WRITE_INTERVAL: Final = 0
+DEFAULT_HEARTBEAT_INTERVAL: Final = 15 # minutes
+
+# Options, validation of charger values. Maximum power (kW) per fields it limits,
+# defaults are in validation.DEFAULT_BOUNDS
+CONF_MAX_CHARGER_POWER: Final = "max_charger_power"
+CONF_MAX_SOLAR_POWER: Final = "max_solar_power"
+CONF_MAX_GRID_POWER: Final = "max_grid_power"
+CONF_MAX_HOUSE_POWER: Final = "max_house_power"
+POWER_LIMIT_FIELDS: Final = {
+    CONF_MAX_CHARGER_POWER: ("power", "ev_power"),
+    CONF_MAX_SOLAR_POWER: ("solar_power",),
+    CONF_MAX_GRID_POWER: ("grid_power",),
+    CONF_MAX_HOUSE_POWER: ("house_power",),
+}
+CONF_SPIKE_WINDOW: Final = "spike_window" # samples in rolling median, 1 disables
+# Options, recording of exchanged frames to binary log in config directory for replay
+CONF_RECORD_FRAMES: Final = "record_frames"
+FAST_POLL_DURATION: Final = 60 # seconds of active polling after command is sent
+
 IP_ADDRESS = "ip_address"
 PORT = "port"
 CONF_SERIAL = "serial"
 CONF_PIN = "pin"
 
-_LOGGER = logging.getLogger(__name__)
-
-def calculate_checksum(data: str) -> int:
-    """Calculate checksum of the message.
-
-    Args:
-        data (str): message as ascii hex string
-
-    Returns:
-        int: checksum
-
-    """
-
-    # if there is a placeholder in command message, skip that one
-    if "[checksum]" in data:
-        data = data[:-len("[checksum]")]
-    else:
-        data = data[:-2]
-
-    return sum([int(data[i:i+2], 16) for i in range(0, len(data), 2)]) % 256
-
-def get_checksum(data: str) -> int:
-    """Get last digits containing checksum.
-
-    Args:
-        data (str): message as ascii hex string
-
-    Returns:
-        int: checksum
-
-    """
-    return int(data[-2:], 16)
-
-def validate_checksum(data: str) -> bool:
-    """Validate checksum message vs calculated.
-
-    Args:
-        data (str): message as ascii hex string
-
-    Returns:
-        bool: checksums match
-
-    """
-    msg_checksum = get_checksum(data)
-    calc_checksum = calculate_checksum(data)
-
-    if msg_checksum != calc_checksum:
-        _LOGGER.debug(f"Calculated checksum does not match: msg={msg_checksum} calc={calc_checksum} data={data}")  # noqa: G004
-
-    return msg_checksum == calc_checksum
-
 SINGLE_PHASE_CHARGERS = [
     "BCP-A1-L",
     "BCP--A2-L",
@@ -210,6 +206,10 @@ class CHARGER_STATE(Enum):
     WAITING = 5
     CHARGING = 6
 
+# States polled with active interval, idle states with idle interval and others with update interval
+ACTIVE_STATES: Final = (CHARGER_STATE.CHARGING.name, CHARGER_STATE.STARTING.name)
+IDLE_STATES: Final = (CHARGER_STATE.UNPLUGGED.name, CHARGER_STATE.STANDBY.name)
+
 class TIMER_STATE(Enum):
     """Timer states."""
 
@@ -232,6 +232,20 @@ class REQUEST_TYPE(Enum):
     DLB = 123
     MODEL = 4
 
+class FIELD(Enum):
+    """Value conversions applied to decoded message fields.
+
+    Fields listed in message "conversions" are converted by the codec. Fields without a
+    conversion are decoded as unsigned integers. Enum classes (e.g. CHARGER_STATE) can be
+    used as a conversion as well, in which case the field is decoded to the member name.
+    """
+
+    DECI = "deci"                   # value / 10
+    SIGNED_DECI = "signed_deci"     # 16-bit two's complement, value / 10
+    IP = "ip"                       # dotted ip address from byte slice
+    MODEL = "model"                 # ascii model name from message body
+    WEEKDAYS = "weekdays"           # weekday bits to dict, also sets "schedule"
+
 class COMMON(Enum):
     """Common mapping for fixed message contents."""
 
@@ -261,6 +275,9 @@ class CLIENT_MESSAGE(Enum):
         "structure": {
             "pin": slice(13,18),
             "request_type": slice(18, 20)
+        },
+        "conversions": {
+            "request_type": REQUEST_TYPE
         }
     }
     REQUEST_DLB = {
@@ -277,6 +294,9 @@ class CLIENT_MESSAGE(Enum):
         "structure": {
             "pin": slice(13,18),
             "charger_command": slice(21, 22)
+        },
+        "conversions": {
+            "charger_command": CHARGER_COMMAND
         }
     }
     SET_TIMER = {
@@ -352,7 +372,9 @@ class SERVER_MESSAGE(Enum):
             "serial": slice(12, 20),
             "ip": slice(20, 28, 2),
             "port": slice(28, 32)
-
+        },
+        "conversions": {
+            "ip": FIELD.IP
         }
     }
     SEND_MODEL = {
@@ -360,6 +382,10 @@ class SERVER_MESSAGE(Enum):
         "structure": {
             "request_type": slice(10, 12),
             "model": slice(12, -2)
+        },
+        "conversions": {
+            "request_type": REQUEST_TYPE,
+            "model": FIELD.MODEL
         }
     }
     SEND_VALUES_1P = {
@@ -379,6 +405,12 @@ class SERVER_MESSAGE(Enum):
             "timer_end_min": slice(42, 44),
             "max_current": slice(46, 48),
             "maximum_session_consumption": slice(48, 50)
+        },
+        "conversions": {
+            "request_type": REQUEST_TYPE,
+            "total_kwh": FIELD.DECI,
+            "state": CHARGER_STATE,
+            "timer_state": TIMER_STATE
         }
     }
     SEND_VALUES_3P = {
@@ -402,6 +434,12 @@ class SERVER_MESSAGE(Enum):
             "timer_end_min": slice(52, 54),
             "max_current": slice(56, 58),
             "maximum_session_consumption": slice(58, 60)
+        },
+        "conversions": {
+            "request_type": REQUEST_TYPE,
+            "total_kwh": FIELD.DECI,
+            "state": CHARGER_STATE,
+            "timer_state": TIMER_STATE
         }
     }
     SEND_DLB = {
@@ -413,6 +451,12 @@ class SERVER_MESSAGE(Enum):
             "ev_power": slice(20, 24),
             "house_power": slice(24, 28),
             "grid_power": slice(28, 32)
+        },
+        "conversions": {
+            "solar_power": FIELD.DECI,
+            "ev_power": FIELD.DECI,
+            "house_power": FIELD.DECI,
+            "grid_power": FIELD.SIGNED_DECI
         }
     }
     ACCESS_DENIED = {
@@ -428,6 +472,40 @@ class SERVER_MESSAGE(Enum):
             "timer_start_min": slice(34, 36),
             "timer_end_h": slice(36, 38),
             "timer_end_min": slice(38, 40),
-
+        },
+        "conversions": {
+            "weekdays": FIELD.WEEKDAYS
         }
-    }
\ No newline at end of file
+    }
+# Frame identification by header (message_type byte, message_id). Message type None
+# matches any type byte, exact message type matches take precedence.
+# New firmware messages can be registered here without touching the decoding.
+MESSAGE_IDS: Final = {
+    (None, 11): CLIENT_MESSAGE.REQUEST_DATA,
+    (None, 12): CLIENT_MESSAGE.SEND_CHARGER_COMMAND,
+    (None, 28): CLIENT_MESSAGE.SET_TIMER,
+    (None, 8): SERVER_MESSAGE.ACCESS_DENIED,
+    (None, 17): SERVER_MESSAGE.HANDSHAKE,
+    (0x7B, 17): SERVER_MESSAGE.SEND_DLB,
+    (None, 30): SERVER_MESSAGE.SEND_VALUES_1P,
+    (None, 32): SERVER_MESSAGE.SEND_MODEL,
+    (None, 33): SERVER_MESSAGE.SEND_DLB,
+    (None, 35): SERVER_MESSAGE.SEND_VALUES_3P,
+}
+# Responses to data requests sharing the same header are told apart by request type byte
+MESSAGE_REQUEST_TYPES: Final = {
+    (32, REQUEST_TYPE.MODEL.value): SERVER_MESSAGE.SEND_MODEL,
+    (32, REQUEST_TYPE.SETTINGS.value): SERVER_MESSAGE.SEND_SETTINGS,
+}
+
+# Responses accepted for data request, used to match concurrent requests to replies by frame header
+EXPECTED_RESPONSES: Final = {
+    REQUEST_TYPE.VALUES: (
+        SERVER_MESSAGE.SEND_VALUES_1P,
+        SERVER_MESSAGE.SEND_VALUES_3P,
+        SERVER_MESSAGE.ACCESS_DENIED,
+    ),
+    REQUEST_TYPE.DLB: (SERVER_MESSAGE.SEND_DLB, SERVER_MESSAGE.ACCESS_DENIED),
+    REQUEST_TYPE.SETTINGS: (SERVER_MESSAGE.SEND_SETTINGS, SERVER_MESSAGE.ACCESS_DENIED),
+    REQUEST_TYPE.MODEL: (SERVER_MESSAGE.SEND_MODEL, SERVER_MESSAGE.ACCESS_DENIED),
+}
@@ -1,4 +1,6 @@
-from .const import CLIENT_MESSAGE, COMMON, SERVER_MESSAGE  # noqa: D100
+from binascii import unhexlify  # noqa: D100
+
+from .const import SERVER_MESSAGE
 
 
 def get_hex(data: int, length: int = 2) -> str:
@@ -126,44 +128,6 @@ def convert_pin_to_hex(pin: int) -> str:
 
     return f"{int(pin):05X}".lower()
 
-def get_message_type(data: str) -> CLIENT_MESSAGE | SERVER_MESSAGE:
-    """Get message structure by id.
-
-    Args:
-        data (str): message as ascii hex string
-
-    Returns:
-        _type_: _description_
-
-    """
-    message_type = data[COMMON.FIXED_PART.value["structure"]["message_type"]]
-    msg_int = int(data[COMMON.FIXED_PART.value["structure"]["message_id"]], 16)
-
-    if msg_int == 11:
-        return CLIENT_MESSAGE.REQUEST_DATA
-    if msg_int == 28:
-        return CLIENT_MESSAGE.SET_TIMER
-    if msg_int == 12:
-        return CLIENT_MESSAGE.SEND_CHARGER_COMMAND
-
-    if msg_int == 8:
-        return SERVER_MESSAGE.ACCESS_DENIED
-    if msg_int == 30:
-        return SERVER_MESSAGE.SEND_VALUES_1P
-    if msg_int == 35:
-        return SERVER_MESSAGE.SEND_VALUES_3P
-    if msg_int == 33:
-        return SERVER_MESSAGE.SEND_DLB
-    if msg_int == 17:
-        if message_type.upper() == '7B':
-            return SERVER_MESSAGE.SEND_DLB
-
-        return SERVER_MESSAGE.HANDSHAKE
-    if msg_int == 32:
-        return SERVER_MESSAGE.SEND_MODEL
-
-    return None
-
 def get_ip(data: str) -> str:
     """Read ip from message.
 
@@ -180,19 +144,19 @@ def get_ip(data: str) -> str:
     # Assuming the IP address starts from index 20 and ends at 28 (adjustable)
     return '.'.join(str(int(data[i:i+2], 16)) for i in range(ip_pos.start, ip_pos.stop, ip_pos.step))
 
-def get_model(data: str) -> str:
+def get_model(data: bytes | str) -> str:
     """Read model from message.
 
     Args:
-        data (str): message as ascii hex string
+        data (bytes | str): message as ascii hex
 
     Returns:
         _type_: _description_
 
     """
 
-    # Convert hex string to bytes
-    data = bytes.fromhex(data)
+    # Convert ascii hex to bytes
+    data = unhexlify(data)
 
     # The header length appears to be fixed at 8 bytes (adjust if needed)
     header_length = 8
@@ -1,29 +1,55 @@
 """Coordinator."""
-import asyncio
-from datetime import timedelta
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
 import logging
-import socket
+import random
 from typing import Any
 
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util.dt import utcnow
 
-from .communication import SERVER_MESSAGE, build_message, read_message
+from .client import ChargerClient, ChargerError
 from .const import (
+    ACTIVE_STATES,
     CHARGER_COMMAND,
     CHARGER_STATE,
-    CLIENT_MESSAGE,
+    CONF_ACTIVE_INTERVAL,
+    CONF_DLB_INTERVAL,
+    CONF_IDLE_INTERVAL,
+    CONF_MODEL_INTERVAL,
     CONF_PIN,
+    CONF_RECORD_FRAMES,
+    CONF_SETTINGS_INTERVAL,
+    CONF_SPIKE_WINDOW,
+    DEFAULT_ACTIVE_INTERVAL,
+    DEFAULT_DLB_INTERVAL,
+    DEFAULT_IDLE_INTERVAL,
+    DEFAULT_MODEL_INTERVAL,
+    DEFAULT_SETTINGS_INTERVAL,
     DLB,
     DOMAIN,
+    EXPECTED_RESPONSES,
+    FAST_POLL_DURATION,
+    IDLE_STATES,
+    POWER_LIMIT_FIELDS,
     REQUEST_TYPE,
     SERIAL,
 )
-from .conversions import convert_schedule, convert_timer, get_hex
+from .recorder import FrameRecorder
+from .validation import DEFAULT_BOUNDS, DEFAULT_SPIKE_WINDOW, SnapshotValidator, bounds_with_limits
 
 _LOGGER = logging.getLogger(__name__)
 
+# Data request types are polled at own rates, due requests are merged into one refresh
+POLL_TOLERANCE = timedelta(seconds=1)
+MIN_INTERVAL = timedelta(seconds=1)
+
+# Consecutive failed refreshes before charger is considered unreachable
+FAILURE_THRESHOLD = 3
+MAX_BACKOFF = timedelta(minutes=30)
+
 
 class BenyWifiUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Beny Wifi update coordinator."""
@@ -42,139 +68,187 @@ class BenyWifiUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             _LOGGER,
             name=DOMAIN,
             update_interval=timedelta(seconds=scan_interval),
+            # listeners are not notified when snapshot did not change
+            always_update=False,
         )
 
         self.config_entry = config_entry
         self.ip_address = ip_address
         self.port = port
         self.hass = hass
+        # timer timestamps of snapshot follow Home Assistant clock
+        self.client = ChargerClient(ip_address, port, config_entry.data[CONF_PIN], self._build_validator(), utcnow)
+        self.transport = self.client.transport
+        self.scan_interval = timedelta(seconds=scan_interval)
+        self.failures = 0
+        self._fast_poll_until = utcnow()
+        self._next_poll: dict[REQUEST_TYPE, datetime] = {}
+        # snapshot keys changed by last refresh, entities of other keys skip state write
+        self.changed_keys: set[str] = set()
+
+    @property
+    def validator(self) -> SnapshotValidator:
+        """Validator of polled values."""
+        return self.client.validator
+
+    @property
+    def circuit_open(self) -> bool:
+        """Return True if charger is considered unreachable."""
+        return self.failures >= FAILURE_THRESHOLD
+
+    async def async_connect(self) -> None:
+        """Open UDP endpoint to charger, and frame log if recording is enabled."""
+        if self.config_entry.options.get(CONF_RECORD_FRAMES) and self.transport.recorder is None:
+            recorder = FrameRecorder(self.hass.config.path(DOMAIN, f"{self.config_entry.data[SERIAL]}.frames"))
+            await self.hass.async_add_executor_job(recorder.open)
+            self.transport.recorder = recorder
+        await self.transport.async_connect()
+
+    async def async_close(self) -> None:
+        """Close UDP endpoint to charger and frame log, waiting for last flush of frame log."""
+        self.transport.close()
+        if self.transport.recorder is not None:
+            recorder, self.transport.recorder = self.transport.recorder, None
+            await self.hass.async_add_executor_job(recorder.close)
+
+    def _build_validator(self) -> SnapshotValidator:
+        """Build validator from configured power limits and spike filter window."""
+        options = self.config_entry.options
+        limits = {}
+        for key, fields in POWER_LIMIT_FIELDS.items():
+            for field in fields:
+                limits[field] = options.get(key, DEFAULT_BOUNDS[field].max)
+        return SnapshotValidator(bounds_with_limits(limits), options.get(CONF_SPIKE_WINDOW, DEFAULT_SPIKE_WINDOW))
+
+    @property
+    def request_types(self) -> list[REQUEST_TYPE]:
+        """Data request types polled from charger."""
+        if self.config_entry.data[DLB]:
+            return [REQUEST_TYPE.VALUES, REQUEST_TYPE.DLB, REQUEST_TYPE.SETTINGS, REQUEST_TYPE.MODEL]
+        return [REQUEST_TYPE.VALUES, REQUEST_TYPE.SETTINGS, REQUEST_TYPE.MODEL]
 
     async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch data asynchronously."""
-        return await self._fetch_data()
+        """Fetch data asynchronously.
+
+        Each request type is polled at its own rate, a refresh only sends requests
+        that are due and merges responses into previous snapshot. Next refresh is
+        scheduled for the request type due first.
+
+        While charger is unreachable, polls back off and start with a single
+        probe request before full refresh is attempted. Probe response is used as
+        values response of the refresh, so values are not requested twice.
+        """
+        now = utcnow()
+        due = [
+            request_type
+            for request_type in self.request_types
+            if self._next_poll.get(request_type, now) <= now + POLL_TOLERANCE
+        ]
 
-    async def _fetch_data(self):
-        """Send UDP request and fetch data asynchronously."""
         try:
-            # Build the request message
-            request = build_message(
-                CLIENT_MESSAGE.REQUEST_DATA,
-                {"pin": self.config_entry.data[CONF_PIN], "request_type": get_hex(REQUEST_TYPE.VALUES.value)}
-            ).encode('ascii')
-
-            # Send UDP request asynchronously
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(None, self._send_udp_request, request)
-
-            # Decode and parse the response
-            response = response.decode('ascii')
-            data = read_message(response)
-
-            if data is None:
-                raise UpdateFailed("Error fetching data: checksum not valid")
-
-            if data['message_type'] == "SERVER_MESSAGE.ACCESS_DENIED":
-                raise UpdateFailed("Device denied request. Please reconfigure integration if your pin has changed")
-
-            # Set unset state to both start and end time if timer is not set at all
-            if data['timer_state'] == 'UNSET':
-                start = "not_set"
-                end = "not_set"
-            # if timer has START_TIME or START_END_TIME value
-            elif data['timer_state'] != 'END_TIME':
-                # Convert timer values to timestamps
-                now = utcnow()
-                start = now.replace(
-                    hour=data['timer_start_h'], minute=data['timer_start_min'], second=0, microsecond=0
-                )
-
-                # If start is before current time, move it to the next day
-                if start < now:
-                    start += timedelta(days=1)
-
-                if data['timer_state'] == 'START_END_TIME':
-                    end = now.replace(
-                        hour=data['timer_end_h'], minute=data['timer_end_min'], second=0, microsecond=0
-                    )
-
-                    # If end is before current time, move it to the next day
-                    if end < now:
-                        end += timedelta(days=1)
-
-                    # If end is also before start, move end to the next day of start
-                    if end <= start:
-                        end += timedelta(days=1)
-                else:
-                    # timer end is not set
-                    end = "not_set"
-            else:
-                start = "not_set"
-
-                # Convert timer value to timestamp
-                now = utcnow()
-                end = now.replace(
-                    hour=data['timer_end_h'], minute=data['timer_end_min'], second=0, microsecond=0
-                )
-
-            data['timer_start'] = start
-            data['timer_end'] = end
-
-            data['charger_state'] = data['state'].lower()
-
-            data['power'] = float(data['power']) / 10
-            data['total_kwh'] = float(data['total_kwh'])
-            data['temperature'] = int(data['temperature'] - 100)
-
-            # ORIGINAL v0.7.0 DLB HANDLING - UNCHANGED
-            if self.config_entry.data[DLB]:
-                # Build the dlb request message
-                request = build_message(
-                    CLIENT_MESSAGE.REQUEST_DLB,
-                    {"pin": self.config_entry.data[CONF_PIN], "request_type": get_hex(REQUEST_TYPE.DLB.value)}
-                ).encode('ascii')
-
-                # Send UDP request asynchronously
-                loop = asyncio.get_event_loop()
-                response_dlb = await loop.run_in_executor(None, self._send_udp_request, request)
-                response_dlb = response_dlb.decode('ascii')
-                data_dlb = read_message(response_dlb)
-
-                data['grid_power'] = float(data_dlb['grid_power']) / 10
-                data['house_power'] = float(data_dlb['house_power']) / 10
-                data['ev_power'] = float(data_dlb['ev_power']) / 10
-                data['solar_power'] = float(data_dlb['solar_power']) / 10
-
-            return data
-
-        except Exception as err:
-            _LOGGER.error(f"Failed to fetch data: {err}")
-            raise UpdateFailed(f"Error fetching data: {err}")
-
-    def _send_udp_request(self, request, retries=2, timeout=8):
-        """Send UDP request synchronously in a separate thread, with retries."""
-        for attempt in range(retries):
-            sock = None
-            try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                sock.settimeout(timeout)
-                sock.sendto(request, (self.ip_address, self.port))
-
-                response, addr = sock.recvfrom(1024)
-                return response
-            except socket.timeout:
-                _LOGGER.warning(
-                    f"UDP request timed out (attempt {attempt + 1}/{retries}). Retrying..."
-                )
-                if attempt == retries - 1:
-                    _LOGGER.error(f"UDP request failed after {retries} attempts due to timeout.")
-                    raise UpdateFailed(f"Error sending UDP request: timed out after {retries} attempts")
-            except Exception as err:
-                _LOGGER.error(f"UDP request failed: {err}")
-                raise UpdateFailed(f"Error sending UDP request: {err}")
-            finally:
-                if sock:
-                    sock.close()
-        raise UpdateFailed("Unknown error after retries in _send_udp_request")
+            received = {}
+            if self.circuit_open:
+                received[REQUEST_TYPE.VALUES] = await self._probe()
+                if REQUEST_TYPE.VALUES not in due:
+                    due.insert(0, REQUEST_TYPE.VALUES)
+            data = {**(self.data or {}), **await self.client.poll(tuple(due), received)}
+        except ChargerError as err:
+            # unreachable charger is logged once when circuit opens
+            _LOGGER.log(logging.DEBUG if self.circuit_open else logging.ERROR, "Failed to fetch data: %s", err)
+            self._record_failure()
+            raise UpdateFailed(f"Error fetching data: {err}") from err
+        finally:
+            if self.transport.recorder is not None:
+                await self.hass.async_add_executor_job(self.transport.recorder.flush)
+
+        self._record_success()
+        self._schedule_polls(due, data)
+
+        previous = self.data or {}
+        self.changed_keys = {key for key in data.keys() | previous.keys() if data.get(key) != previous.get(key)}
+        return data
+
+    def _schedule_polls(self, polled: list[REQUEST_TYPE], data: dict[str, Any]) -> None:
+        """Set next poll time for polled request types and refresh interval for the earliest."""
+        options = self.config_entry.options
+        intervals = {
+            REQUEST_TYPE.VALUES: self._state_interval(data),
+            REQUEST_TYPE.DLB: timedelta(seconds=options.get(CONF_DLB_INTERVAL, DEFAULT_DLB_INTERVAL)),
+            REQUEST_TYPE.SETTINGS: timedelta(seconds=options.get(CONF_SETTINGS_INTERVAL, DEFAULT_SETTINGS_INTERVAL)),
+            REQUEST_TYPE.MODEL: timedelta(seconds=options.get(CONF_MODEL_INTERVAL, DEFAULT_MODEL_INTERVAL)),
+        }
+
+        now = utcnow()
+        for request_type in polled:
+            self._next_poll[request_type] = now + intervals[request_type]
+
+        next_poll = min(self._next_poll[request_type] for request_type in self.request_types)
+        self.update_interval = max(next_poll - now, MIN_INTERVAL)
+
+    async def _probe(self) -> bytes:
+        """Send single values request to check if charger is reachable again."""
+        return await self.client.request(
+            self.client.data_request(REQUEST_TYPE.VALUES), 1, EXPECTED_RESPONSES[REQUEST_TYPE.VALUES]
+        )
+
+    def _record_failure(self) -> None:
+        """Count failed refresh, back off polling with jitter when circuit opens."""
+        self.failures += 1
+        if not self.circuit_open:
+            return
+
+        if self.failures == FAILURE_THRESHOLD:
+            _LOGGER.warning(
+                "Charger %s unreachable after %s attempts, backing off polling", self.ip_address, self.failures
+            )
+        backoff = min(self.scan_interval * 2 ** (self.failures - FAILURE_THRESHOLD + 1), MAX_BACKOFF)
+        self.update_interval = backoff * random.uniform(0.5, 1)
+
+    def _record_success(self) -> None:
+        """Reset failures, normal polling is restored from charger state."""
+        if self.circuit_open:
+            _LOGGER.info("Charger %s reachable again, resuming polling", self.ip_address)
+        self.failures = 0
+
+    def _state_interval(self, data: dict[str, Any]) -> timedelta:
+        """Get values polling interval for charger state.
+
+        Charging is sampled fast, unplugged and standby chargers slowly. A set
+        timer wakes polling up when charging is due to start.
+        """
+        options = self.config_entry.options
+        active = timedelta(seconds=options.get(CONF_ACTIVE_INTERVAL, DEFAULT_ACTIVE_INTERVAL))
+        now = utcnow()
+
+        if data.get("state") in ACTIVE_STATES or now < self._fast_poll_until:
+            return active
+
+        if data.get("state") in IDLE_STATES:
+            interval = timedelta(seconds=options.get(CONF_IDLE_INTERVAL, DEFAULT_IDLE_INTERVAL))
+        else:
+            interval = self.scan_interval
+
+        timer_start = data.get("timer_start")
+        if isinstance(timer_start, datetime) and timer_start > now:
+            interval = min(interval, max(timer_start - now, active))
+
+        return interval
+
+    async def _async_fast_poll(self) -> None:
+        """Poll fast for a while after command so state change is seen promptly."""
+        self._fast_poll_until = utcnow() + timedelta(seconds=FAST_POLL_DURATION)
+        self._next_poll[REQUEST_TYPE.VALUES] = utcnow()
+        await self.async_request_refresh()
+
+    async def _command(self, method: Callable[..., Awaitable[Any]], *args) -> Any:
+        """Send service request through client, fail fast instead of waiting for timeouts if charger is unreachable."""
+        if self.circuit_open:
+            raise HomeAssistantError(f"Charger {self.ip_address} is unreachable")
+        try:
+            return await method(*args)
+        except ChargerError as err:
+            _LOGGER.error("Request to charger %s failed: %s", self.ip_address, err)
+            raise HomeAssistantError(f"Error sending request to charger {self.ip_address}: {err}") from err
 
     async def async_toggle_charging(self, device_name: str, command: str):
         """Start or stop charging service."""
@@ -185,38 +259,28 @@ class BenyWifiUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
         if state_sensor_value and state_sensor_value.state != CHARGER_STATE.UNPLUGGED.name.lower():
             if command == "start":
-                request = build_message(
-                    CLIENT_MESSAGE.SEND_CHARGER_COMMAND,
-                    {"pin": self.config_entry.data[CONF_PIN], "charger_command": get_hex(CHARGER_COMMAND.START.value)}
-                ).encode('ascii')
+                charger_command = CHARGER_COMMAND.START
             elif command == "stop":
-                request = build_message(
-                    CLIENT_MESSAGE.SEND_CHARGER_COMMAND,
-                    {"pin": self.config_entry.data[CONF_PIN], "charger_command": get_hex(CHARGER_COMMAND.STOP.value)}
-                ).encode('ascii')
+                charger_command = CHARGER_COMMAND.STOP
             else:
                 _LOGGER.error(f"Unknown command: {command}")
                 return
 
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, self._send_udp_request, request)
+            await self._command(self.client.send_command, charger_command)
             _LOGGER.info(f"{device_name}: {command} charging command sent")
+            await self._async_fast_poll()
 
     async def async_set_max_monthly_consumption(self, device_name: str, maximum_consumption: int):
         """Set maximum consumption."""
 
-        request = build_message(CLIENT_MESSAGE.SET_MAX_MONTHLY_CONSUMPTION, {"pin": self.config_entry.data[CONF_PIN], "maximum_consumption": get_hex(maximum_consumption, 4)}).encode('ascii')
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, self._send_udp_request, request)
+        await self._command(self.client.set_max_monthly_consumption, maximum_consumption)
 
         _LOGGER.info(f"{device_name}: maximum consumption set")
 
     async def async_set_max_session_consumption(self, device_name: str, maximum_consumption: int):
         """Set maximum consumption."""
 
-        request = build_message(CLIENT_MESSAGE.SET_MAX_SESSION_CONSUMPTION, {"pin": self.config_entry.data[CONF_PIN], "maximum_consumption": get_hex(maximum_consumption)}).encode('ascii')
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, self._send_udp_request, request)
+        await self._command(self.client.set_max_session_consumption, maximum_consumption)
 
         _LOGGER.info(f"{device_name}: maximum consumption set")
 
@@ -228,21 +292,14 @@ class BenyWifiUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         state_sensor_value = self.hass.states.get(state_sensor_id)
 
         if state_sensor_value and state_sensor_value.state != CHARGER_STATE.UNPLUGGED.name.lower():
-            timer_data = convert_timer(start_time, end_time)
-            timer_data['pin'] = self.config_entry.data[CONF_PIN]
-            request = build_message(CLIENT_MESSAGE.SET_TIMER, timer_data).encode('ascii')
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, self._send_udp_request, request)
+            await self._command(self.client.set_timer, start_time, end_time)
 
             _LOGGER.info(f"{device_name}: charging timer set")
+            await self._async_fast_poll()
 
     async def async_set_schedule(self, device_name: str, weekdays: list[bool], start_time: str, end_time: str):
         """Set charging timer."""
-        schedule_data = convert_schedule(reversed(weekdays), start_time, end_time)
-        schedule_data['pin'] = self.config_entry.data[CONF_PIN]
-        request = build_message(CLIENT_MESSAGE.SET_SCHEDULE, schedule_data).encode('ascii')
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, self._send_udp_request, request)
+        await self._command(self.client.set_schedule, weekdays, start_time, end_time)
 
         _LOGGER.info(f"{device_name}: charging schedule set")
 
@@ -254,46 +311,20 @@ class BenyWifiUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         state_sensor_value = self.hass.states.get(state_sensor_id)
 
         if state_sensor_value and state_sensor_value.state != CHARGER_STATE.UNPLUGGED.name.lower():
-            request = build_message(CLIENT_MESSAGE.RESET_TIMER, {"pin": self.config_entry.data[CONF_PIN]}).encode('ascii')
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, self._send_udp_request, request)
+            await self._command(self.client.reset_timer)
             _LOGGER.info(f"{device_name}: charging timer reset")
+            await self._async_fast_poll()
 
     async def async_request_weekly_schedule(self, device_name: str):
         """Get set weekly schedule from charger."""
 
-        request = build_message(CLIENT_MESSAGE.REQUEST_SETTINGS, {"pin": self.config_entry.data[CONF_PIN]}).encode('ascii')
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(None, self._send_udp_request, request)
-        # Decode and parse the response
-        response = response.decode('ascii')
-        data = read_message(response, SERVER_MESSAGE.SEND_SETTINGS)
-        data['start_time'] = f"{data['timer_start_h']}:{data['timer_start_min']}"
-        data['end_time'] = f"{data['timer_end_h']}:{data['timer_end_min']}"
+        schedule = await self._command(self.client.request_schedule)
         _LOGGER.info(f"{device_name}: requested weekly schedule")
-        return {
-            "result": {
-                "schedule": data["schedule"],
-                "weekdays": data["weekdays"],
-                "start_time": data["start_time"],
-                "end_time": data["end_time"]
-            }
-        }
+        return {"result": schedule}
 
     async def async_set_max_current(self, device_name: str, max_current: int):
         """Set maximum charging current (6A–32A) on the charger."""
-        if not (6 <= max_current <= 32):
-            raise ValueError("Maximum current must be between 6 and 32 amps")
-
-        request = build_message(
-            CLIENT_MESSAGE.SET_MAX_CURRENT,
-            {
-                "pin": self.config_entry.data[CONF_PIN],
-                "max_current": format(max_current, "02x"),
-            },
-        ).encode("ascii")
-
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, self._send_udp_request, request)
+        await self._command(self.client.set_max_current, max_current)
 
-        _LOGGER.info(f"{device_name}: max current set to {max_current}A")
\ No newline at end of file
+        _LOGGER.info(f"{device_name}: max current set to {max_current}A")
+        await self._async_fast_poll()
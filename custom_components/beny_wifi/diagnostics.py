@@ -0,0 +1,71 @@
+"""Diagnostics support for Beny Wifi."""
+from datetime import UTC, datetime
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .codec import UNKNOWN_FRAMES, checksum_valid
+from .const import CONF_PIN, CONF_SERIAL, DOMAIN
+from .transport import FrameTrace
+
+TO_REDACT = {CONF_PIN, CONF_SERIAL}
+REDACTED = "**REDACTED**"
+# pin position in every client message, see CLIENT_MESSAGE templates
+PIN_SLICE = slice(13, 18)
+
+
+def _timestamp(value: float | None) -> str | None:
+    return None if value is None else datetime.fromtimestamp(value, UTC).isoformat()
+
+
+def _redact_pin(request: str) -> str:
+    """Replace pin field of client message, the same hex digits may occur in other fields."""
+    return request[:PIN_SLICE.start] + REDACTED + request[PIN_SLICE.stop:]
+
+
+def _format_trace(trace: FrameTrace) -> dict[str, Any]:
+    """Format traced exchange, pin is redacted from request frame."""
+    request = trace.request.decode("ascii", "replace") if trace.request is not None else None
+    response = trace.response.decode("ascii", "replace") if trace.response is not None else None
+    return {
+        "sent": _timestamp(trace.sent),
+        "received": _timestamp(trace.received),
+        "rtt": trace.rtt,
+        "attempts": trace.attempts,
+        "error": trace.error,
+        "request": _redact_pin(request) if request is not None else None,
+        "response": response,
+        "checksum_valid": checksum_valid(trace.response) if trace.response is not None else None,
+    }
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    transport = coordinator.transport
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": str(coordinator.update_interval),
+            "failures": coordinator.failures,
+            "circuit_open": coordinator.circuit_open,
+            "rejected_values": coordinator.validator.rejected,
+        },
+        "transport": {
+            "connected": transport.connected,
+            "srtt": transport.rtt.srtt,
+            "rto": transport.rtt.rto,
+            "discarded": transport.discarded,
+            "quality": transport.quality.as_dict(),
+            "rtt_histogram": transport.quality.rtt.counts,
+            "unknown_frames": {str(header): count for header, count in UNKNOWN_FRAMES.items()},
+        },
+        "trace": [_format_trace(trace) for trace in transport.trace],
+    }
@@ -0,0 +1,109 @@
+"""Streaming link quality statistics of charger communication.
+
+Statistics are updated in constant time and memory per request. Round trip
+times are counted to a histogram with logarithmic buckets, percentiles are
+read from cumulative bucket counts with the precision of a bucket (~19 %).
+Histogram is aged by halving its counts, so percentiles follow changes of the
+link instead of averaging over whole uptime. Rates are exponentially weighted
+moving averages.
+"""
+from bisect import bisect_left
+from typing import Any
+
+# bucket upper bounds from 1 ms to ~16 s, four buckets per doubling
+RTT_BUCKETS = tuple(0.001 * 2 ** (i / 4) for i in range(57))
+# samples after which histogram counts are halved
+HISTOGRAM_WINDOW = 1000
+EWMA_ALPHA = 0.1
+
+
+class RttHistogram:
+    """Round trip time histogram with percentiles."""
+
+    __slots__ = ("counts", "total")
+
+    def __init__(self) -> None:
+        """Initialize empty histogram, last bucket collects overflow."""
+        self.counts = [0] * (len(RTT_BUCKETS) + 1)
+        self.total = 0
+
+    def add(self, rtt: float) -> None:
+        """Count round trip time sample."""
+        self.counts[bisect_left(RTT_BUCKETS, rtt)] += 1
+        self.total += 1
+        if self.total >= HISTOGRAM_WINDOW:
+            self.counts = [count // 2 for count in self.counts]
+            self.total = sum(self.counts)
+
+    def percentile(self, q: float) -> float | None:
+        """Return upper bound of bucket containing q-th percentile, None without samples."""
+        if not self.total:
+            return None
+        rank = q / 100 * self.total
+        cumulative = 0
+        for bucket, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank and count:
+                return RTT_BUCKETS[min(bucket, len(RTT_BUCKETS) - 1)]
+        return RTT_BUCKETS[-1]
+
+
+def _ewma(average: float | None, value: float) -> float:
+    return value if average is None else average + EWMA_ALPHA * (value - average)
+
+
+class LinkQuality:
+    """Latency, loss and frame error statistics of single charger."""
+
+    def __init__(self) -> None:
+        """Initialize statistics without samples."""
+        self.rtt = RttHistogram()
+        self.loss: float | None = None
+        self.retries = 0
+        self.poll_retries: int | None = None
+        self.checksum_failures: float | None = None
+        self.decode_time: float | None = None
+        self._poll_start_retries = 0
+
+    def add_attempt(self, lost: bool, rtt: float | None = None) -> None:
+        """Record request attempt and its round trip time, if unambiguous."""
+        self.loss = _ewma(self.loss, 1 if lost else 0)
+        if rtt is not None:
+            self.rtt.add(rtt)
+
+    def add_retry(self) -> None:
+        """Record retransmitted request."""
+        self.retries += 1
+
+    def add_response(self, checksum_valid: bool, decode_time: float | None = None) -> None:
+        """Record received response frame and time it took to decode."""
+        self.checksum_failures = _ewma(self.checksum_failures, 0 if checksum_valid else 1)
+        if decode_time is not None:
+            self.decode_time = _ewma(self.decode_time, decode_time)
+
+    def start_poll(self) -> None:
+        """Mark start of poll for counting its retries."""
+        self._poll_start_retries = self.retries
+
+    def end_poll(self) -> None:
+        """Count retries of poll started last."""
+        self.poll_retries = self.retries - self._poll_start_retries
+
+    def as_dict(self) -> dict[str, Any]:
+        """Statistics as snapshot values, times in milliseconds and rates in percent."""
+
+        def ms(seconds: float | None) -> float | None:
+            return None if seconds is None else round(seconds * 1000, 3)
+
+        def percent(rate: float | None) -> float | None:
+            return None if rate is None else round(rate * 100, 1)
+
+        return {
+            "rtt_p50": ms(self.rtt.percentile(50)),
+            "rtt_p95": ms(self.rtt.percentile(95)),
+            "rtt_p99": ms(self.rtt.percentile(99)),
+            "packet_loss": percent(self.loss),
+            "poll_retries": self.poll_retries,
+            "checksum_failures": percent(self.checksum_failures),
+            "decode_time": ms(self.decode_time),
+        }
@@ -27,7 +27,7 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
         )
     ]
 
-    async_add_entities(numbers, update_before_add=True)
+    async_add_entities(numbers)
     _LOGGER.info(f"Added max_current_control number entity for device {device_id}")
 
 
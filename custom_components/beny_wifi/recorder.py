@@ -0,0 +1,199 @@
+"""Binary log of frames exchanged with charger, for replaying live traffic.
+
+Frames are stored as raw bytes instead of ascii hex, each prefixed with
+monotonic timestamp, direction and length:
+
+    header  b"BENYLOG1"
+    record  <timestamp: float64> <direction: uint8> <length: uint16> <frame>
+
+Frames that don't survive hex round trip, like broken or upper case hex, are
+stored as received with RAW flag in direction. Index file next to the log has
+offset and timestamp of every INDEX_INTERVAL-th record, so replay can start
+from a point in time without reading the log from the beginning.
+
+Recording only appends to memory buffers in the event loop. Buffers are
+written to disk by flush, which is run in executor. Monotonic clock restarts
+with the host, so timestamps appended to an existing log continue from its
+last record.
+"""
+from binascii import Error as BinasciiError, hexlify, unhexlify
+from bisect import bisect_right
+from collections.abc import Iterator
+from dataclasses import dataclass
+import logging
+import os
+import struct
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+MAGIC = b"BENYLOG1"
+RECORD = struct.Struct("<dBH")
+INDEX_ENTRY = struct.Struct("<Qd")
+INDEX_SUFFIX = ".idx"
+INDEX_INTERVAL = 256
+MAX_LOG_SIZE = 100 * 1024 * 1024
+
+SENT = 0
+RECEIVED = 1
+RAW = 0x80
+
+
+@dataclass(frozen=True, slots=True)
+class FrameRecord:
+    """Recorded frame."""
+
+    timestamp: float  # monotonic
+    direction: int
+    frame: bytes  # ascii hex, as on the wire
+
+
+class FrameRecorder:
+    """Appends exchanged frames to binary log."""
+
+    def __init__(self, path: str, max_size: int = MAX_LOG_SIZE) -> None:
+        """Initialize recorder, log is opened with open.
+
+        Args:
+            path (str): log file, index is written next to it
+            max_size (int): log size in bytes after which recording stops
+
+        """
+        self.path = path
+        self.max_size = max_size
+        self._log = None
+        self._index = None
+        self._buffer = bytearray()
+        self._index_buffer = bytearray()
+        self._size = 0
+        self._count = 0
+        self._clock_offset = 0.0
+
+    def open(self) -> None:
+        """Open log for appending, blocking."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        last = None
+        if os.path.exists(self.path):
+            index = read_index(self.path)
+            for record in read_log(self.path, index[-1][1] if index else None):
+                last = record.timestamp
+        if last is not None and last > time.monotonic():
+            self._clock_offset = last - time.monotonic()
+
+        self._log = open(self.path, "ab")
+        self._index = open(self.path + INDEX_SUFFIX, "ab")
+        self._size = self._log.tell()
+        if not self._size:
+            self._log.write(MAGIC)
+            self._size = len(MAGIC)
+        _LOGGER.info("Recording charger frames to %s", self.path)
+
+    def record(self, direction: int, frame: bytes, timestamp: float | None = None) -> None:
+        """Append frame to buffer, does no I/O."""
+        if self._size >= self.max_size:
+            return
+
+        data = frame
+        try:
+            if frame == frame.lower():
+                data = unhexlify(frame)
+            else:
+                direction |= RAW
+        except BinasciiError:
+            direction |= RAW
+
+        if timestamp is None:
+            timestamp = time.monotonic() + self._clock_offset
+        if self._count % INDEX_INTERVAL == 0:
+            self._index_buffer += INDEX_ENTRY.pack(self._size, timestamp)
+        self._buffer += RECORD.pack(timestamp, direction, len(data))
+        self._buffer += data
+        self._size += RECORD.size + len(data)
+        self._count += 1
+        if self._size >= self.max_size:
+            _LOGGER.warning("Frame log %s reached %s bytes, recording stopped", self.path, self.max_size)
+
+    def flush(self) -> None:
+        """Write buffered records to disk, blocking."""
+        if self._log is None or not self._buffer:
+            return
+        buffer, index_buffer = self._buffer, self._index_buffer
+        self._buffer, self._index_buffer = bytearray(), bytearray()
+        self._log.write(buffer)
+        self._log.flush()
+        self._index.write(index_buffer)
+        self._index.flush()
+
+    def close(self) -> None:
+        """Flush and close log, blocking."""
+        self.flush()
+        for file in (self._log, self._index):
+            if file is not None:
+                file.close()
+        self._log = self._index = None
+
+
+def read_index(path: str) -> list[tuple[int, float]]:
+    """Read offsets and timestamps of indexed records, index is rebuilt if missing."""
+    try:
+        with open(path + INDEX_SUFFIX, "rb") as file:
+            data = file.read()
+    except FileNotFoundError:
+        return build_index(path)
+    return list(INDEX_ENTRY.iter_unpack(data[: len(data) - len(data) % INDEX_ENTRY.size]))
+
+
+def build_index(path: str) -> list[tuple[int, float]]:
+    """Scan log and write its index."""
+    index = []
+    with open(path, "rb") as file:
+        file.seek(len(MAGIC))
+        count = 0
+        while len(header := file.read(RECORD.size)) == RECORD.size:
+            timestamp, _, length = RECORD.unpack(header)
+            if count % INDEX_INTERVAL == 0:
+                index.append((file.tell() - RECORD.size, timestamp))
+            file.seek(length, os.SEEK_CUR)
+            count += 1
+
+    with open(path + INDEX_SUFFIX, "wb") as file:
+        file.write(b"".join(INDEX_ENTRY.pack(*entry) for entry in index))
+    return index
+
+
+def read_log(path: str, start: float | None = None) -> Iterator[FrameRecord]:
+    """Stream records of log.
+
+    Args:
+        path (str): log file
+        start (float, optional): monotonic timestamp of first record, seeked with index
+
+    Yields:
+        FrameRecord: recorded frames in order
+
+    Raises:
+        ValueError: file is not a frame log
+
+    """
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a frame log")
+
+        if start is not None:
+            index = read_index(path)
+            position = bisect_right([timestamp for _, timestamp in index], start) - 1
+            if position >= 0:
+                file.seek(index[position][0])
+
+        while len(header := file.read(RECORD.size)) == RECORD.size:
+            timestamp, direction, length = RECORD.unpack(header)
+            data = file.read(length)
+            if len(data) < length:
+                _LOGGER.warning("Frame log %s is truncated", path)
+                return
+            if start is not None and timestamp < start:
+                continue
+            if direction & RAW:
+                yield FrameRecord(timestamp, direction & ~RAW, data)
+            else:
+                yield FrameRecord(timestamp, direction, hexlify(data))
@@ -1,20 +1,189 @@
 """Sensors for Beny Wifi."""
 
+from dataclasses import dataclass
+from datetime import timedelta
 import logging
 
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
     UnitOfElectricCurrent,
     UnitOfElectricPotential,
     UnitOfEnergy,
     UnitOfPower,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+from homeassistant.core import callback
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util.dt import utcnow
+
+from .const import (
+    CHARGER_TYPE,
+    CONF_CURRENT_DEADBAND,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_POWER_DEADBAND,
+    CONF_TEMPERATURE_DEADBAND,
+    CONF_VOLTAGE_DEADBAND,
+    DEADBAND_DEFAULTS,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_MIN_WRITE_INTERVAL,
+    DLB,
+    DOMAIN,
+    MODEL,
+    SERIAL,
 )
-from homeassistant.helpers.entity import DeviceInfo, Entity
-
-from .const import CHARGER_TYPE, DLB, DOMAIN, MODEL, SERIAL
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, kw_only=True)
+class BenyWifiSensorEntityDescription(SensorEntityDescription):
+    """Beny Wifi sensor description.
+
+    Sensors with deadband option are measurements, their state writes are
+    filtered by deadband and rate limited. Link quality sensors read live
+    statistics of charger transport, which are kept out of the snapshot so
+    that unchanged charger data does not notify listeners.
+    """
+
+    deadband: str | None = None
+    relative_deadband: bool = False
+    link_quality: bool = False
+
+
+def _voltage(key: str) -> BenyWifiSensorEntityDescription:
+    return BenyWifiSensorEntityDescription(
+        key=key,
+        icon="mdi:flash-triangle",
+        native_unit_of_measurement=UnitOfElectricPotential.VOLT,
+        device_class=SensorDeviceClass.VOLTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        deadband=CONF_VOLTAGE_DEADBAND,
+    )
+
+
+def _current(key: str) -> BenyWifiSensorEntityDescription:
+    return BenyWifiSensorEntityDescription(
+        key=key,
+        icon="mdi:sine-wave",
+        native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+        device_class=SensorDeviceClass.CURRENT,
+        state_class=SensorStateClass.MEASUREMENT,
+        deadband=CONF_CURRENT_DEADBAND,
+    )
+
+
+def _power(key: str, icon: str = "mdi:ev-plug-type2") -> BenyWifiSensorEntityDescription:
+    return BenyWifiSensorEntityDescription(
+        key=key,
+        icon=icon,
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        deadband=CONF_POWER_DEADBAND,
+        relative_deadband=True,
+    )
+
+
+CHARGER_STATE_SENSOR = BenyWifiSensorEntityDescription(key="charger_state", icon="mdi:ev-station")
+POWER_SENSOR = _power("power")
+TOTAL_KWH_SENSOR = BenyWifiSensorEntityDescription(
+    key="total_kwh",
+    icon="mdi:power-plug-battery",
+    native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+    device_class=SensorDeviceClass.ENERGY,
+    state_class=SensorStateClass.TOTAL_INCREASING,
+)
+TEMPERATURE_SENSOR = BenyWifiSensorEntityDescription(
+    key="temperature",
+    icon="mdi:thermometer",
+    native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+    device_class=SensorDeviceClass.TEMPERATURE,
+    state_class=SensorStateClass.MEASUREMENT,
+    deadband=CONF_TEMPERATURE_DEADBAND,
+)
+MAX_SESSION_CONSUMPTION_SENSOR = BenyWifiSensorEntityDescription(
+    key="maximum_session_consumption",
+    icon="mdi:meter-electric",
+    native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+)
+TIMER_SENSORS = (
+    BenyWifiSensorEntityDescription(key="timer_start", icon="mdi:timer-sand-full"),
+    BenyWifiSensorEntityDescription(key="timer_end", icon="mdi:timer-sand-empty"),
+)
+
+SENSORS_1P: tuple[BenyWifiSensorEntityDescription, ...] = (
+    CHARGER_STATE_SENSOR,
+    POWER_SENSOR,
+    _voltage("voltage1"),
+    _current("current1"),
+    _current("max_current"),
+    TOTAL_KWH_SENSOR,
+    TEMPERATURE_SENSOR,
+    MAX_SESSION_CONSUMPTION_SENSOR,
+    *TIMER_SENSORS,
+)
+
+SENSORS_3P: tuple[BenyWifiSensorEntityDescription, ...] = (
+    CHARGER_STATE_SENSOR,
+    POWER_SENSOR,
+    _voltage("voltage1"),
+    _voltage("voltage2"),
+    _voltage("voltage3"),
+    _current("current1"),
+    _current("current2"),
+    _current("current3"),
+    _current("max_current"),
+    TOTAL_KWH_SENSOR,
+    TEMPERATURE_SENSOR,
+    MAX_SESSION_CONSUMPTION_SENSOR,
+    *TIMER_SENSORS,
+)
+
+DLB_SENSORS: tuple[BenyWifiSensorEntityDescription, ...] = (
+    _power("grid_power", "mdi:transmission-tower"),
+    _power("solar_power", "mdi:solar-power-variant"),
+    _power("ev_power", "mdi:car-electric"),
+    _power("house_power", "mdi:home-lightning-bolt"),
+)
+
+
+def _link(key: str, icon: str, unit: str | None = None) -> BenyWifiSensorEntityDescription:
+    return BenyWifiSensorEntityDescription(
+        key=key,
+        icon=icon,
+        native_unit_of_measurement=unit,
+        device_class=SensorDeviceClass.DURATION if unit == UnitOfTime.MILLISECONDS else None,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        # disabled entities are not recorded either
+        entity_registry_enabled_default=False,
+        link_quality=True,
+    )
+
+
+# link quality of charger communication, for tuning poll rates
+LINK_SENSORS: tuple[BenyWifiSensorEntityDescription, ...] = (
+    _link("rtt_p50", "mdi:timer-outline", UnitOfTime.MILLISECONDS),
+    _link("rtt_p95", "mdi:timer-outline", UnitOfTime.MILLISECONDS),
+    _link("rtt_p99", "mdi:timer-outline", UnitOfTime.MILLISECONDS),
+    _link("packet_loss", "mdi:wifi-strength-alert-outline", PERCENTAGE),
+    _link("poll_retries", "mdi:repeat"),
+    _link("checksum_failures", "mdi:alert-circle-outline", PERCENTAGE),
+    _link("decode_time", "mdi:timer-cog-outline", UnitOfTime.MILLISECONDS),
+)
+
+
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up sensor platform."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
@@ -23,252 +192,125 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     device_type = config_entry.data[CHARGER_TYPE]
     dlb = config_entry.data[DLB]
 
-    sensors = []
-
-    # by default only all 1-phase sensors are included
-    if device_type == '1P':
-        sensors = [
-            BenyWifiChargerStateSensor(coordinator, "charger_state", device_id=device_id, device_model=device_model),
-            BenyWifiPowerSensor(coordinator, "power", device_id=device_id, device_model=device_model),
-            BenyWifiVoltageSensor(coordinator, "voltage1", device_id=device_id, device_model=device_model),
-            BenyWifiCurrentSensor(coordinator, "current1", device_id=device_id, device_model=device_model),
-            BenyWifiCurrentSensor(coordinator, "max_current", device_id=device_id, device_model=device_model),
-            BenyWifiEnergySensor(coordinator, "total_kwh", device_id=device_id, device_model=device_model),
-            BenyWifiTemperatureSensor(coordinator, "temperature", device_id=device_id, device_model=device_model),
-            BenyWifiEnergySensor(coordinator, "maximum_session_consumption", icon="mdi:meter-electric", device_id=device_id, device_model=device_model),
-            BenyWifiTimerSensor(coordinator, "timer_start", icon="mdi:timer-sand-full", device_id=device_id, device_model=device_model),
-            BenyWifiTimerSensor(coordinator, "timer_end", icon="mdi:timer-sand-empty", device_id=device_id, device_model=device_model)
-        ]
-
-    # add all three phases if model supports them
-    elif device_type == '3P':
-        sensors = [
-            BenyWifiChargerStateSensor(coordinator, "charger_state", device_id=device_id, device_model=device_model),
-            BenyWifiPowerSensor(coordinator, "power", device_id=device_id, device_model=device_model),
-            BenyWifiVoltageSensor(coordinator, "voltage1", device_id=device_id, device_model=device_model),
-            BenyWifiVoltageSensor(coordinator, "voltage2", device_id=device_id, device_model=device_model),
-            BenyWifiVoltageSensor(coordinator, "voltage3", device_id=device_id, device_model=device_model),
-            BenyWifiCurrentSensor(coordinator, "current1", device_id=device_id, device_model=device_model),
-            BenyWifiCurrentSensor(coordinator, "current2", device_id=device_id, device_model=device_model),
-            BenyWifiCurrentSensor(coordinator, "current3", device_id=device_id, device_model=device_model),
-            BenyWifiCurrentSensor(coordinator, "max_current", device_id=device_id, device_model=device_model),
-            BenyWifiEnergySensor(coordinator, "total_kwh", device_id=device_id, device_model=device_model),
-            BenyWifiTemperatureSensor(coordinator, "temperature", device_id=device_id, device_model=device_model),
-            BenyWifiEnergySensor(coordinator, "maximum_session_consumption", icon="mdi:meter-electric", device_id=device_id, device_model=device_model),
-            BenyWifiTimerSensor(coordinator, "timer_start", icon="mdi:timer-sand-full", device_id=device_id, device_model=device_model),
-            BenyWifiTimerSensor(coordinator, "timer_end", icon="mdi:timer-sand-empty", device_id=device_id, device_model=device_model)
-        ]
-
-    # TODO: DLB
+    # by default only all 1-phase sensors are included, add all three phases if model supports them
+    descriptions = SENSORS_3P if device_type == '3P' else SENSORS_1P if device_type == '1P' else ()
     if dlb:
-        sensors.extend([
-            BenyWifiPowerSensor(coordinator, "grid_power", icon="mdi:transmission-tower", device_id=device_id, device_model=device_model),
-            BenyWifiPowerSensor(coordinator, "solar_power", icon="mdi:solar-power-variant", device_id=device_id, device_model=device_model),
-            BenyWifiPowerSensor(coordinator, "ev_power", icon="mdi:car-electric", device_id=device_id, device_model=device_model),
-            BenyWifiPowerSensor(coordinator, "house_power", icon="mdi:home-lightning-bolt", device_id=device_id, device_model=device_model),
-        ])
+        descriptions = (*descriptions, *DLB_SENSORS)
+    descriptions = (*descriptions, *LINK_SENSORS)
 
-    async_add_entities(sensors)
+    async_add_entities([
+        BenyWifiSensor(coordinator, description, device_id=device_id, device_model=device_model)
+        for description in descriptions
+    ])
 
-class BenyWifiSensor(Entity):
-    """Charger sensor model."""
-
-    def __init__(self, coordinator, key, device_id=None, device_model=None, icon=None):
-        """Initialize the sensor."""
-        self.coordinator = coordinator
-        self.key = key
-        self._attr_translation_key = key
-        self._device_id = device_id
-        self._device_model = device_model
-        self.entity_id = f"sensor.{device_id}_{key}"
-        self._attr_has_entity_name = True
-        self._icon = icon
-        self._last_valid_state = None
 
-    @property
-    def unique_id(self):
-        """Return a unique ID for this sensor."""
-        return f"{self._device_id}_{self.key}"
+class BenyWifiSensor(CoordinatorEntity, SensorEntity):
+    """Charger sensor model.
 
-    @property
-    def state(self):
-        """Return the current state of the sensor."""
-        return self.coordinator.data.get(self.key)
+    State is pushed by the coordinator, sensors never poll the charger themselves.
+    """
 
-    async def async_update(self):
-        """Update the sensor."""
-        await self.coordinator.async_request_refresh()
+    entity_description: BenyWifiSensorEntityDescription
+    _attr_has_entity_name = True
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device information."""
-        return DeviceInfo(
-            identifiers = {(DOMAIN, self._device_id)},
-            name=f"Beny Charger {self._device_id}",
+    def __init__(self, coordinator, description: BenyWifiSensorEntityDescription, device_id=None, device_model=None):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self.key = description.key
+        self._attr_translation_key = description.key
+        self._attr_unique_id = f"{device_id}_{description.key}"
+        self._device_id = device_id
+        self._device_model = device_model
+        self.entity_id = f"sensor.{device_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers = {(DOMAIN, device_id)},
+            name=f"Beny Charger {device_id}",
             manufacturer = "ZJ Beny",
-            model = self._device_model,
-            serial_number=self._device_id
+            model = device_model,
+            serial_number=device_id
         )
-
-    @property
-    def icon(self):
-        """Return corresponding icon."""
-        return self._icon
-
-class BenyWifiChargerStateSensor(BenyWifiSensor):
-    """Charger state sensor class."""
-
-    def __init__(self, coordinator, key, device_id=None, device_model=None, icon="mdi:ev-station"):
-        """Initialize sensor."""
-        super().__init__(coordinator, key, device_id, device_model, icon)
-
-class BenyWifiCurrentSensor(BenyWifiSensor):
-    """Current sensor class."""
-
-    def __init__(self, coordinator, key, device_id=None, device_model=None, icon="mdi:sine-wave"):
-        """Initialize sensor."""
-        super().__init__(coordinator, key, device_id, device_model, icon)
-
-    @property
-    def unit_of_measurement(self):
-        """Sensor unit."""
-        return UnitOfElectricCurrent.AMPERE
-
-class BenyWifiVoltageSensor(BenyWifiSensor):
-    """Voltage sensor class."""
-
-    def __init__(self, coordinator, key, device_id=None, device_model=None, icon="mdi:flash-triangle"):
-        """Initialize sensor."""
-        super().__init__(coordinator, key, device_id, device_model, icon)
-
-    @property
-    def unit_of_measurement(self):
-        """Sensor unit."""
-        return UnitOfElectricPotential.VOLT
-
-class BenyWifiPowerSensor(BenyWifiSensor):
-    """Power sensor class."""
-
-    def __init__(self, coordinator, key, device_id=None, device_model=None, icon="mdi:ev-plug-type2"):
-        """Initialize sensor."""
-        super().__init__(coordinator, key, device_id, device_model, icon)
-
-    @property
-    def unit_of_measurement(self):
-        """Sensor unit."""
-        return UnitOfPower.KILO_WATT
-
-    @property
-    def state(self):
-        """Return the current state of the sensor with spike filtering."""
-        raw_value = self.coordinator.data.get(self.key)
-        
-        # List of common communication error values
-        INVALID_VALUES = [65535, 65534, 999999, -1]
-        
-        try:
-            power = float(raw_value)
-            
-            # Check for communication error values
-            if power in INVALID_VALUES:
-                _LOGGER.warning(
-                    f"Beny {self._device_id} {self.key}: Communication error value detected: {power}, "
-                    f"using last valid value: {self._last_valid_state}"
-                )
-                return self._last_valid_state if self._last_valid_state is not None else 0
-            
-            # Define reasonable bounds based on sensor type
-            if self.key == "solar_power":
-                # Solar power should be 0 to max system capacity (adjust 20 to your system max + buffer)
-                min_valid = 0
-                max_valid = 30.0  # Adjust this to your solar system capacity + 20% buffer
-                
-                if not (min_valid <= power <= max_valid):
-                    _LOGGER.warning(
-                        f"Beny {self._device_id} {self.key}: Spike detected: {power} kW "
-                        f"(valid range: {min_valid}-{max_valid} kW), "
-                        f"using last valid value: {self._last_valid_state}"
-                    )
-                    return self._last_valid_state if self._last_valid_state is not None else 0
-                    
-            elif self.key == "grid_power":
-                # Grid power can be negative (export) or positive (import)
-                # Adjust these limits based on your grid connection capacity
-                min_valid = -30.0  # Max export
-                max_valid = 30.0   # Max import
-                
-                if not (min_valid <= power <= max_valid):
-                    _LOGGER.warning(
-                        f"Beny {self._device_id} {self.key}: Spike detected: {power} kW "
-                        f"(valid range: {min_valid}-{max_valid} kW), "
-                        f"using last valid value: {self._last_valid_state}"
-                    )
-                    return self._last_valid_state if self._last_valid_state is not None else 0
-                    
-            elif self.key in ["ev_power", "power"]:
-                # EV power should be 0 to max charger capacity
-                min_valid = 0
-                max_valid = 25.0  # Typical max for home EV chargers (adjust if needed)
-                
-                if not (min_valid <= power <= max_valid):
-                    _LOGGER.warning(
-                        f"Beny {self._device_id} {self.key}: Spike detected: {power} kW "
-                        f"(valid range: {min_valid}-{max_valid} kW), "
-                        f"using last valid value: {self._last_valid_state}"
-                    )
-                    return self._last_valid_state if self._last_valid_state is not None else 0
-                    
-            elif self.key == "house_power":
-                # House power - adjust based on your main breaker capacity
-                min_valid = 0
-                max_valid = 50.0  # Typical house load (adjust to your needs)
-                
-                if not (min_valid <= power <= max_valid):
-                    _LOGGER.warning(
-                        f"Beny {self._device_id} {self.key}: Spike detected: {power} kW "
-                        f"(valid range: {min_valid}-{max_valid} kW), "
-                        f"using last valid value: {self._last_valid_state}"
-                    )
-                    return self._last_valid_state if self._last_valid_state is not None else 0
-            
-            # Value is valid, store it and return it
-            self._last_valid_state = power
-            return power
-            
-        except (ValueError, TypeError) as e:
-            _LOGGER.error(
-                f"Beny {self._device_id} {self.key}: Invalid value received: {raw_value}, error: {e}, "
-                f"using last valid value: {self._last_valid_state}"
+        self._written_available = None
+        self._written_value = None
+        self._written_at = None
+
+    async def async_added_to_hass(self) -> None:
+        """Register heartbeat writing changes suppressed by deadband or rate limit, or link quality changes."""
+        await super().async_added_to_hass()
+        if self.entity_description.deadband is not None or self.entity_description.link_quality:
+            self.async_on_remove(
+                async_track_time_interval(self.hass, self._async_heartbeat, self._heartbeat_interval)
             )
-            return self._last_valid_state if self._last_valid_state is not None else 0
-
-class BenyWifiTemperatureSensor(BenyWifiSensor):
-    """Temperature sensor class."""
-
-    def __init__(self, coordinator, key, device_id=None, device_model=None, icon="mdi:thermometer"):
-        """Initialize sensor."""
-        super().__init__(coordinator, key, device_id, device_model, icon)
 
     @property
-    def unit_of_measurement(self):
-        """Sensor unit."""
-        return self.hass.config.units.temperature_unit
-
-class BenyWifiEnergySensor(BenyWifiSensor):
-    """Energy sensor class."""
-
-    def __init__(self, coordinator, key, device_id=None, device_model=None, icon="mdi:power-plug-battery"):
-        """Initialize sensor."""
-        super().__init__(coordinator, key, device_id, device_model, icon)
+    def _heartbeat_interval(self) -> timedelta:
+        options = self.coordinator.config_entry.options
+        return timedelta(minutes=options.get(CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL))
+
+    @callback
+    def _async_heartbeat(self, now) -> None:
+        """Write current value if it differs from last written one or last write is older than heartbeat.
+
+        Write of unchanged value is forced, so recorder gets a fresh sample of
+        measurements held back by deadband.
+        """
+        if self._written_at is None:
+            return
+        if self.native_value != self._written_value:
+            self._write_state()
+        elif utcnow() - self._written_at >= self._heartbeat_interval:
+            self._attr_force_update = True
+            try:
+                self._write_state()
+            finally:
+                self._attr_force_update = False
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only if own value or availability changed.
+
+        Measurement changes within deadband or sooner than minimum write interval
+        are left for heartbeat. Link quality is not part of the snapshot, its
+        value is compared to last written one instead.
+        """
+        if self.entity_description.link_quality:
+            changed = self.native_value != self._written_value
+        else:
+            changed = self.key in self.coordinator.changed_keys
+        if self.available != self._written_available:
+            self._write_state()
+        elif changed and self._should_write():
+            self._write_state()
+
+    def _should_write(self) -> bool:
+        """Check deadband and minimum write interval of measurement."""
+        description = self.entity_description
+        if description.deadband is None or self._written_at is None:
+            return True
+
+        options = self.coordinator.config_entry.options
+        min_interval = timedelta(seconds=options.get(CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL))
+        if utcnow() - self._written_at < min_interval:
+            return False
+
+        value = self.native_value
+        if not isinstance(value, (int, float)) or not isinstance(self._written_value, (int, float)):
+            return True
+
+        deadband = options.get(description.deadband, DEADBAND_DEFAULTS[description.deadband])
+        if description.relative_deadband:
+            deadband = abs(self._written_value) * deadband / 100
+        return abs(value - self._written_value) > deadband
+
+    def _write_state(self) -> None:
+        self._written_available = self.available
+        self._written_value = self.native_value
+        self._written_at = utcnow()
+        super()._handle_coordinator_update()
 
     @property
-    def unit_of_measurement(self):
-        """Sensor unit."""
-        return UnitOfEnergy.KILO_WATT_HOUR
-
-class BenyWifiTimerSensor(BenyWifiSensor):
-    """Timer sensor class."""
-
-    def __init__(self, coordinator, key, device_id=None, device_model=None, icon="mdi:timer-sand-empty"):
-        """Initialize sensor."""
-        super().__init__(coordinator, key, device_id, device_model, icon)
\ No newline at end of file
+    def native_value(self):
+        """Return the current state of the sensor."""
+        if self.entity_description.link_quality:
+            return self.coordinator.transport.quality.as_dict()[self.key]
+        return self.coordinator.data.get(self.key)
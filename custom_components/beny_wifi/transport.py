@@ -0,0 +1,264 @@
+"""Asyncio UDP transport for charger communication.
+
+One datagram endpoint is kept open per charger for the lifetime of the config
+entry. Requests wait on futures resolved by the event loop when datagrams
+arrive, so no executor threads are blocked while waiting for the charger.
+
+Charger replies carry no request id. Requests declaring the messages they
+expect are matched by frame header instead of arrival order, so several of
+them can be in flight at once. Requests without expectation take remaining
+datagrams in the order they were sent.
+
+Retransmission timeout is derived from measured round trip times of the
+charger (RFC 6298), so a lost datagram on a healthy LAN is retried after a
+fraction of a second instead of a fixed timeout.
+
+Latest exchanges are kept in a bounded trace for diagnostics. Frames are stored
+as received, they are only formatted when diagnostics are downloaded. All sent
+and received frames can also be recorded to a binary log for replay.
+"""
+import asyncio
+from collections import deque
+from collections.abc import Collection
+from dataclasses import dataclass
+import logging
+import time
+
+from .codec import identify
+from .const import CLIENT_MESSAGE, SERVER_MESSAGE
+from .link_quality import LinkQuality
+from .recorder import RECEIVED, SENT, FrameRecorder
+
+_LOGGER = logging.getLogger(__name__)
+
+INITIAL_RTO = 1.0
+MIN_RTO = 0.2
+MAX_RTO = 8.0
+
+# exchanges kept in trace per charger
+TRACE_SIZE = 100
+
+
+class RttEstimator:
+    """Smoothed round trip time and retransmission timeout (RFC 6298)."""
+
+    ALPHA = 1 / 8
+    BETA = 1 / 4
+    K = 4
+
+    def __init__(self) -> None:
+        """Initialize estimator without samples."""
+        self.srtt: float | None = None
+        self.rttvar: float | None = None
+        self.rto = INITIAL_RTO
+
+    def sample(self, rtt: float) -> None:
+        """Update estimate with round trip time of unambiguous response."""
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - self.BETA) * self.rttvar + self.BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - self.ALPHA) * self.srtt + self.ALPHA * rtt
+        self.rto = min(max(self.srtt + self.K * self.rttvar, MIN_RTO), MAX_RTO)
+
+    def backoff(self, timeout: float) -> float:
+        """Double timed out attempt's timeout, kept until next valid sample.
+
+        Concurrent requests timing out together back off only once.
+        """
+        self.rto = max(self.rto, min(timeout * 2, MAX_RTO))
+        return self.rto
+
+
+class ChargerProtocol(asyncio.DatagramProtocol):
+    """Datagram protocol passing received datagrams to charger transport."""
+
+    def __init__(self, transport: "ChargerTransport") -> None:
+        """Initialize protocol."""
+        self._charger = transport
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        """Handle received datagram."""
+        self._charger.datagram_received(data, addr)
+
+    def error_received(self, exc: Exception) -> None:
+        """Handle socket error, e.g. ICMP port unreachable."""
+        self._charger.error_received(exc)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Handle closed endpoint."""
+        self._charger.connection_lost(exc)
+
+
+@dataclass(slots=True)
+class PendingRequest:
+    """Request waiting for response."""
+
+    future: asyncio.Future
+    expect: frozenset[CLIENT_MESSAGE | SERVER_MESSAGE] | None
+
+
+@dataclass(slots=True)
+class FrameTrace:
+    """Request and its response, or datagram that was not expected."""
+
+    sent: float  # wall clock time
+    request: bytes | None
+    response: bytes | None = None
+    received: float | None = None  # wall clock time
+    rtt: float | None = None  # seconds since last attempt was sent
+    attempts: int = 0
+    error: str | None = None
+
+
+class ChargerTransport:
+    """UDP transport to single charger."""
+
+    def __init__(self, ip_address: str, port: int) -> None:
+        """Initialize transport, endpoint is opened with async_connect."""
+        self.ip_address = ip_address
+        self.port = port
+        self._transport: asyncio.DatagramTransport | None = None
+        self._pending: list[PendingRequest] = []
+        self.discarded = 0
+        self.rtt = RttEstimator()
+        self.trace: deque[FrameTrace] = deque(maxlen=TRACE_SIZE)
+        self.quality = LinkQuality()
+        self.recorder: FrameRecorder | None = None
+
+    @property
+    def connected(self) -> bool:
+        """Return True if endpoint is open."""
+        return self._transport is not None and not self._transport.is_closing()
+
+    async def async_connect(self) -> None:
+        """Open datagram endpoint to charger."""
+        if self.connected:
+            return
+
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: ChargerProtocol(self), remote_addr=(self.ip_address, self.port)
+        )
+        _LOGGER.debug("UDP endpoint opened to %s:%s", self.ip_address, self.port)
+
+    def close(self) -> None:
+        """Close datagram endpoint and fail pending request."""
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        self._fail_pending(ConnectionError("Transport closed"))
+
+    async def async_request(
+        self,
+        request: bytes,
+        retries: int = 2,
+        timeout: float | None = None,
+        expect: Collection[CLIENT_MESSAGE | SERVER_MESSAGE] | None = None,
+    ) -> bytes:
+        """Send request and wait for response, with retries.
+
+        A late response to an earlier attempt is accepted as well. Such responses
+        are ambiguous and not used as round trip time samples (Karn's algorithm).
+
+        Args:
+            request (bytes): ascii hex frame
+            retries (int): number of attempts
+            timeout (float, optional): seconds to wait for response per attempt, adaptive if not set
+            expect (Collection, optional): messages accepted as response, any datagram if not set
+
+        Returns:
+            bytes: response frame
+
+        Raises:
+            asyncio.TimeoutError: no response after all attempts
+            OSError: socket error, e.g. charger port unreachable
+
+        """
+        await self.async_connect()
+        loop = asyncio.get_running_loop()
+
+        pending = PendingRequest(loop.create_future(), frozenset(expect) if expect else None)
+        self._pending.append(pending)
+        trace = FrameTrace(time.time(), request)
+        self.trace.append(trace)
+        attempt_timeout = self.rtt.rto if timeout is None else timeout
+        try:
+            for attempt in range(retries):
+                sent = loop.time()
+                trace.attempts = attempt + 1
+                if attempt:
+                    self.quality.add_retry()
+                self._transport.sendto(request)
+                if self.recorder is not None:
+                    self.recorder.record(SENT, request)
+                try:
+                    # shield keeps future alive across attempts
+                    response = await asyncio.wait_for(asyncio.shield(pending.future), attempt_timeout)
+                except asyncio.TimeoutError:
+                    _LOGGER.debug(
+                        "UDP request to %s timed out after %.2fs (attempt %s/%s)",
+                        self.ip_address, attempt_timeout, attempt + 1, retries,
+                    )
+                    self.quality.add_attempt(lost=True)
+                    if timeout is None:
+                        attempt_timeout = self.rtt.backoff(attempt_timeout)
+                    continue
+
+                rtt = loop.time() - sent
+                if attempt == 0:
+                    self.rtt.sample(rtt)
+                self.quality.add_attempt(lost=False, rtt=rtt if attempt == 0 else None)
+                trace.response, trace.received, trace.rtt = response, time.time(), rtt
+                return response
+
+            trace.error = "timeout"
+        except Exception as err:
+            trace.error = repr(err)
+            raise
+        finally:
+            self._pending.remove(pending)
+            if not pending.future.done():
+                pending.future.cancel()
+
+        raise asyncio.TimeoutError(f"timed out after {retries} attempts")
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        """Resolve pending request matching received datagram."""
+        if self.recorder is not None:
+            self.recorder.record(RECEIVED, data)
+
+        waiting = [pending for pending in self._pending if not pending.future.done()]
+
+        if any(pending.expect for pending in waiting):
+            decoder = identify(data)
+            message = decoder.message if decoder else None
+            for pending in waiting:
+                if pending.expect and message in pending.expect:
+                    pending.future.set_result(data)
+                    return
+
+        for pending in waiting:
+            if pending.expect is None:
+                pending.future.set_result(data)
+                return
+
+        self.discarded += 1
+        now = time.time()
+        self.trace.append(FrameTrace(now, None, data, now, error="discarded"))
+        _LOGGER.debug("Discarding unexpected datagram from %s: %s", addr, data)
+
+    def error_received(self, exc: Exception) -> None:
+        """Fail pending request on socket error."""
+        self._fail_pending(exc)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Forget closed endpoint, next request reconnects."""
+        self._transport = None
+        self._fail_pending(exc or ConnectionError("Connection lost"))
+
+    def _fail_pending(self, exc: Exception) -> None:
+        for pending in self._pending:
+            if not pending.future.done():
+                pending.future.set_exception(exc)
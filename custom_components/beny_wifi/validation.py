@@ -0,0 +1,153 @@
+"""Validation of charger values.
+
+Values of each response are validated once in the coordinator before they are
+merged to the snapshot, so entities read already cleaned values. Numeric
+fields are checked against sentinel values the charger reports on
+communication errors, compared as raw register values, and against plausible
+bounds, and are then smoothed by a rolling median over a few latest samples,
+which removes single sample spikes while following real changes with a delay
+of half the window.
+
+Rejected value is replaced by the last valid value of the field.
+"""
+from collections import deque
+from dataclasses import dataclass
+import logging
+from statistics import median
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+# raw 16-bit register values reported on communication errors
+SENTINEL_VALUES = frozenset({0xFFFF, 0xFFFE})
+
+# divisor from raw unsigned 16-bit register to snapshot value, codec and snapshot
+# scaling combined. Single byte and signed fields are only checked against bounds.
+RAW_SCALES: dict[str, int] = {
+    "power": 10,
+    "ev_power": 100,
+    "solar_power": 100,
+    "house_power": 100,
+}
+
+DEFAULT_SPIKE_WINDOW = 3
+# median of even window would average two middle samples instead of dropping a spike
+SPIKE_WINDOWS = (1, 3, 5, 7, 9, 11, 13, 15)
+
+
+@dataclass(frozen=True, slots=True)
+class Bounds:
+    """Valid range of field, inclusive."""
+
+    min: float
+    max: float
+
+    def __contains__(self, value: float) -> bool:
+        """Return True if value is within bounds."""
+        return self.min <= value <= self.max
+
+
+# power in kW, voltage in V, current in A, temperature in °C
+DEFAULT_BOUNDS: dict[str, Bounds] = {
+    "power": Bounds(0, 25),
+    "ev_power": Bounds(0, 25),
+    "solar_power": Bounds(0, 30),
+    "grid_power": Bounds(-30, 30),
+    "house_power": Bounds(0, 50),
+    **{f"voltage{phase}": Bounds(0, 300) for phase in (1, 2, 3)},
+    **{f"current{phase}": Bounds(0, 80) for phase in (1, 2, 3)},
+    "temperature": Bounds(-40, 120),
+}
+
+
+def bounds_with_limits(limits: dict[str, float]) -> dict[str, Bounds]:
+    """Build default bounds with configured maximum per field, negative minimum is mirrored."""
+    bounds = dict(DEFAULT_BOUNDS)
+    for field, maximum in limits.items():
+        bounds[field] = Bounds(-maximum if DEFAULT_BOUNDS[field].min < 0 else DEFAULT_BOUNDS[field].min, maximum)
+    return bounds
+
+
+class FieldFilter:
+    """Validation state of single field."""
+
+    __slots__ = ("bounds", "consecutive", "last_valid", "rejected", "samples", "scale")
+
+    def __init__(self, bounds: Bounds, window: int, scale: int | None = None) -> None:
+        """Initialize filter with empty sample window."""
+        self.bounds = bounds
+        self.scale = scale
+        self.samples: deque[float] = deque(maxlen=window)
+        self.last_valid: float | None = None
+        self.rejected = 0
+        self.consecutive = 0
+
+    def reason(self, value: Any) -> str | None:
+        """Return reason value is rejected for, None if value is valid."""
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            return "invalid value"
+        if self.scale is not None and round(value * self.scale) in SENTINEL_VALUES:
+            return "communication error value"
+        if value not in self.bounds:
+            return f"out of range {self.bounds.min}-{self.bounds.max}"
+        return None
+
+
+class SnapshotValidator:
+    """Validates and spike filters numeric fields of charger responses."""
+
+    def __init__(self, bounds: dict[str, Bounds] | None = None, window: int = DEFAULT_SPIKE_WINDOW) -> None:
+        """Initialize validator.
+
+        Args:
+            bounds (dict, optional): valid range per field, fields without bounds are passed as is
+            window (int): samples in rolling median, 1 disables spike filter, even window is rounded up to odd
+
+        """
+        window = max(window, 1) | 1
+        self._filters = {
+            field: FieldFilter(field_bounds, window, RAW_SCALES.get(field))
+            for field, field_bounds in (DEFAULT_BOUNDS if bounds is None else bounds).items()
+        }
+
+    @property
+    def rejected(self) -> dict[str, int]:
+        """Count of rejected values per field."""
+        return {field: field_filter.rejected for field, field_filter in self._filters.items()}
+
+    def validate(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Replace invalid values and smooth spikes in place.
+
+        Args:
+            data (dict): values of single response
+
+        Returns:
+            dict: same dict with cleaned values
+
+        """
+        for field, field_filter in self._filters.items():
+            if field not in data:
+                continue
+
+            value = data[field]
+            reason = field_filter.reason(value)
+            if reason is not None:
+                field_filter.rejected += 1
+                field_filter.consecutive += 1
+                # first of consecutive rejections is logged as warning, others are repeats
+                _LOGGER.log(
+                    logging.WARNING if field_filter.consecutive == 1 else logging.DEBUG,
+                    "Rejected %s of %s: %s, using last valid value: %s",
+                    reason, field, value, field_filter.last_valid,
+                )
+                data[field] = field_filter.last_valid
+                continue
+
+            field_filter.consecutive = 0
+            field_filter.samples.append(value)
+            if len(field_filter.samples) > 2:
+                value = median(field_filter.samples)
+            field_filter.last_valid = value
+            data[field] = value
+
+        return data
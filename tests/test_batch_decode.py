@@ -0,0 +1,77 @@
+# tests/test_batch_decode.py
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from custom_components.beny_wifi.communication import read_message  # noqa: E402
+from custom_components.beny_wifi.const import CHARGER_STATE  # noqa: E402
+from custom_components.beny_wifi.recorder import RECEIVED, SENT  # noqa: E402
+
+_spec = importlib.util.spec_from_file_location(
+    "batch_decode", Path(__file__).resolve().parent.parent / "tools" / "batch_decode.py"
+)
+batch_decode = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(batch_decode)
+frame_archive = importlib.import_module("frame_archive")
+
+VALUES_3P = b"55aa1000237000000000e600e800e6000000005e05000000000000000f0000000003cb"
+DLB = b"55aa7b00217b0000001e005a0032fff6000000b5"
+START = 1767225600.0
+
+
+def dlb_frame(solar, ev, house, grid):
+    body = f"55aa7b00217b0000{solar:04x}{ev:04x}{house:04x}{grid & 0xFFFF:04x}000000"
+    return (body + f"{sum(bytes.fromhex(body)) & 0xFF:02x}").encode()
+
+
+def test_matches_read_message():
+    frames = [dlb_frame(solar, 90, 50, grid) for solar, grid in ((0, 0), (30, -10), (65535, 32767), (1, -32768))]
+    frames.append(DLB[:-2] + b"00")  # invalid checksum
+    columns = batch_decode.decode_frames(frames, "SEND_DLB")
+
+    assert columns["valid"].tolist() == [True, True, True, True, False]
+    for index, frame in enumerate(frames[:-1]):
+        message = read_message(frame)
+        for field in ("solar_power", "ev_power", "house_power", "grid_power"):
+            assert columns[field][index] == message[field]
+
+    columns = batch_decode.decode_frames([VALUES_3P, VALUES_3P.upper()], "SEND_VALUES_3P")
+    message = read_message(VALUES_3P)
+    assert columns["valid"].tolist() == [True, True]
+    for field, _, _ in batch_decode.layout("SEND_VALUES_3P"):
+        if field in ("request_type", "state", "timer_state"):
+            continue
+        assert columns[field][0] == message[field], field
+    assert batch_decode.labels(columns["state"], CHARGER_STATE).tolist() == [message["state"]] * 2
+
+    array = batch_decode.to_structured(columns)
+    assert array.shape == (2,)
+    assert array["voltage1"].tolist() == [message["voltage1"]] * 2
+
+    with pytest.raises(ValueError):
+        batch_decode.decode_frames([DLB, VALUES_3P], "SEND_DLB")
+    assert not batch_decode.decode_frames([b"zz" + DLB[2:]], "SEND_DLB")["valid"][0]
+
+
+def test_decode_archive(tmp_path):
+    with frame_archive.ArchiveWriter(str(tmp_path)) as writer:
+        for second in range(0, 2 * 86400, 600):
+            writer.append(START + second, 100000001, SENT, b"55aa10000b0000cb347089")
+            writer.append(START + second + 0.1, 100000001, RECEIVED, dlb_frame(second % 1000, 0, 0, -(second % 700)))
+            writer.append(START + second + 0.2, 100000002, RECEIVED, VALUES_3P)
+
+    columns = batch_decode.decode_archive(str(tmp_path), "SEND_DLB", start=START + 3600, end=START + 86400 + 3600)
+    seconds = np.arange(3600, 86400 + 3600, 600)
+    assert columns["timestamp"].tolist() == (START + seconds + 0.1).tolist()
+    assert set(columns["serial"].tolist()) == {100000001}
+    assert columns["valid"].all()
+    assert columns["solar_power"].tolist() == (seconds % 1000 / 10).tolist()
+    assert columns["grid_power"].tolist() == [-(second % 700) / 10 for second in seconds.tolist()]
+
+    columns = batch_decode.decode_archive(str(tmp_path), "SEND_VALUES_3P", serial=100000002)
+    assert len(columns["valid"]) == 2 * 144
+    assert (columns["power"] == read_message(VALUES_3P)["power"]).all()
+    assert not len(batch_decode.decode_archive(str(tmp_path), "SEND_SETTINGS")["valid"])
@@ -0,0 +1,169 @@
+# tests/test_charger_simulator.py
+import asyncio
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+from custom_components.beny_wifi.codec import build_frame, checksum_valid
+from custom_components.beny_wifi.communication import read_message
+from custom_components.beny_wifi.const import CLIENT_MESSAGE, EXPECTED_RESPONSES, REQUEST_TYPE
+from custom_components.beny_wifi.conversions import convert_pin_to_hex, get_hex
+from custom_components.beny_wifi.recorder import RECEIVED, SENT, FrameRecorder
+from custom_components.beny_wifi.transport import ChargerTransport
+
+_spec = importlib.util.spec_from_file_location(
+    "charger_simulator", Path(__file__).resolve().parent.parent / "tools" / "charger_simulator.py"
+)
+simulator = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(simulator)
+
+
+def request(charger, request_type=REQUEST_TYPE.VALUES):
+    message = CLIENT_MESSAGE.REQUEST_DLB if request_type is REQUEST_TYPE.DLB else CLIENT_MESSAGE.REQUEST_DATA
+    return build_frame(message, {"pin": convert_pin_to_hex(charger.pin), "request_type": get_hex(request_type.value)})
+
+
+def test_virtual_charger_state_evolves():
+    charger = simulator.VirtualCharger(serial=100000000, pin=123456, phases=1, dlb=True, seed=1)
+
+    values = read_message(charger.handle(request(charger)))
+    assert values["message_type"] == "SERVER_MESSAGE.SEND_VALUES_1P"
+    assert values["state"] == "STANDBY"
+
+    charger.start()
+    charger.advance(10)
+    total = charger.total_kwh
+    charger.advance(3600)
+    values = read_message(charger.handle(request(charger)))
+    assert values["state"] == "CHARGING"
+    assert values["current1"] == 16
+    assert values["total_kwh"] > total
+
+    dlb = read_message(charger.handle(request(charger, REQUEST_TYPE.DLB)))
+    assert dlb["ev_power"] == pytest.approx(charger.power * 10, abs=0.1)
+
+    # wrong pin is denied
+    denied = build_frame(CLIENT_MESSAGE.REQUEST_DATA, {"pin": "00000", "request_type": "70"})
+    assert read_message(charger.handle(denied))["message_type"] == "SERVER_MESSAGE.ACCESS_DENIED"
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("socket_enabled")
+async def test_fleet_polled_through_transport():
+    fleet = simulator.create_fleet(20, seed=1)
+    async with simulator.ChargerSimulator(fleet) as sim:
+        transports = [ChargerTransport("127.0.0.1", port) for port in sim.ports]
+        try:
+            responses = await asyncio.gather(*(
+                transport.async_request(request(charger), expect=EXPECTED_RESPONSES[REQUEST_TYPE.VALUES])
+                for charger, transport in zip(fleet, transports, strict=True)
+            ))
+        finally:
+            for transport in transports:
+                transport.close()
+        assert all(read_message(response)["state"] == "STANDBY" for response in responses)
+        assert sim.requests == 20
+
+
+def test_fault_profiles():
+    faults = simulator.FleetFaults.from_dict({
+        "default": {"loss": 0.1},
+        "messages": {"SEND_DLB": {"corrupt": 1}},
+        "chargers": {"100000003": {"default": {"loss": 0.5}}},
+    })
+    dlb = faults.default.messages[simulator.SERVER_MESSAGE.SEND_DLB]
+    assert (dlb.loss, dlb.corrupt) == (0.1, 1)
+    assert faults.for_charger("100000003").default.loss == 0.5
+    assert faults.for_charger("100000003").messages[simulator.SERVER_MESSAGE.SEND_DLB].corrupt == 1
+    assert faults.for_charger("100000004").default.loss == 0.1
+
+    with pytest.raises(ValueError):
+        simulator.FaultProfile.from_dict({"lost": 0.1})
+
+
+def test_faults_are_seeded():
+    charger = simulator.VirtualCharger(serial=100000000, pin=123456, seed=1)
+    response = charger.handle(request(charger))
+    config = simulator.FaultConfig(simulator.FaultProfile(loss=0.3, latency=0.01, jitter=0.005, duplicate=0.2))
+
+    def replies(seed):
+        injector = simulator.FaultInjector(config, seed)
+        return [injector.apply(response) for _ in range(50)]
+
+    assert replies(1) == replies(1)
+    assert any(not reply for reply in replies(1))
+    assert any(len(reply) == 2 for reply in replies(1))
+
+
+def test_corrupted_and_truncated_frames():
+    charger = simulator.VirtualCharger(serial=100000000, pin=123456, seed=1)
+    response = charger.handle(request(charger))
+
+    corrupt = simulator.FaultInjector(simulator.FaultConfig(simulator.FaultProfile(corrupt=1)), 0)
+    [(_, frame)] = corrupt.apply(response)
+    assert len(frame) == len(response)
+    assert not checksum_valid(frame)
+
+    truncate = simulator.FaultInjector(simulator.FaultConfig(simulator.FaultProfile(truncate=1)), 0)
+    [(_, frame)] = truncate.apply(response)
+    assert len(frame) < len(response)
+
+
+
+def test_response_table_lookup():
+    model = {"type": "SEND_MODEL", "params": {"model": "BCP-X"}}
+    table = simulator.ResponseTable({
+        "55AA10000B0001E2407076": "55aa1000080000",
+        "55aa10000b0001*": model,
+        "*ff": "55aa10000800ff",
+    })
+    assert checksum_valid(table.lookup(b"55aa10000b0001e24070769a"))
+    assert table.lookup(b"55aa10000b0001e2407076") == table.lookup(b"55aa10000b0001e2407076ff")
+    assert read_message(table.lookup(b"55aa10000b0001e2400476"))["model"] == "BCP-X"
+    assert table.lookup(b"55aa100011000200ff") == simulator.with_checksum("55aa10000800ff")
+    assert table.lookup(b"55aa1000110002000000") is None
+
+
+def test_recorded_charger_replays_in_order(tmp_path):
+    charger = simulator.VirtualCharger(serial=100000000, pin=123456, phases=3, dlb=True, seed=1)
+    values, dlb = request(charger), request(charger, REQUEST_TYPE.DLB)
+    recorder = FrameRecorder(str(tmp_path / "charger.frames"))
+    recorder.open()
+    standby = charger.handle(values)
+    charger.start()
+    charger.advance(60)
+    charging = charger.handle(values)
+    # concurrent requests, retransmission and responses out of order
+    recorder.record(SENT, values)
+    recorder.record(SENT, dlb)
+    recorder.record(SENT, dlb)
+    recorder.record(RECEIVED, charger.handle(dlb))
+    recorder.record(RECEIVED, standby)
+    recorder.record(SENT, values)
+    recorder.record(RECEIVED, charging)
+    recorder.close()
+
+    recorded = simulator.RecordedCharger(str(tmp_path / "charger.frames"))
+    states = [read_message(recorded.handle(values))["state"] for _ in range(3)]
+    assert states == ["STANDBY", "CHARGING", "STANDBY"]
+    assert read_message(recorded.handle(dlb))["message_type"] == "SERVER_MESSAGE.SEND_DLB"
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("socket_enabled")
+async def test_transport_recovers_from_lossy_charger():
+    fleet = simulator.create_fleet(1, seed=1)
+    faults = simulator.FleetFaults(simulator.FaultConfig(simulator.FaultProfile(loss=0.5, duplicate=0.5)), seed=3)
+    async with simulator.ChargerSimulator(fleet, faults=faults) as sim:
+        transport = ChargerTransport("127.0.0.1", sim.ports[0])
+        try:
+            for _ in range(5):
+                response = await transport.async_request(
+                    request(fleet[0]), retries=10, timeout=0.05, expect=EXPECTED_RESPONSES[REQUEST_TYPE.VALUES]
+                )
+                assert checksum_valid(response)
+            await asyncio.sleep(0.05)
+        finally:
+            transport.close()
+        assert transport.quality.loss > 0
+        assert transport.discarded > 0
@@ -0,0 +1,62 @@
+# tests/test_client.py
+from datetime import UTC, datetime
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+from custom_components.beny_wifi.client import ChargerClient, ChargerError
+from custom_components.beny_wifi.const import CHARGER_COMMAND, REQUEST_TYPE
+from custom_components.beny_wifi.conversions import convert_pin_to_hex
+
+_spec = importlib.util.spec_from_file_location(
+    "charger_simulator", Path(__file__).resolve().parent.parent / "tools" / "charger_simulator.py"
+)
+simulator = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(simulator)
+
+# simulated chargers are real UDP sockets, which the Home Assistant test plugin blocks by default
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+
+@pytest.mark.asyncio
+async def test_poll_and_commands():
+    charger = simulator.VirtualCharger(serial=100000000, pin=123456, phases=3, dlb=True, seed=1)
+    now = datetime(2025, 1, 16, 12, 0, tzinfo=UTC)
+    async with simulator.ChargerSimulator([charger]) as sim:
+        client = ChargerClient("127.0.0.1", sim.ports[0], convert_pin_to_hex(charger.pin), now=lambda: now)
+        try:
+            data = await client.poll(tuple(REQUEST_TYPE))
+            assert data["charger_state"] == "standby"
+            assert data["grid_power"] == pytest.approx(charger.house_base, abs=1)
+            assert data["model"] == charger.model
+            assert "schedule" in data
+
+            await client.send_command(CHARGER_COMMAND.START)
+            await client.set_max_current(10)
+            await client.set_timer("22:00", "06:00")
+            await client.set_schedule([False] + [True] * 5 + [False], "23:00", "07:00")
+            data = await client.poll()
+            assert data["charger_state"] in ("starting", "charging")
+            assert data["max_current"] == 10
+            assert data["timer_state"] == "START_END_TIME"
+            # timer timestamps follow injected clock
+            assert data["timer_start"] == datetime(2025, 1, 16, 22, 0, tzinfo=UTC)
+            assert data["timer_end"] == datetime(2025, 1, 17, 6, 0, tzinfo=UTC)
+            schedule = await client.request_schedule()
+            assert (schedule["start_time"], schedule["end_time"]) == ("23:0", "7:0")
+            assert [day for day, enabled in schedule["weekdays"].items() if enabled] == [
+                "monday", "tuesday", "wednesday", "thursday", "friday"
+            ]
+
+            with pytest.raises(ValueError):
+                await client.set_max_current(40)
+        finally:
+            client.close()
+
+        denied = ChargerClient("127.0.0.1", sim.ports[0], convert_pin_to_hex(111111))
+        try:
+            with pytest.raises(ChargerError, match="denied"):
+                await denied.poll()
+        finally:
+            denied.close()
@@ -0,0 +1,126 @@
+# tests/test_codec.py
+import pytest
+
+from custom_components.beny_wifi.codec import (
+    UNKNOWN_FRAMES,
+    build_frame,
+    checksum_valid,
+    get_decoder,
+    get_message_type,
+    register_message,
+)
+from custom_components.beny_wifi.communication import build_message, read_message
+from custom_components.beny_wifi.const import CLIENT_MESSAGE, SERVER_MESSAGE
+from custom_components.beny_wifi.conversions import convert_timer
+
+VALUES_3P = b"55aa1000237000000000e600e800e6000000005e05000000000000000f0000000003cb"
+DLB = b"55aa7b00217b0000001e005a0032fff6000000b5"
+
+def test_checksum_valid_bytes_and_str():
+    assert checksum_valid(VALUES_3P)
+    assert checksum_valid(VALUES_3P.decode("ascii"))
+
+def test_checksum_invalid():
+    # tampered checksum
+    assert not checksum_valid(VALUES_3P[:-2] + b"00")
+    # odd length and non-hex content are rejected instead of raising
+    assert not checksum_valid(b"55aa1")
+    assert not checksum_valid(b"55aaxx00")
+
+def test_decode_values_from_bytes():
+    result = read_message(VALUES_3P)
+    assert result["message_type"] == str(SERVER_MESSAGE.SEND_VALUES_3P)
+    assert result["request_type"] == "VALUES"
+    assert result["voltage1"] == 230
+    assert result["voltage2"] == 232
+    assert result["state"] == "WAITING"
+    assert result["timer_state"] == "UNSET"
+
+def test_decode_bytes_and_str_match():
+    assert read_message(VALUES_3P) == read_message(VALUES_3P.decode("ascii"))
+
+def test_decode_dlb_signed_and_scaled():
+    result = get_decoder(SERVER_MESSAGE.SEND_DLB).decode(DLB)
+    assert result["solar_power"] == 3.0
+    assert result["ev_power"] == 9.0
+    assert result["house_power"] == 5.0
+    # 0xfff6 is two's complement -10
+    assert result["grid_power"] == -1.0
+
+def test_decode_invalid_enum_value():
+    # state 0x09 is not a valid CHARGER_STATE
+    frame = "55aa1000237000000000e600e800e6000000005e09000000000000000f00000000"
+    frame += f"{(sum(bytes.fromhex(frame)) & 0xFF):02x}"
+    result = read_message(frame)
+    assert result["state"] is None
+    assert result["voltage1"] == 230
+
+def test_decode_handshake():
+    result = get_decoder(SERVER_MESSAGE.HANDSHAKE).decode(b"55aa10001103075BCD15c0a801220d0504")
+    assert result["serial"] == 123456789
+    assert result["ip"] == "192.168.1.34"
+    assert result["port"] == 3333
+
+def test_decode_client_command():
+    result = read_message(b"55aa10000c0000cb34060121", CLIENT_MESSAGE.SEND_CHARGER_COMMAND)
+    assert result["charger_command"] == "START"
+
+def test_build_frame_matches_build_message():
+    params = {"pin": "0cb34", "request_type": "70"}
+    assert build_frame(CLIENT_MESSAGE.REQUEST_DATA, params) == b"55aa10000b0000cb347089"
+    assert build_message(CLIENT_MESSAGE.REQUEST_DATA, params) == "55aa10000b0000cb347089"
+
+def test_build_frame_cached():
+    params = {"pin": "0cb34", "request_type": "7b"}
+    first = build_frame(CLIENT_MESSAGE.REQUEST_DLB, params)
+    # same frame object is returned regardless of parameter order
+    assert build_frame(CLIENT_MESSAGE.REQUEST_DLB, {"request_type": "7b", "pin": "0cb34"}) is first
+    assert checksum_valid(first)
+
+def test_build_odd_aligned_placeholders():
+    # pin starts at odd position, checksum must still match whole frame
+    frame = build_frame(CLIENT_MESSAGE.SET_TIMER, convert_timer("08:00", "10:30") | {"pin": "0cb34"})
+    assert frame == b"55aa10001c0000cb346900016008000111110800000a1e0017153bb6"
+    assert checksum_valid(frame)
+
+def test_build_missing_parameter():
+    with pytest.raises(ValueError, match="missing parameter request_type"):
+        build_message(CLIENT_MESSAGE.REQUEST_DATA, {"pin": "0cb34"})
+
+def test_get_message_type():
+    # Test CLIENT_MESSAGE
+    assert get_message_type("55aa10000b0000cb347089") == CLIENT_MESSAGE.REQUEST_DATA, "CLIENT_MESSAGE.REQUEST_DATA not returned for msg_int 11"
+    assert get_message_type("55aa10001c0000cb3469000028140001c200000000080000150921d9") == CLIENT_MESSAGE.SET_TIMER, "CLIENT_MESSAGE.SET_TIMER not returned for msg_int 28"
+    assert get_message_type("55aa10000c0000cb34060121") == CLIENT_MESSAGE.SEND_CHARGER_COMMAND, "CLIENT_MESSAGE.SEND_CHARGER_COMMAND not returned for msg_int 12"
+    
+    # Test SERVER_MESSAGE
+    assert get_message_type("55aa100008690181") == SERVER_MESSAGE.ACCESS_DENIED, "SERVER_MESSAGE.ACCESS_DENIED not returned for msg_int 8"
+    assert get_message_type("55aa1000237000000000e600e800e6000000006102000000000000000f0000000003cb") == SERVER_MESSAGE.SEND_VALUES_3P, "SERVER_MESSAGE.SEND_VALUES_3P not returned for msg_int 35"
+    assert get_message_type("55aa100011030e5a7937c0a801220d05d8") == SERVER_MESSAGE.HANDSHAKE, "SERVER_MESSAGE.HANDSHAKE not returned for msg_int 17"
+    assert get_message_type("55aa1000200400014243502d4154314e2d4c00000000000000000000011a01df") == SERVER_MESSAGE.SEND_MODEL, "SERVER_MESSAGE.SEND_MODEL not returned for msg_int 32"
+    
+    assert get_message_type("55aa7b00217b0000001e005a0032fff6000000b5") == SERVER_MESSAGE.SEND_DLB, "SERVER_MESSAGE.SEND_DLB not returned for msg_int 33"
+    assert get_message_type("55aa7b0011") == SERVER_MESSAGE.SEND_DLB, "SERVER_MESSAGE.SEND_DLB not returned for msg_int 17 with message type 7B"
+
+    # Test for invalid msg_int
+    assert get_message_type("55aafff0fff000000000e600e800e6000000006102000000000000000f0000000003cb") is None, "get_message_type should return None for unknown msg_int"
+
+def test_unknown_frame_counted():
+    frame = "55aa1000fff000000000e600e800e6000000006102000000000000000f0000000003cb"
+    frame = frame[:-2] + f"{(sum(bytes.fromhex(frame[:-2])) & 0xFF):02x}"
+    before = UNKNOWN_FRAMES[(0x10, 0x00ff)]
+    result = read_message(frame)
+    assert result["message_type"] == "UNKNOWN"
+    assert UNKNOWN_FRAMES[(0x10, 0x00ff)] == before + 1
+
+def test_register_message():
+    register_message(0x42, 0xfff1, SERVER_MESSAGE.SEND_DLB)
+    assert get_message_type("55aa42fff1") == SERVER_MESSAGE.SEND_DLB
+    # message type must match exactly
+    assert get_message_type("55aa10fff1") is None
+
+def test_identify_by_request_type():
+    # model and settings responses share message id, request type byte tells them apart
+    assert get_message_type("55aa1000200400014243502d4154314e2d4c00000000000000000000011a01df") == SERVER_MESSAGE.SEND_MODEL
+    assert get_message_type("55aa100020710201000155000f00197f0c22173b0000010100011406000002") == SERVER_MESSAGE.SEND_SETTINGS
+
@@ -1,5 +1,5 @@
 # tests/test_communication.py
-from custom_components.beny_wifi.communication import read_message, build_message, get_message_type
+from custom_components.beny_wifi.communication import read_message, build_message
 from custom_components.beny_wifi.const import SERVER_MESSAGE, CLIENT_MESSAGE, CHARGER_STATE, TIMER_STATE, REQUEST_TYPE, CHARGER_COMMAND
 
 def test_read_message_valid():
@@ -86,7 +86,7 @@ def test_read_message_model_parsing(monkeypatch):
     def mock_get_model(data):
         return "BCP-AT1N-L"
 
-    monkeypatch.setattr("custom_components.beny_wifi.communication.get_model", mock_get_model)
+    monkeypatch.setattr("custom_components.beny_wifi.codec.get_model", mock_get_model)
 
     # Simulated data where 'model' is a part of the message
     data = "55aa1000200400014243502d4154314e2d4c00000000000000000000011a01df"
@@ -100,7 +100,7 @@ def test_read_message_weekdays_schedule_enabled(monkeypatch):
     def mock_convert_weekdays_to_dict(value):
         return {"monday": True, "tuesday": True, "wednesday": False, "thursday": True, "friday": False, "saturday": False, "sunday": True}
 
-    monkeypatch.setattr("custom_components.beny_wifi.communication.convert_weekdays_to_dict", mock_convert_weekdays_to_dict)
+    monkeypatch.setattr("custom_components.beny_wifi.codec.convert_weekdays_to_dict", mock_convert_weekdays_to_dict)
 
     # Simulated data where 'weekdays' indicates an enabled schedule
     data = "55aa100020710201000155000f00197f0c22173b00000101000114060000023f"  # 'weekdays' at index 7 with value != 0
@@ -1,14 +1,21 @@
+import asyncio
 import pytest
-import socket
 from unittest.mock import patch, MagicMock, AsyncMock, call
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.update_coordinator import UpdateFailed
-from custom_components.beny_wifi.coordinator import BenyWifiUpdateCoordinator
-from datetime import datetime, timedelta
+from homeassistant.util.dt import utcnow
+from custom_components.beny_wifi.client import READ_RETRIES, WRITE_RETRIES, ChargerError
+from custom_components.beny_wifi.const import EXPECTED_RESPONSES, REQUEST_TYPE
+from custom_components.beny_wifi.coordinator import (
+    FAILURE_THRESHOLD,
+    BenyWifiUpdateCoordinator,
+)
+from datetime import datetime, timedelta, timezone
 
 @pytest.fixture
 def mock_send_udp_request():
-    """Mock the '_send_udp_request' method."""
+    """Mock the client 'request' method."""
     return AsyncMock()
 
 @pytest.fixture
@@ -25,15 +32,21 @@ def coordinator(mock_hass):
     # Mock the config_entry data
     config_entry = MagicMock()
     config_entry.data = {
-        "serial": "1234567890"  # Mock the serial number
+        "serial": "1234567890",  # Mock the serial number
+        "pin": "0cb34",
+        "dlb": False,
     }
+    config_entry.options = {}
     coordinator = BenyWifiUpdateCoordinator(
         hass=mock_hass,
+        config_entry=config_entry,
         ip_address="192.168.1.100",
         port=502,
         scan_interval=10,
     )
     coordinator.config_entry = config_entry  # Mock config_entry to avoid 'NoneType' error
+    # refresh after commands is scheduled by Home Assistant
+    coordinator.async_request_refresh = AsyncMock()
     return coordinator
 
 @pytest.fixture
@@ -42,8 +55,9 @@ def mock_get_states(mock_hass):
     with patch.object(mock_hass.states, "get") as mock_get:
         yield mock_get
 
-@patch("custom_components.beny_wifi.coordinator.BenyWifiUpdateCoordinator._send_udp_request")
-@patch("custom_components.beny_wifi.coordinator.read_message")
+@pytest.mark.asyncio
+@patch("custom_components.beny_wifi.client.ChargerClient.request")
+@patch("custom_components.beny_wifi.client.read_message")
 async def test_successful_data_fetch(mock_read_message, mock_send_udp_request, coordinator):
     """Test successful data fetch from the coordinator."""
     
@@ -52,9 +66,11 @@ async def test_successful_data_fetch(mock_read_message, mock_send_udp_request, c
     
     # Simulate a valid read_message response
     mock_read_message.return_value = {
+        "message_type": "SERVER_MESSAGE.SEND_VALUES_1P",
         "state": "standby",
         "power": 0.0,
         "total_kwh": 0.0,
+        "temperature": 120,
         "timer_start_h": 8,
         "timer_start_min": 0,
         "timer_end_h": 7,
@@ -74,7 +90,8 @@ async def test_successful_data_fetch(mock_read_message, mock_send_udp_request, c
     assert data["timer_state"] == "UNSET"
 
 
-@patch("custom_components.beny_wifi.coordinator.BenyWifiUpdateCoordinator._send_udp_request")
+@pytest.mark.asyncio
+@patch("custom_components.beny_wifi.client.ChargerClient.request")
 async def test_udp_request_failure(mock_send_udp_request, coordinator):
     """Test that the coordinator raises an error when the UDP request fails."""
 
@@ -85,29 +102,21 @@ async def test_udp_request_failure(mock_send_udp_request, coordinator):
     with pytest.raises(UpdateFailed):
         await coordinator._async_update_data()  # Ensure this is awaited
 
-@patch("custom_components.beny_wifi.coordinator.read_message")
-@patch("socket.socket")
-async def test_async_toggle_charging_start_with_socket(mock_socket, mock_read_message, coordinator):
-    """Test toggling charging start with simulated socket."""
-
-    # Create a mock socket instance
-    mock_socket_instance = MagicMock()
-    mock_socket.return_value = mock_socket_instance
-
-    # Simulate sending data with `sendto`
-    def mock_sendto(data, addr):
-        assert data == b"55aa10000b0000cb347089"  # Verify the correct request data is sent
-        assert addr == ("192.168.1.100", 502)  # Verify correct IP and port
-    mock_socket_instance.sendto.side_effect = mock_sendto
+@pytest.mark.asyncio
+@patch("custom_components.beny_wifi.client.read_message")
+async def test_async_toggle_charging_start_with_transport(mock_read_message, coordinator):
+    """Test fetching data with simulated charger transport."""
 
-    # Simulate receiving data with `recvfrom`
-    mock_socket_instance.recvfrom.return_value = (b"55aa10001103499602D2c0a801640d05d8", ("192.168.1.100", 502))
+    # Simulate charger response on transport
+    coordinator.transport.async_request = AsyncMock(return_value=b"55aa10001103499602D2c0a801640d05d8")
 
     # Mock the parsed message structure returned by `read_message`
     mock_read_message.return_value = {
+        "message_type": "SERVER_MESSAGE.SEND_VALUES_1P",
         "state": "standby",
         "power": 0.0,
         "total_kwh": 0.0,
+        "temperature": 120,
         "timer_start_h": 8,
         "timer_start_min": 0,
         "timer_end_h": 10,
@@ -116,8 +125,8 @@ async def test_async_toggle_charging_start_with_socket(mock_socket, mock_read_me
     }
 
     # Mock the built message
-    with patch("custom_components.beny_wifi.communication.build_message") as mock_build_message:
-        mock_build_message.return_value = b"mocked_request"
+    with patch("custom_components.beny_wifi.client.build_frame") as mock_build_frame:
+        mock_build_frame.return_value = b"mocked_request"
 
         # Call the coordinator's update method
         data = await coordinator._async_update_data()
@@ -129,55 +138,47 @@ async def test_async_toggle_charging_start_with_socket(mock_socket, mock_read_me
         assert isinstance(data["timer_start"], datetime)
         assert isinstance(data["timer_end"], datetime)
 
-        # Verify socket operations
-        mock_socket.assert_called_once_with(socket.AF_INET, socket.SOCK_DGRAM)
-        mock_socket_instance.settimeout.assert_called_once_with(5)
-        mock_socket_instance.close.assert_called_once()
+        # Verify request was sent through transport
+        coordinator.transport.async_request.assert_any_call(
+            b"mocked_request", READ_RETRIES, None, EXPECTED_RESPONSES[REQUEST_TYPE.VALUES]
+        )
 
-@patch("socket.socket")
-async def test_socket_exception(mock_socket, coordinator):
+@pytest.mark.asyncio
+async def test_socket_exception(coordinator):
     """Test that a socket exception is correctly handled and raises UpdateFailed."""
 
-    # Create a mock socket instance
-    mock_socket_instance = MagicMock()
-    mock_socket.return_value = mock_socket_instance
-
     # Simulate a socket exception when sending data
-    mock_socket_instance.sendto.side_effect = socket.error("Mocked socket error")
+    coordinator.transport.async_request = AsyncMock(side_effect=OSError("Mocked socket error"))
 
     # Mock the built message
-    with patch("custom_components.beny_wifi.communication.build_message") as mock_build_message:
-        mock_build_message.return_value = b"55aa10000b0000cb347089"
+    with patch("custom_components.beny_wifi.client.build_frame") as mock_build_frame:
+        mock_build_frame.return_value = b"55aa10000b0000cb347089"
 
         # Call the coordinator's update method and ensure it raises UpdateFailed
-        with pytest.raises(UpdateFailed, match="Error sending UDP request: Mocked socket error"):
+        with pytest.raises(UpdateFailed, match="Error fetching data: values: Mocked socket error"):
             await coordinator._async_update_data()
 
-    # Print the mock calls for debugging (optional)
-    print(mock_socket_instance.mock_calls)
-
-    # Verify socket operations
-    mock_socket.assert_called_once_with(socket.AF_INET, socket.SOCK_DGRAM)
-    mock_socket_instance.settimeout.assert_called_once_with(5)
-    mock_socket_instance.sendto.assert_called_once_with(b"55aa10000b0000cb347089", ("192.168.1.100", 502))
-    mock_socket_instance.close.assert_called_once()
+    coordinator.transport.async_request.assert_any_call(
+        b"55aa10000b0000cb347089", READ_RETRIES, None, EXPECTED_RESPONSES[REQUEST_TYPE.VALUES]
+    )
 
-@patch("custom_components.beny_wifi.conversions.get_hex")
-@patch("custom_components.beny_wifi.communication.build_message")
-@patch("custom_components.beny_wifi.coordinator.BenyWifiUpdateCoordinator._send_udp_request")
+@pytest.mark.asyncio
+@patch("custom_components.beny_wifi.client.get_hex")
+@patch("custom_components.beny_wifi.client.build_frame")
+@patch("custom_components.beny_wifi.client.ChargerClient.request")
 async def test_toggle_charging_start(mock_send_udp_request, mock_build_message, mock_get_hex, coordinator, mock_hass):
     """Test the start charging command, with multiple UDP requests."""
 
     # Mock the charger state as 'standby'
-    mock_hass.states.get.return_value = "standby"
+    mock_hass.states.get.return_value = MagicMock(state="standby")
 
     # Mock get_hex to return valid hex string for the start command
     mock_get_hex.return_value = "01"  # Hex string for 'start' command
 
-    # Mock build_message to return a valid request string
-    mock_build_message.return_value = "55aa10000c0000cb34060121"
+    # Mock build_frame to return a valid request frame
+    mock_build_message.return_value = b"55aa10000c0000cb34060121"
 
-    # Mock _send_udp_request to simulate a successful response for each call
+    # Mock client request to simulate a successful response for each call
     mock_send_udp_request.side_effect = [
         b"55aa10000c0000cb34060121",  # First call: charge start request
     ]
@@ -185,9 +186,9 @@ async def test_toggle_charging_start(mock_send_udp_request, mock_build_message,
     # Simulate calling async_toggle_charging with 'start' command
     await coordinator.async_toggle_charging(device_name="Charger1", command="start")
 
-    # Verify the expected sequence of calls to _send_udp_request
+    # Verify the expected sequence of calls to client request
     mock_send_udp_request.assert_has_calls([
-        call("55aa10000c0000cb34060121".encode('ascii')),  # Start charging request
+        call("55aa10000c0000cb34060121".encode('ascii'), WRITE_RETRIES),  # Start charging request
     ])
 
     # Check that the sleep and update calls happened (e.g., ensuring async steps)
@@ -195,22 +196,23 @@ async def test_toggle_charging_start(mock_send_udp_request, mock_build_message,
 
 
 
-@patch("custom_components.beny_wifi.conversions.get_hex")
-@patch("custom_components.beny_wifi.communication.build_message")
-@patch("custom_components.beny_wifi.coordinator.BenyWifiUpdateCoordinator._send_udp_request")
+@pytest.mark.asyncio
+@patch("custom_components.beny_wifi.client.get_hex")
+@patch("custom_components.beny_wifi.client.build_frame")
+@patch("custom_components.beny_wifi.client.ChargerClient.request")
 async def test_toggle_charging_stop(mock_send_udp_request, mock_build_message, mock_get_hex, coordinator, mock_hass):
     """Test the start charging command, with multiple UDP requests."""
 
     # Mock the charger state as 'standby'
-    mock_hass.states.get.return_value = "standby"
+    mock_hass.states.get.return_value = MagicMock(state="standby")
 
     # Mock get_hex to return valid hex string for the start command
     mock_get_hex.return_value = "00"  # Hex string for 'start' command
 
-    # Mock build_message to return a valid request string
-    mock_build_message.return_value = "55aa10000c0000cb34060020"
+    # Mock build_frame to return a valid request frame
+    mock_build_message.return_value = b"55aa10000c0000cb34060020"
 
-    # Mock _send_udp_request to simulate a successful response for each call
+    # Mock client request to simulate a successful response for each call
     mock_send_udp_request.side_effect = [
         b"55aa10000c0000cb34060020",  # First call: charge start request
     ]
@@ -218,9 +220,9 @@ async def test_toggle_charging_stop(mock_send_udp_request, mock_build_message, m
     # Simulate calling async_toggle_charging with 'start' command
     await coordinator.async_toggle_charging(device_name="Charger1", command="stop")
 
-    # Verify the expected sequence of calls to _send_udp_request
+    # Verify the expected sequence of calls to client request
     mock_send_udp_request.assert_has_calls([
-        call("55aa10000c0000cb34060020".encode('ascii')),  # Start charging request
+        call("55aa10000c0000cb34060020".encode('ascii'), WRITE_RETRIES),  # Start charging request
     ])
 
     # Check that the sleep and update calls happened (e.g., ensuring async steps)
@@ -238,12 +240,12 @@ async def test_async_set_timer(coordinator):
     start_time = "08:00"
     end_time = "10:00"
     state_sensor_id = "sensor.some_serial_charger_state"
-    state_sensor_value = "charging"
+    state_sensor_value = MagicMock(state="charging")
     coordinator.hass.states.get.return_value = state_sensor_value
 
-    # Mock the _send_udp_request and build_message
-    with patch("custom_components.beny_wifi.coordinator.build_message", return_value="mock_message"), \
-         patch.object(coordinator, "_send_udp_request", new_callable=AsyncMock) as mock_send_udp, \
+    # Mock the client request and build_frame
+    with patch("custom_components.beny_wifi.client.build_frame", return_value=b"mock_message"), \
+         patch.object(coordinator.client, "request", new_callable=AsyncMock) as mock_send_udp, \
          patch("custom_components.beny_wifi.coordinator._LOGGER") as mock_logger:
         # mock_send_udp will return bytes, so no need to encode
         mock_send_udp.return_value = b"mock_message"
@@ -254,7 +256,7 @@ async def test_async_set_timer(coordinator):
         coordinator.hass.states.get.assert_called_once_with(state_sensor_id)
 
         # Verify the UDP request was sent with the mock message as bytes
-        mock_send_udp.assert_called_once_with(b"mock_message")
+        mock_send_udp.assert_called_once_with(b"mock_message", WRITE_RETRIES)
 
         # Verify logging
         mock_logger.info.assert_called_once_with(f"{device_name}: charging timer set")
@@ -270,12 +272,12 @@ async def test_async_reset_timer(coordinator):
     # Mock state sensor in Home Assistant
     device_name = "Test Charger"
     state_sensor_id = "sensor.some_serial_charger_state"
-    state_sensor_value = "charging"
+    state_sensor_value = MagicMock(state="charging")
     coordinator.hass.states.get.return_value = state_sensor_value
 
-    # Mock the _send_udp_request and build_message
-    with patch("custom_components.beny_wifi.coordinator.build_message", return_value="mock_message"), \
-         patch.object(coordinator, "_send_udp_request", new_callable=AsyncMock) as mock_send_udp, \
+    # Mock the client request and build_frame
+    with patch("custom_components.beny_wifi.client.build_frame", return_value=b"mock_message"), \
+         patch.object(coordinator.client, "request", new_callable=AsyncMock) as mock_send_udp, \
          patch("custom_components.beny_wifi.coordinator._LOGGER") as mock_logger:
         # mock_send_udp will return bytes, so no need to encode
         mock_send_udp.return_value = b"mock_message"
@@ -286,7 +288,7 @@ async def test_async_reset_timer(coordinator):
         coordinator.hass.states.get.assert_called_once_with(state_sensor_id)
 
         # Verify the UDP request was sent with the mock message as bytes
-        mock_send_udp.assert_called_once_with(b"mock_message")
+        mock_send_udp.assert_called_once_with(b"mock_message", WRITE_RETRIES)
 
         # Verify logging
         mock_logger.info.assert_called_once_with(f"{device_name}: charging timer reset")
@@ -297,11 +299,11 @@ async def test_async_set_timer_unplugged(coordinator):
     device_name = "Test Charger"
     start_time = "08:00"
     end_time = "10:00"
-    state_sensor_value = "unplugged"
+    state_sensor_value = MagicMock(state="unplugged")
     coordinator.hass.states.get.return_value = state_sensor_value
 
-    # Ensure _send_udp_request is not called
-    with patch.object(coordinator, "_send_udp_request", new_callable=AsyncMock) as mock_send_udp:
+    # Ensure client request is not called
+    with patch.object(coordinator.client, "request", new_callable=AsyncMock) as mock_send_udp:
         await coordinator.async_set_timer(device_name, start_time, end_time)
 
         # Verify the state sensor was checked
@@ -315,11 +317,11 @@ async def test_async_set_timer_unplugged(coordinator):
 async def test_async_reset_timer_unplugged(coordinator):
     """Test async_reset_timer method when charger is unplugged."""
     device_name = "Test Charger"
-    state_sensor_value = "unplugged"
+    state_sensor_value = MagicMock(state="unplugged")
     coordinator.hass.states.get.return_value = state_sensor_value
 
-    # Ensure _send_udp_request is not called
-    with patch.object(coordinator, "_send_udp_request", new_callable=AsyncMock) as mock_send_udp:
+    # Ensure client request is not called
+    with patch.object(coordinator.client, "request", new_callable=AsyncMock) as mock_send_udp:
         await coordinator.async_reset_timer(device_name)
 
         # Verify the state sensor was checked
@@ -359,11 +361,13 @@ async def test_edge_case_midnight(coordinator):
     start_time = "00:00"
     end_time = "23:59"
 
-    with patch.object(coordinator, "_send_udp_request", new_callable=AsyncMock) as mock_send_udp:
+    with patch.object(coordinator.client, "request", new_callable=AsyncMock) as mock_send_udp:
+        mock_send_udp.return_value = b"mock_message"
         await coordinator.async_set_timer(device_name, start_time, end_time)
         mock_send_udp.assert_called_once()
 
-@patch("custom_components.beny_wifi.coordinator.BenyWifiUpdateCoordinator._send_udp_request")
+@pytest.mark.asyncio
+@patch("custom_components.beny_wifi.client.ChargerClient.request")
 async def test_state_mapping(mock_send_udp_request, coordinator):
     """Test state mapping to verify proper translation."""
 
@@ -374,4 +378,150 @@ async def test_state_mapping(mock_send_udp_request, coordinator):
     data = await coordinator._async_update_data()
 
     # Validate state mapping
-    assert data["state"] == "CHARGING"  # Expected mapping for 6102
\ No newline at end of file
+    assert data["state"] == "CHARGING"  # Expected mapping for 6102
+
+@pytest.mark.asyncio
+async def test_circuit_opens_and_backs_off(coordinator):
+    """Test that polling backs off after consecutive failures and commands fail fast."""
+    coordinator.transport.async_request = AsyncMock(side_effect=asyncio.TimeoutError)
+
+    for _ in range(FAILURE_THRESHOLD):
+        with pytest.raises(UpdateFailed):
+            await coordinator._async_update_data()
+
+    assert coordinator.circuit_open
+    assert coordinator.update_interval > timedelta(seconds=10)
+
+    # commands do not wait for timeouts while charger is unreachable
+    coordinator.transport.async_request.reset_mock()
+    with pytest.raises(HomeAssistantError, match="unreachable"):
+        await coordinator.async_set_max_current("charger", 16)
+    coordinator.transport.async_request.assert_not_called()
+
+    # half open probe is a single request
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
+    assert coordinator.transport.async_request.call_args.args[1] == 1
+
+@pytest.mark.asyncio
+async def test_circuit_closes_on_success(coordinator):
+    """Test that successful probe restores normal polling."""
+    coordinator.failures = FAILURE_THRESHOLD
+    coordinator.update_interval = timedelta(minutes=5)
+    coordinator.transport.async_request = AsyncMock(
+        return_value=b"55aa1000237000000000e600e800e6000000005e05000000000000000f0000000003cb"
+    )
+
+    data = await coordinator._async_update_data()
+
+    assert data["voltage1"] == 230
+    assert not coordinator.circuit_open
+    # probe response is the values response of the refresh, values are not requested again
+    values_requests = [
+        request for request in coordinator.transport.async_request.call_args_list
+        if request.args[3] == EXPECTED_RESPONSES[REQUEST_TYPE.VALUES]
+    ]
+    assert len(values_requests) == 1
+    assert coordinator.update_interval == timedelta(seconds=10)
+
+def test_state_interval(coordinator):
+    """Test that polling cadence follows charger state."""
+    coordinator.config_entry.options = {"active_interval": 3, "idle_interval": 600}
+
+    assert coordinator._state_interval({"state": "CHARGING"}) == timedelta(seconds=3)
+    assert coordinator._state_interval({"state": "STARTING"}) == timedelta(seconds=3)
+    assert coordinator._state_interval({"state": "UNPLUGGED"}) == timedelta(seconds=600)
+    assert coordinator._state_interval({"state": "WAITING"}) == timedelta(seconds=10)
+
+    # set timer wakes up polling before charging starts
+    timer_start = datetime.now(timezone.utc) + timedelta(seconds=120)
+    interval = coordinator._state_interval({"state": "STANDBY", "timer_start": timer_start})
+    assert timedelta(seconds=110) < interval <= timedelta(seconds=120)
+
+@pytest.mark.asyncio
+async def test_fast_poll_after_command(coordinator):
+    """Test that commands switch to active polling."""
+    coordinator.client.request = AsyncMock(return_value=b"mock_message")
+
+    await coordinator.async_set_max_current("charger", 16)
+
+    coordinator.async_request_refresh.assert_awaited_once()
+    assert coordinator._state_interval({"state": "UNPLUGGED"}) == timedelta(seconds=5)
+
+@pytest.mark.asyncio
+async def test_denied_command_raises(coordinator):
+    """Test that command denied by charger is reported to Home Assistant."""
+    coordinator.transport.async_request = AsyncMock(return_value=b"55aa1000080000")
+
+    with pytest.raises(HomeAssistantError, match="denied"):
+        await coordinator.async_set_max_current("charger", 16)
+    with pytest.raises(HomeAssistantError, match="denied"):
+        await coordinator.async_request_weekly_schedule("charger")
+    coordinator.async_request_refresh.assert_not_awaited()
+
+def test_client_uses_home_assistant_clock(coordinator):
+    """Test that timer timestamps of snapshot follow Home Assistant time."""
+    assert coordinator.client.now is utcnow
+
+@pytest.mark.asyncio
+async def test_multi_rate_polling(coordinator):
+    """Test that only due request types are polled and merged into snapshot."""
+    coordinator.config_entry.data = {"serial": "1234567890", "pin": "0cb34", "dlb": True}
+    responses = {
+        REQUEST_TYPE.VALUES: b"55aa1000237000000000e600e800e6000000005e05000000000000000f0000000003cb",
+        REQUEST_TYPE.DLB: b"55aa7b00217b0000001e005a0032fff6000000b5",
+        REQUEST_TYPE.SETTINGS: b"55aa100020710201000155000f00197f0c22173b00000101000114060000023f",
+        REQUEST_TYPE.MODEL: b"55aa1000200400014243502d4154314e2d4c00000000000000000000011a01df",
+    }
+
+    async def request(frame, retries, timeout, expect):
+        return next(response for request_type, response in responses.items() if expect == EXPECTED_RESPONSES[request_type])
+
+    coordinator.transport.async_request = AsyncMock(side_effect=request)
+
+    # first refresh polls everything
+    data = await coordinator._async_update_data()
+    assert coordinator.transport.async_request.call_count == 4
+    assert data["voltage1"] == 230
+    assert data["solar_power"] == 0.3
+    assert data["schedule"] == "enabled"
+    assert data["model"] == "BCP-AT1N-L"
+    # dlb is sampled fastest, refresh is scheduled for it
+    assert coordinator.update_interval == timedelta(seconds=2)
+
+    # dlb falls due first, other values are kept from previous snapshot
+    coordinator.data = data
+    coordinator._next_poll[REQUEST_TYPE.DLB] = datetime.now(timezone.utc)
+    coordinator.transport.async_request.reset_mock()
+    data = await coordinator._async_update_data()
+    assert coordinator.transport.async_request.call_count == 1
+    assert data["model"] == "BCP-AT1N-L"
+
+@pytest.mark.asyncio
+async def test_unchanged_frame_not_decoded(coordinator):
+    """Test that identical response is not decoded again and changes are reported per key."""
+    values = b"55aa1000237000000000e600e800e6000000005e05000000000000000f0000000003cb"
+    coordinator.transport.async_request = AsyncMock(return_value=values)
+    coordinator.data = await coordinator._async_update_data()
+    assert "voltage1" in coordinator.changed_keys
+
+    coordinator._next_poll.clear()
+    with patch("custom_components.beny_wifi.client.read_message") as mock_read_message:
+        data = await coordinator._async_update_data()
+        mock_read_message.assert_not_called()
+    assert data == coordinator.data
+    assert coordinator.changed_keys == set()
+    # link quality changes on every poll, it is read from transport instead of snapshot
+    assert "packet_loss" not in data
+
+@pytest.mark.asyncio
+async def test_close_waits_for_frame_log(coordinator):
+    """Test that closing waits until frame log is closed."""
+    recorder = MagicMock()
+    coordinator.transport.recorder = recorder
+    coordinator.hass.async_add_executor_job = AsyncMock()
+
+    await coordinator.async_close()
+
+    coordinator.hass.async_add_executor_job.assert_awaited_once_with(recorder.close)
+    assert coordinator.transport.recorder is None
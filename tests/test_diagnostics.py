@@ -0,0 +1,52 @@
+# tests/test_diagnostics.py
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.beny_wifi.communication import build_message
+from custom_components.beny_wifi.const import CLIENT_MESSAGE, DOMAIN, REQUEST_TYPE
+from custom_components.beny_wifi.conversions import convert_pin_to_hex, get_hex
+from custom_components.beny_wifi.diagnostics import async_get_config_entry_diagnostics
+from custom_components.beny_wifi.transport import ChargerTransport, FrameTrace
+from custom_components.beny_wifi.validation import SnapshotValidator
+
+PIN = convert_pin_to_hex(123456)
+REQUEST = build_message(
+    CLIENT_MESSAGE.REQUEST_DATA, {"pin": PIN, "request_type": get_hex(REQUEST_TYPE.VALUES.value)}
+).encode("ascii")
+RESPONSE = b"55aa7b00217b0000001e005a0032fff6000000b5"
+
+
+@pytest.mark.asyncio
+async def test_config_entry_diagnostics():
+    entry = MagicMock()
+    entry.entry_id = "test_entry_id"
+    entry.data = {"ip_address": "192.168.1.10", "port": 3333, "pin": PIN, "serial": "12345678"}
+    entry.options = {"active_interval": 5}
+
+    coordinator = MagicMock()
+    coordinator.failures = 0
+    coordinator.circuit_open = False
+    coordinator.validator = SnapshotValidator()
+    coordinator.transport = ChargerTransport("192.168.1.10", 3333)
+    coordinator.transport.trace.append(FrameTrace(0.0, REQUEST, RESPONSE, 0.01, 0.01, 1))
+    coordinator.transport.trace.append(FrameTrace(1.0, REQUEST, attempts=4, error="timeout"))
+
+    hass = MagicMock()
+    hass.data = {DOMAIN: {entry.entry_id: {"coordinator": coordinator}}}
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["entry"]["data"]["pin"] == "**REDACTED**"
+    assert diagnostics["entry"]["data"]["serial"] == "**REDACTED**"
+    assert diagnostics["entry"]["options"] == {"active_interval": 5}
+
+    answered, timed_out = diagnostics["trace"]
+    assert answered["sent"] == "1970-01-01T00:00:00+00:00"
+    assert PIN not in answered["request"]
+    # only pin field is redacted, rest of the frame is kept
+    assert answered["request"] == f"{REQUEST[:13].decode()}**REDACTED**{REQUEST[18:].decode()}"
+    assert answered["response"] == RESPONSE.decode()
+    assert answered["checksum_valid"] is True
+    assert timed_out["error"] == "timeout"
+    assert timed_out["checksum_valid"] is None
@@ -0,0 +1,83 @@
+# tests/test_fleet_poller.py
+import argparse
+import csv
+import importlib.util
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+TOOLS = Path(__file__).resolve().parent.parent / "tools"
+
+
+def load_tool(name):
+    spec = importlib.util.spec_from_file_location(name, TOOLS / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+simulator = load_tool("charger_simulator")
+fleet_poller = load_tool("fleet_poller")
+
+# simulated chargers are real UDP sockets, which the Home Assistant test plugin blocks by default
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+
+def chargers_of(fleet, ports):
+    return [
+        fleet_poller.Charger("127.0.0.1", charger.pin, port, str(charger.serial), charger.dlb)
+        for charger, port in zip(fleet, ports, strict=True)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_poll_fleet():
+    fleet = simulator.create_fleet(40, seed=2)
+    async with simulator.ChargerSimulator(fleet) as sim:
+        chargers = chargers_of(fleet, sim.ports)
+        output = io.StringIO()
+        stats = await fleet_poller.poll_fleet(
+            chargers, fleet_poller.SnapshotWriter(output, "jsonl"), interval=0.05, count=3, concurrency=8
+        )
+
+    assert (stats.polls, stats.failures) == (120, 0)
+    rows = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert len(rows) == 120
+    assert {row["serial"] for row in rows} == {str(charger.serial) for charger in fleet}
+    assert all(row["error"] is None and row["charger_state"] == "standby" for row in rows)
+    # DLB is only polled from chargers that have it
+    dlb = {str(charger.serial) for charger in fleet if charger.dlb}
+    assert {row["serial"] for row in rows if "grid_power" in row} == dlb
+
+
+@pytest.mark.asyncio
+async def test_csv_output_and_commands(tmp_path):
+    fleet = simulator.create_fleet(5, seed=3)
+    async with simulator.ChargerSimulator(fleet) as sim:
+        chargers = chargers_of(fleet, sim.ports)
+        chargers.append(fleet_poller.Charger("127.0.0.1", 111111, sim.ports[0], "wrong pin"))
+
+        results = io.StringIO()
+        args = argparse.Namespace(action="set-max-current", current=12, concurrency=4)
+        assert await fleet_poller.command_fleet(chargers, fleet_poller.SnapshotWriter(results, "jsonl"), args) == 1
+
+        output = io.StringIO()
+        await fleet_poller.poll_fleet(chargers, fleet_poller.SnapshotWriter(output, "csv"), count=1)
+
+    rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+    assert [row["error"] for row in rows if row["serial"] == "wrong pin"] == ["values: device denied request, check pin"]
+    assert {row["max_current"] for row in rows if row["serial"] != "wrong pin"} == {"12"}
+    assert all(charger.max_current == 12 for charger in fleet)
+
+
+def test_read_chargers(tmp_path):
+    path = tmp_path / "chargers.csv"
+    path.write_text("ip_address,pin,port,serial,dlb\n192.168.1.20,123456,,123456789,1\n192.168.1.21,654321,4444,,\n")
+    assert fleet_poller.read_chargers(str(path)) == [
+        fleet_poller.Charger("192.168.1.20", 123456, 3333, "123456789", True),
+        fleet_poller.Charger("192.168.1.21", 654321, 4444, "", False),
+    ]
+    assert fleet_poller.Charger.parse("10.0.0.2=123456") == fleet_poller.Charger("10.0.0.2", 123456)
+    assert fleet_poller._weekdays("1111100") == [False, True, True, True, True, True, False]
@@ -0,0 +1,86 @@
+# tests/test_frame_archive.py
+import importlib.util
+from pathlib import Path
+
+from custom_components.beny_wifi.recorder import RECEIVED, SENT, FrameRecorder
+
+_spec = importlib.util.spec_from_file_location(
+    "frame_archive", Path(__file__).resolve().parent.parent / "tools" / "frame_archive.py"
+)
+frame_archive = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(frame_archive)
+
+REQUEST = b"55aa10000b0000cb347089"
+VALUES = b"55aa1000237000000000e600e800e6000000005e05000000000000000f0000000003cb"
+DLB = b"55aa7b00217b0000001e005a0032fff6000000b5"
+DAY = 86400
+# 2026-01-01T00:00:00Z
+START = 1767225600.0
+
+
+def write_archive(path):
+    with frame_archive.ArchiveWriter(str(path)) as writer:
+        # two chargers polled every minute for two days, second charger appended later
+        for serial in (100000001, 100000002):
+            for minute in range(2 * 24 * 60):
+                timestamp = START + minute * 60
+                writer.append(timestamp, serial, SENT, REQUEST)
+                writer.append(timestamp + 0.01, serial, RECEIVED, VALUES if minute % 2 else DLB)
+
+
+def test_range_query(tmp_path):
+    write_archive(tmp_path)
+    assert sorted(path.name for path in tmp_path.glob("*.frames")) == ["20260101.frames", "20260102.frames"]
+    assert (tmp_path / "20260101.frames").stat().st_size == len(frame_archive.MAGIC) + 2 * 2 * 1440 * 64
+
+    with frame_archive.FrameArchive(str(tmp_path)) as archive:
+        records = list(archive.query(100000002, START + DAY - 600, START + DAY + 600, "SEND_DLB"))
+        assert [record.timestamp for record in records] == [START + DAY + offset + 0.01 for offset in range(-600, 600, 120)]
+        assert {(record.serial, record.message, record.frame) for record in records} == {(100000002, "SEND_DLB", DLB)}
+        assert records[0].decode()["grid_power"] == -1.0
+
+        # without serial, both chargers in time order
+        records = list(archive.query(start=START + 60, end=START + 120))
+        assert [(record.serial, record.direction) for record in records] == [
+            (100000001, SENT), (100000002, SENT), (100000001, RECEIVED), (100000002, RECEIVED)
+        ]
+        assert not list(archive.query(message="SET_TIMER"))
+
+
+def test_records_after_index_are_scanned(tmp_path):
+    write_archive(tmp_path)
+    # appended while archive is read, before indexes are rebuilt
+    writer = frame_archive.ArchiveWriter(str(tmp_path))
+    writer.append(START + 30, 100000003, RECEIVED, DLB)
+    writer._files["20260101"].flush()
+
+    with frame_archive.FrameArchive(str(tmp_path)) as archive:
+        segment = archive.segment("20260101")
+        assert segment.count == segment.indexed + 1
+        records = list(archive.query(start=START, end=START + 60))
+        assert [record.serial for record in records] == [100000001, 100000002, 100000001, 100000002, 100000003]
+    writer.close()
+
+    with frame_archive.FrameArchive(str(tmp_path)) as archive:
+        segment = archive.segment("20260101")
+        assert segment.count == segment.indexed
+        assert [record.timestamp for record in archive.query(100000003)] == [START + 30]
+
+
+def test_ingest_frame_log(tmp_path):
+    recorder = FrameRecorder(str(tmp_path / "charger.frames"))
+    recorder.open()
+    recorder.record(SENT, REQUEST, 100.0)
+    recorder.record(RECEIVED, b"55aa10001103075BCD15", 100.5)
+    recorder.close()
+
+    with frame_archive.ArchiveWriter(str(tmp_path / "archive")) as writer:
+        assert frame_archive.ingest_log(writer, str(tmp_path / "charger.frames"), 100000001, offset=START) == 2
+        # frames longer than a record are skipped
+        assert not writer.append(START, 100000001, RECEIVED, b"00" * 45)
+
+    with frame_archive.FrameArchive(str(tmp_path / "archive")) as archive:
+        records = list(archive.query(100000001))
+    assert [(record.timestamp, record.frame) for record in records] == [
+        (START + 100, REQUEST), (START + 100.5, b"55aa10001103075BCD15")
+    ]
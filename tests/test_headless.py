@@ -0,0 +1,23 @@
+# tests/test_headless.py
+from pathlib import Path
+import subprocess
+import sys
+
+TOOLS = Path(__file__).resolve().parent.parent / "tools"
+
+CORE = ("const", "codec", "conversions", "communication", "recorder", "transport", "validation", "link_quality")
+
+
+def test_core_imports_without_home_assistant():
+    script = "\n".join([
+        "import sys",
+        f"sys.path.insert(0, {str(TOOLS)!r})",
+        "import headless",
+        *(f"import custom_components.beny_wifi.{module}" for module in CORE),
+        "from custom_components.beny_wifi.communication import read_message",
+        "assert read_message(b'55aa7b00217b0000001e005a0032fff6000000b5')['grid_power'] == -1.0",
+        "print(sorted(module for module in sys.modules if module.startswith('homeassistant')))",
+    ])
+    # fresh interpreter, Home Assistant would stay out of sys.modules even if installed
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
@@ -69,13 +69,16 @@ async def test_async_unload_entry(hass: HomeAssistant):
     )
 
     # Mock data in hass
+    coordinator = AsyncMock()
     hass.data[DOMAIN] = {
         entry.entry_id: {
-            "coordinator": AsyncMock()
+            "coordinator": coordinator
         }
     }
 
     with patch("homeassistant.config_entries.ConfigEntries.async_unload_platforms", return_value=True) as mock_unload_platforms:
         assert await async_unload_entry(hass, entry) is True
         mock_unload_platforms.assert_awaited_once_with(entry, PLATFORMS)
+        # frame log is closed before unload returns
+        coordinator.async_close.assert_awaited_once()
         assert entry.entry_id not in hass.data[DOMAIN]
@@ -0,0 +1,51 @@
+# tests/test_link_quality.py
+from custom_components.beny_wifi.link_quality import HISTOGRAM_WINDOW, RTT_BUCKETS, LinkQuality, RttHistogram
+
+
+def test_rtt_percentiles():
+    histogram = RttHistogram()
+    assert histogram.percentile(50) is None
+
+    for _ in range(90):
+        histogram.add(0.010)
+    for _ in range(10):
+        histogram.add(0.500)
+
+    assert 0.010 <= histogram.percentile(50) < 0.012
+    assert 0.010 <= histogram.percentile(90) < 0.012
+    assert 0.500 <= histogram.percentile(95) < 0.600
+    assert 0.500 <= histogram.percentile(99) < 0.600
+
+
+def test_rtt_overflow_and_aging():
+    histogram = RttHistogram()
+    histogram.add(100.0)
+    assert histogram.percentile(50) == RTT_BUCKETS[-1]
+
+    for _ in range(HISTOGRAM_WINDOW):
+        histogram.add(0.010)
+    assert histogram.total < HISTOGRAM_WINDOW
+    assert histogram.percentile(99) < 0.012
+
+
+def test_loss_retries_and_frames():
+    quality = LinkQuality()
+    quality.start_poll()
+    quality.add_attempt(lost=True)
+    quality.add_retry()
+    quality.add_attempt(lost=False)
+    quality.add_attempt(lost=False, rtt=0.02)
+    quality.end_poll()
+    quality.add_response(True, 0.0001)
+    quality.add_response(False, 0.0001)
+
+    stats = quality.as_dict()
+    assert stats["poll_retries"] == 1
+    assert 0 < stats["packet_loss"] < 100
+    assert 20 <= stats["rtt_p50"] < 24
+    assert stats["checksum_failures"] == 10.0
+    assert stats["decode_time"] == 0.1
+
+    quality.start_poll()
+    quality.end_poll()
+    assert quality.as_dict()["poll_retries"] == 0
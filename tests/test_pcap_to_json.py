@@ -0,0 +1,220 @@
+"""Test pcap to json converter."""
+import csv
+import importlib.util
+from pathlib import Path
+import struct
+import sys
+
+_spec = importlib.util.spec_from_file_location(
+    "pcap_to_json", Path(__file__).resolve().parent.parent / "tools" / "pcap_to_json.py"
+)
+pcap_to_json = importlib.util.module_from_spec(_spec)
+# registered for pickling functions to worker processes
+sys.modules["pcap_to_json"] = pcap_to_json
+_spec.loader.exec_module(pcap_to_json)
+
+CLIENT = bytes([192, 168, 1, 10])
+CHARGER = bytes([192, 168, 1, 20])
+
+
+def ethernet(source, source_port, destination, destination_port, payload):
+    udp = struct.pack("!HHHH", source_port, destination_port, 8 + len(payload), 0) + payload
+    ip = struct.pack("!BBHHHBBH4s4s", 0x45, 0, 20 + len(udp), 0, 0, 64, 17, 0, source, destination) + udp
+    return b"\x00" * 12 + b"\x08\x00" + ip
+
+
+def request(payload, client_port=50000):
+    return ethernet(CLIENT, client_port, CHARGER, 3333, payload)
+
+
+def response(payload, client_port=50000):
+    return ethernet(CHARGER, 3333, CLIENT, client_port, payload)
+
+
+def write_pcap(path, packets):
+    with open(path, "wb") as file:
+        file.write(struct.pack("<IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0, 65535, 1))
+        for timestamp, frame in packets:
+            seconds, fraction = divmod(round(timestamp * 1e6), 1000000)
+            file.write(struct.pack("<IIII", seconds, fraction, len(frame), len(frame)) + frame)
+
+
+def write_pcapng(path, packets):
+    def block(block_type, body):
+        body += b"\x00" * (-len(body) % 4)
+        return struct.pack("<II", block_type, len(body) + 12) + body + struct.pack("<I", len(body) + 12)
+
+    with open(path, "wb") as file:
+        file.write(block(0x0A0D0D0A, struct.pack("<IHHq", 0x1A2B3C4D, 1, 0, -1)))
+        # interface with millisecond timestamps
+        file.write(block(1, struct.pack("<HHI", 1, 0, 65535) + struct.pack("<HHB3x", 9, 1, 3) + b"\x00" * 4))
+        for timestamp, frame in packets:
+            ticks = int(timestamp * 1000)
+            file.write(block(6, struct.pack("<IIIII", 0, ticks >> 32, ticks & 0xFFFFFFFF, len(frame), len(frame)) + frame))
+
+
+PACKETS = [
+    (0, request(b"55aa10000b0001e2407076")),
+    (0, ethernet(CLIENT, 50000, CHARGER, 53, b"dns")),
+    (0, response(b"55aa10003700")),
+    (1, request(b"55aa10000b0001e2400476", 50001)),
+    # response after timeout
+    (10, response(b"55aa1000200400", 50001)),
+    (11, request(b"55aa10000b0001e2400476", 50001)),
+    (11, response(b"55aa1000200401", 50001)),
+]
+EXPECTED = {"55aa10000b0001e2407076": "55aa10003700", "55aa10000b0001e2400476": "55aa1000200401"}
+
+
+def test_pcap(tmp_path):
+    write_pcap(tmp_path / "capture.pcap", PACKETS)
+    assert pcap_to_json.extract_udp_pairs(str(tmp_path / "capture.pcap")) == EXPECTED
+
+
+def test_pcapng(tmp_path):
+    write_pcapng(tmp_path / "capture.pcapng", PACKETS)
+    timestamps = [packet[0] for packet in pcap_to_json.read_packets(str(tmp_path / "capture.pcapng"))]
+    assert timestamps == [packet[0] for packet in PACKETS]
+    assert pcap_to_json.extract_udp_pairs(str(tmp_path / "capture.pcapng")) == EXPECTED
+
+
+def test_pending_requests_bounded():
+    pairer = pcap_to_json.RequestPairer(timeout=5, max_pending=2)
+    for client_port in range(3):
+        pairer.add(0, (CLIENT, client_port, CHARGER, 3333), f"request{client_port}", True)
+    assert len(pairer.pending) == 2
+    assert pairer.add(1, (CLIENT, 0, CHARGER, 3333), "response0", False) is None
+    exchange = pairer.add(1, (CLIENT, 2, CHARGER, 3333), "response2", False)
+    assert (exchange.request, exchange.response) == ("request2", "response2")
+
+
+def poll_request(request_type):
+    from custom_components.beny_wifi.codec import build_frame
+    from custom_components.beny_wifi.const import CLIENT_MESSAGE, REQUEST_TYPE
+    from custom_components.beny_wifi.conversions import convert_pin_to_hex, get_hex
+
+    message = CLIENT_MESSAGE.REQUEST_DLB if request_type == "DLB" else CLIENT_MESSAGE.REQUEST_DATA
+    return build_frame(message, {"pin": convert_pin_to_hex(123456), "request_type": get_hex(REQUEST_TYPE[request_type].value)})
+
+
+VALUES_RESPONSE = b"55aa1000237000000000e600e800e6000000005e05000000000000000f0000000003cb"
+DLB_RESPONSE = b"55aa7b00217b0000001e005a0032fff6000000b5"
+
+
+def test_concurrent_requests_of_flow_paired_by_message_type(tmp_path):
+    values, dlb = poll_request("VALUES"), poll_request("DLB")
+    # values and dlb are sent concurrently from one socket, answered in either order
+    write_pcap(tmp_path / "capture.pcap", [
+        (0.0, request(values)),
+        (0.0, request(dlb)),
+        (0.01, response(VALUES_RESPONSE)),
+        (0.02, response(DLB_RESPONSE)),
+        (1.0, request(values)),
+        (1.0, request(dlb)),
+        (1.01, response(DLB_RESPONSE)),
+        (1.02, response(VALUES_RESPONSE)),
+    ])
+    assert pcap_to_json.extract_udp_pairs(str(tmp_path / "capture.pcap")) == {
+        values.decode(): VALUES_RESPONSE.decode(),
+        dlb.decode(): DLB_RESPONSE.decode(),
+    }
+
+    pairer = pcap_to_json.RequestPairer()
+    flow = (CLIENT, 50000, CHARGER, 3333)
+    pairer.add(0, flow, values.decode(), True)
+    pairer.add(0, flow, dlb.decode(), True)
+    exchange = pairer.add(0.01, flow, DLB_RESPONSE.decode(), False)
+    assert exchange.request == dlb.decode()
+    assert pairer.expired == 0
+    # response of other request type is not paired with pending values request
+    assert pairer.add(0.02, flow, DLB_RESPONSE.decode(), False) is None
+    assert pairer.unmatched == 1
+    assert pairer.add(0.03, flow, VALUES_RESPONSE.decode(), False).request == values.decode()
+
+
+def test_files_sharded(tmp_path):
+    write_pcap(tmp_path / "first.pcap", PACKETS[:3])
+    write_pcapng(tmp_path / "second.pcapng", PACKETS[3:])
+    files = [str(tmp_path / "first.pcap"), str(tmp_path / "second.pcapng")]
+    assert pcap_to_json.extract_files(files, jobs=2) == EXPECTED
+
+
+def test_analyze(tmp_path):
+    from custom_components.beny_wifi.codec import build_frame
+    from custom_components.beny_wifi.const import CLIENT_MESSAGE, REQUEST_TYPE
+    from custom_components.beny_wifi.conversions import convert_pin_to_hex, get_hex
+
+    values = build_frame(
+        CLIENT_MESSAGE.REQUEST_DATA, {"pin": convert_pin_to_hex(123456), "request_type": get_hex(REQUEST_TYPE.VALUES.value)}
+    )
+    # access denied response and frame with unknown header, checksums are valid
+    denied, unknown = b"55aa100008000017", b"55aa7f0009000087"
+    app = bytes([192, 168, 1, 30])
+    packets = [
+        (0.0, request(values)),
+        (0.01, response(denied)),
+        (2.0, request(values)),
+        # retransmission answered by unknown frame
+        (2.5, request(values)),
+        (2.55, response(unknown)),
+        # lost
+        (4.0, request(values)),
+        *[
+            (packet_time + 0.5, ethernet(source, source_port, destination, destination_port, payload))
+            for packet_time in (0.0, 1.0, 2.0, 3.0)
+            for source, source_port, destination, destination_port, payload in (
+                (app, 40000, CHARGER, 3333, values),
+                (CHARGER, 3333, app, 40000, denied),
+            )
+        ],
+    ]
+    packets.sort(key=lambda packet: packet[0])
+    write_pcap(tmp_path / "capture.pcap", packets)
+
+    analyzer = pcap_to_json.analyze_files(
+        [str(tmp_path / "capture.pcap")], str(tmp_path / "exchanges.csv"), str(tmp_path / "summary.csv"), "192.168.1.10"
+    )
+    with open(tmp_path / "exchanges.csv", newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert len(rows) == 7
+    first = rows[0]
+    assert (first["client"], first["request"], first["response"]) == ("192.168.1.10", "REQUEST_DATA VALUES", "ACCESS_DENIED")
+    assert first["rtt_ms"] == "10.0"
+
+    with open(tmp_path / "summary.csv", newline="") as file:
+        summary = {row["client"]: row for row in csv.DictReader(file)}
+    ours = summary["192.168.1.10"]
+    assert (ours["requests"], ours["answered"], ours["unknown_responses"]) == ("3", "2", "1")
+    assert float(ours["loss_percent"]) == 33.3
+    assert float(ours["retry_percent"]) == 25.0
+    assert float(ours["poll_interval_s"]) == 2.0
+    assert analyzer.poll_gaps("192.168.1.10") == {"REQUEST_DATA VALUES": (2.0, 1.0)}
+
+
+def test_analyze_concurrent_requests(tmp_path):
+    values, dlb = poll_request("VALUES"), poll_request("DLB")
+    packets = []
+    for poll in range(3):
+        start = poll * 2.0
+        packets += [(start, request(values)), (start, request(dlb))]
+        # dlb is answered first, last dlb request is lost
+        if poll < 2:
+            packets.append((start + 0.02, response(DLB_RESPONSE)))
+        packets.append((start + 0.03, response(VALUES_RESPONSE)))
+    write_pcap(tmp_path / "capture.pcap", packets)
+
+    analyzer = pcap_to_json.analyze_files(
+        [str(tmp_path / "capture.pcap")], str(tmp_path / "exchanges.csv"), str(tmp_path / "summary.csv")
+    )
+    with open(tmp_path / "summary.csv", newline="") as file:
+        summary = {row["request"]: row for row in csv.DictReader(file)}
+
+    values_stats, dlb_stats = summary["REQUEST_DATA VALUES"], summary["REQUEST_DATA DLB"]
+    assert (values_stats["requests"], values_stats["answered"]) == ("3", "3")
+    assert float(values_stats["loss_percent"]) == 0.0
+    assert float(values_stats["rtt_p50_ms"]) == float(values_stats["rtt_max_ms"]) == 30.0
+    assert (dlb_stats["requests"], dlb_stats["answered"]) == ("3", "2")
+    assert float(dlb_stats["loss_percent"]) == 33.3
+    assert float(dlb_stats["rtt_p50_ms"]) == float(dlb_stats["rtt_max_ms"]) == 20.0
+    assert float(values_stats["poll_interval_s"]) == float(dlb_stats["poll_interval_s"]) == 2.0
+    assert analyzer.unmatched == 0
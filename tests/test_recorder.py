@@ -0,0 +1,85 @@
+# tests/test_recorder.py
+import os
+
+from custom_components.beny_wifi.recorder import (
+    INDEX_INTERVAL,
+    INDEX_SUFFIX,
+    MAGIC,
+    RECEIVED,
+    RECORD,
+    SENT,
+    FrameRecorder,
+    read_index,
+    read_log,
+)
+
+REQUEST = b"55aa10000b0000cb347089"
+VALUES = b"55aa1000237000000000e600e800e6000000005e05000000000000000f0000000003cb"
+
+
+def test_frames_stored_as_raw_bytes(tmp_path):
+    path = str(tmp_path / "charger.frames")
+    recorder = FrameRecorder(path)
+    recorder.open()
+    recorder.record(SENT, REQUEST, 1.0)
+    recorder.record(RECEIVED, VALUES, 1.1)
+    # upper case and broken hex are stored as received
+    recorder.record(RECEIVED, b"55aa10001103075BCD15", 1.2)
+    recorder.record(RECEIVED, b"55aa1", 1.3)
+    recorder.close()
+
+    records = list(read_log(path))
+    assert [(record.timestamp, record.direction, record.frame) for record in records] == [
+        (1.0, SENT, REQUEST),
+        (1.1, RECEIVED, VALUES),
+        (1.2, RECEIVED, b"55aa10001103075BCD15"),
+        (1.3, RECEIVED, b"55aa1"),
+    ]
+    # valid hex frames take half of their ascii size
+    assert os.path.getsize(path) == len(MAGIC) + 4 * RECORD.size + len(REQUEST) // 2 + len(VALUES) // 2 + 20 + 5
+
+
+def test_seek_with_index(tmp_path):
+    path = str(tmp_path / "charger.frames")
+    recorder = FrameRecorder(path)
+    recorder.open()
+    for count in range(3 * INDEX_INTERVAL):
+        recorder.record(SENT, REQUEST, float(count))
+    recorder.close()
+
+    assert len(read_index(path)) == 3
+    assert next(read_log(path, start=2 * INDEX_INTERVAL + 10.5)).timestamp == 2 * INDEX_INTERVAL + 11
+
+    # missing index is rebuilt from log
+    os.remove(path + INDEX_SUFFIX)
+    assert [timestamp for _, timestamp in read_index(path)] == [0.0, INDEX_INTERVAL, 2 * INDEX_INTERVAL]
+    assert os.path.exists(path + INDEX_SUFFIX)
+
+
+def test_appended_log_continues_clock(tmp_path):
+    path = str(tmp_path / "charger.frames")
+    recorder = FrameRecorder(path)
+    recorder.open()
+    recorder.record(SENT, REQUEST, 1e12)
+    recorder.close()
+
+    # host restarted, monotonic clock is behind last record
+    recorder = FrameRecorder(path)
+    recorder.open()
+    recorder.record(SENT, REQUEST)
+    recorder.close()
+
+    first, second = read_log(path)
+    assert second.timestamp >= first.timestamp
+
+
+def test_recording_stops_at_max_size(tmp_path):
+    path = str(tmp_path / "charger.frames")
+    recorder = FrameRecorder(path, max_size=100)
+    recorder.open()
+    for _ in range(10):
+        recorder.record(SENT, REQUEST)
+    recorder.close()
+
+    # record crossing the limit is the last one
+    assert len(list(read_log(path))) == (100 - len(MAGIC)) // (RECORD.size + len(REQUEST) // 2) + 1
@@ -0,0 +1,70 @@
+# tests/test_replay_frames.py
+import importlib.util
+from pathlib import Path
+import time
+
+from custom_components.beny_wifi.codec import build_frame
+from custom_components.beny_wifi.const import CLIENT_MESSAGE, REQUEST_TYPE
+from custom_components.beny_wifi.conversions import convert_pin_to_hex, get_hex
+from custom_components.beny_wifi.recorder import RECEIVED, SENT, FrameRecorder
+
+TOOLS = Path(__file__).resolve().parent.parent / "tools"
+
+
+def load_tool(name):
+    spec = importlib.util.spec_from_file_location(name, TOOLS / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+replay_frames = load_tool("replay_frames")
+simulator = load_tool("charger_simulator")
+
+
+def record_incident(path):
+    """Record charger flapping between standby and charging and a DLB spike."""
+    charger = simulator.VirtualCharger(serial=100000000, pin=123456, phases=3, dlb=True, seed=1)
+    pin = convert_pin_to_hex(charger.pin)
+    values = build_frame(CLIENT_MESSAGE.REQUEST_DATA, {"pin": pin, "request_type": get_hex(REQUEST_TYPE.VALUES.value)})
+    dlb = build_frame(CLIENT_MESSAGE.REQUEST_DLB, {"pin": pin, "request_type": get_hex(REQUEST_TYPE.DLB.value)})
+
+    recorder = FrameRecorder(str(path))
+    recorder.open()
+    for second in range(4):
+        if second % 2:
+            charger.start()
+        else:
+            charger.stop()
+        charger.advance(30)
+        recorder.record(SENT, values, second)
+        recorder.record(RECEIVED, charger.handle(values), second + 0.01)
+    recorder.record(SENT, dlb, 4)
+    recorder.record(RECEIVED, simulator.ENCODERS[simulator.SERVER_MESSAGE.SEND_DLB].encode(
+        {"grid_power": 0, "house_power": 5000, "ev_power": 0, "solar_power": 0}
+    ), 4.01)
+    recorder.close()
+
+
+def test_decode_replays_pipeline(tmp_path):
+    record_incident(tmp_path / "charger.frames")
+
+    replayed = list(replay_frames.decode(str(tmp_path / "charger.frames")))
+    # replay is deterministic
+    replayed_again = list(replay_frames.decode(str(tmp_path / "charger.frames")))
+    assert replayed_again == replayed
+
+    states = [snapshot["state"] for _, _, snapshot in replayed[:4]]
+    assert states == ["STANDBY", "CHARGING", "STANDBY", "CHARGING"]
+    assert "charger_state" in replayed[0][2]
+    # house power spike is rejected by validation
+    assert replayed[-1][2]["house_power"] is None
+
+
+def test_decode_paced(tmp_path):
+    record_incident(tmp_path / "charger.frames")
+
+    started = time.monotonic()
+    assert len(list(replay_frames.decode(str(tmp_path / "charger.frames"), speed=20))) == 5
+    # 4 s recorded, played 20 times faster
+    assert time.monotonic() - started >= 0.2
@@ -1,16 +1,16 @@
+from datetime import timedelta
 import pytest
-from unittest.mock import MagicMock, AsyncMock
+from unittest.mock import MagicMock, AsyncMock, patch
 from custom_components.beny_wifi.sensor import (
-    BenyWifiVoltageSensor,
-    BenyWifiChargerStateSensor,
-    BenyWifiCurrentSensor,
-    BenyWifiEnergySensor,
-    BenyWifiPowerSensor,
+    DLB_SENSORS,
+    LINK_SENSORS,
+    SENSORS_1P,
+    SENSORS_3P,
     BenyWifiSensor,
-    BenyWifiTimerSensor
-
+    _voltage,
 )
 from custom_components.beny_wifi.const import DOMAIN
+from custom_components.beny_wifi.link_quality import LinkQuality
 from custom_components.beny_wifi.sensor import async_setup_entry
 from homeassistant.config_entries import ConfigEntry
 
@@ -31,18 +31,19 @@ def mock_coordinator():
         "total_kwh": 120,
         "timer_start": "08:00",
         "timer_end": "10:00",
+        "grid_power": 2.0,
     }
     coordinator.async_request_refresh = AsyncMock()
+    coordinator.config_entry.options = {}
     return coordinator
 
 
 @pytest.fixture
 def voltage_sensor(mock_coordinator):
     """Fixture to create a BenyWifiSensor instance."""
-    return BenyWifiVoltageSensor(
+    return BenyWifiSensor(
         coordinator=mock_coordinator,
-        key="state",
-        icon="mdi:chuck_norris",
+        description=_voltage("voltage1"),
         device_id="1234567890",
         device_model="BenyModel123",
     )
@@ -51,17 +52,16 @@ def test_sensor_initialization(voltage_sensor, mock_coordinator):
     """Test the initialization of the sensor."""
 
     # Ensure the sensor has the correct entity_id
-    assert voltage_sensor.entity_id == "sensor.1234567890_state"
+    assert voltage_sensor.entity_id == "sensor.1234567890_voltage1"
 
-    # Verify the sensor name and unique_id
-    #assert voltage_sensor.name == "Charger State"
-    assert voltage_sensor.unique_id == "1234567890_state"
+    # Verify the sensor unique_id
+    assert voltage_sensor.unique_id == "1234567890_voltage1"
 
     # Check that the sensor state matches the coordinator's data
-    assert voltage_sensor.state == "charging"
+    assert voltage_sensor.native_value == 230
 
-    # Test the unit of measurement (None for this sensor)
-    assert voltage_sensor.unit_of_measurement == 'V'
+    # Test the unit of measurement
+    assert voltage_sensor.native_unit_of_measurement == 'V'
 
     # Test the device info
     device_info = voltage_sensor.device_info
@@ -71,45 +71,138 @@ def test_sensor_initialization(voltage_sensor, mock_coordinator):
     assert device_info["model"] == "BenyModel123"
     assert device_info["serial_number"] == "1234567890"
 
-@pytest.mark.asyncio
-async def test_async_update(voltage_sensor, mock_coordinator):
-    """Test that the async_update method updates the sensor state."""
-
-    # Call async_update
-    await voltage_sensor.async_update()
-
-    # Ensure that async_request_refresh was called
-    mock_coordinator.async_request_refresh.assert_called_once()
-
-    # Simulate a state change in the coordinator
-    mock_coordinator.data["state"] = "charging"
-    await voltage_sensor.async_update()
-
-    # Check that the state has updated correctly
-    assert voltage_sensor.state == "charging"
-
-
-def test_sensor_properties(voltage_sensor, mock_coordinator):
-    """Test the sensor's properties."""
-    
-    # Test the state property
-    assert voltage_sensor.state == "charging"
-    
-    # Test the name property
-    #assert voltage_sensor.name == "Charger State"
-    
-    # Test the unique_id property
-    assert voltage_sensor.unique_id == "1234567890_state"
-    
-    # Test the unit_of_measurement property
-    assert voltage_sensor.unit_of_measurement == 'V'
-
-    # Test the device_info property
-    device_info = voltage_sensor.device_info
-    assert device_info["name"] == "Beny Charger 1234567890"
-    assert device_info["manufacturer"] == "ZJ Beny"
-    assert device_info["model"] == "BenyModel123"
-    assert device_info["serial_number"] == "1234567890"
+def test_sensor_does_not_poll(voltage_sensor, mock_coordinator):
+    """Test that sensor is updated by coordinator instead of polling."""
+
+    assert voltage_sensor.should_poll is False
+
+    # Simulate a state change pushed by the coordinator
+    mock_coordinator.data["voltage1"] = 231
+    assert voltage_sensor.native_value == 231
+    mock_coordinator.async_request_refresh.assert_not_called()
+
+def test_sensor_writes_only_changed_values(voltage_sensor, mock_coordinator):
+    """Test that state is written only when own value changes."""
+    voltage_sensor.async_write_ha_state = MagicMock()
+    mock_coordinator.last_update_success = True
+
+    mock_coordinator.changed_keys = {"voltage1"}
+    voltage_sensor._handle_coordinator_update()
+    assert voltage_sensor.async_write_ha_state.call_count == 1
+
+    mock_coordinator.changed_keys = {"current1"}
+    voltage_sensor._handle_coordinator_update()
+    assert voltage_sensor.async_write_ha_state.call_count == 1
+
+    # availability change is written even if value did not change
+    mock_coordinator.last_update_success = False
+    voltage_sensor._handle_coordinator_update()
+    assert voltage_sensor.async_write_ha_state.call_count == 2
+
+def test_sensor_deadband(voltage_sensor, mock_coordinator):
+    """Test that measurement changes within deadband are not written."""
+    voltage_sensor.async_write_ha_state = MagicMock()
+    mock_coordinator.last_update_success = True
+    mock_coordinator.changed_keys = {"voltage1"}
+    voltage_sensor._handle_coordinator_update()
+
+    # default voltage deadband is 2 V
+    mock_coordinator.data["voltage1"] = 231.5
+    voltage_sensor._handle_coordinator_update()
+    assert voltage_sensor.async_write_ha_state.call_count == 1
+
+    mock_coordinator.data["voltage1"] = 233
+    voltage_sensor._handle_coordinator_update()
+    assert voltage_sensor.async_write_ha_state.call_count == 2
+
+    # relative deadband of power, 2 % of last written value
+    sensor = BenyWifiSensor(mock_coordinator, DLB_SENSORS[0], device_id="1234567890")
+    sensor.async_write_ha_state = MagicMock()
+    mock_coordinator.changed_keys = {"grid_power"}
+    sensor._handle_coordinator_update()
+    mock_coordinator.data["grid_power"] = 2.03
+    sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 1
+    mock_coordinator.data["grid_power"] = 2.1
+    sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 2
+
+def test_sensor_min_write_interval_and_heartbeat(voltage_sensor, mock_coordinator):
+    """Test that writes are rate limited and suppressed changes are written by heartbeat."""
+    voltage_sensor.async_write_ha_state = MagicMock()
+    mock_coordinator.last_update_success = True
+    mock_coordinator.changed_keys = {"voltage1"}
+    mock_coordinator.config_entry.options = {"min_write_interval": 60}
+    voltage_sensor._handle_coordinator_update()
+
+    mock_coordinator.data["voltage1"] = 240
+    voltage_sensor._handle_coordinator_update()
+    assert voltage_sensor.async_write_ha_state.call_count == 1
+
+    voltage_sensor._async_heartbeat(None)
+    assert voltage_sensor.async_write_ha_state.call_count == 2
+    assert voltage_sensor._written_value == 240
+
+    # nothing to write when value is unchanged
+    voltage_sensor._async_heartbeat(None)
+    assert voltage_sensor.async_write_ha_state.call_count == 2
+
+    later = voltage_sensor._written_at + timedelta(seconds=61)
+    mock_coordinator.data["voltage1"] = 230
+    with patch("custom_components.beny_wifi.sensor.utcnow", return_value=later):
+        voltage_sensor._handle_coordinator_update()
+    assert voltage_sensor.async_write_ha_state.call_count == 3
+
+def test_sensor_heartbeat_forces_write(voltage_sensor, mock_coordinator):
+    """Test that heartbeat forces write of value held back by deadband once heartbeat interval has passed."""
+    forced = []
+    voltage_sensor.async_write_ha_state = MagicMock(
+        side_effect=lambda: forced.append(getattr(voltage_sensor, "_attr_force_update", False))
+    )
+    mock_coordinator.last_update_success = True
+    mock_coordinator.changed_keys = {"voltage1"}
+    mock_coordinator.config_entry.options = {"heartbeat_interval": 15}
+    voltage_sensor._handle_coordinator_update()
+
+    # value stays within deadband, suppressed change is written by first heartbeat
+    mock_coordinator.data["voltage1"] = 231
+    voltage_sensor._handle_coordinator_update()
+    voltage_sensor._async_heartbeat(None)
+    assert forced == [False, False]
+
+    # unchanged value is not written again before heartbeat interval has passed
+    voltage_sensor._handle_coordinator_update()
+    voltage_sensor._async_heartbeat(None)
+    assert forced == [False, False]
+
+    later = voltage_sensor._written_at + timedelta(minutes=15)
+    with patch("custom_components.beny_wifi.sensor.utcnow", return_value=later):
+        voltage_sensor._async_heartbeat(None)
+    assert forced == [False, False, True]
+    assert voltage_sensor._written_at == later
+    assert not voltage_sensor._attr_force_update
+
+def test_link_quality_sensor_reads_transport(mock_coordinator):
+    """Test that link quality is read from transport and written when it changes, without snapshot change."""
+    quality = LinkQuality()
+    mock_coordinator.transport.quality = quality
+    mock_coordinator.last_update_success = True
+    mock_coordinator.changed_keys = set()
+    sensor = BenyWifiSensor(mock_coordinator, LINK_SENSORS[3], device_id="1234567890")
+    sensor.async_write_ha_state = MagicMock()
+    assert sensor.key == "packet_loss"
+
+    sensor._handle_coordinator_update()
+    assert sensor.native_value is None
+
+    # unchanged statistics are not written again
+    sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 1
+
+    quality.add_attempt(lost=True)
+    sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 2
+    assert sensor.native_value == 100.0
 
 @pytest.fixture
 def mock_hass():
@@ -125,6 +218,8 @@ def mock_config_entry():
     config_entry.data = {
         "serial": "1234567890",
         "model": "BenyModel123",
+        "charger_type": "3P",
+        "dlb": True,
     }
     return config_entry
 
@@ -136,22 +231,28 @@ async def test_async_setup_entry(mock_hass, mock_config_entry, mock_coordinator)
     mock_hass.data = {DOMAIN: {mock_config_entry.entry_id: {"coordinator": mock_coordinator}}}
 
     # Mock async_add_entities to track the entities being added
-    async_add_entities = AsyncMock()
+    async_add_entities = MagicMock()
 
     # Call async_setup_entry to simulate the setup
     await async_setup_entry(mock_hass, mock_config_entry, async_add_entities)
 
-    # Check that async_add_entities was called with the correct sensors
-    assert async_add_entities.call_count == 1  # We expect 12 sensors to be added
+    # Check that async_add_entities was called once with all sensors
+    assert async_add_entities.call_count == 1
 
     # Verify the sensors were correctly initialized and added
     args, _ = async_add_entities.call_args
     sensors = args[0]
 
-    assert len(sensors) == 13  # We expect 12 sensors to be created
+    assert len(sensors) == len(SENSORS_3P) + len(DLB_SENSORS) + len(LINK_SENSORS)
+    assert len(SENSORS_1P) < len(SENSORS_3P)
 
     # Check the attributes of one of the sensors
     sensor = sensors[0]
     assert sensor.entity_id == "sensor.1234567890_charger_state"
     assert sensor.unique_id == "1234567890_charger_state"
-    assert sensor.state is None
+    assert sensor.native_value is None
+
+    # link quality sensors are diagnostic and disabled by default
+    link_sensors = sensors[-len(LINK_SENSORS):]
+    assert all(sensor.entity_description.entity_category == "diagnostic" for sensor in link_sensors)
+    assert not any(sensor.entity_description.entity_registry_enabled_default for sensor in link_sensors)
@@ -0,0 +1,242 @@
+# tests/test_transport.py
+import asyncio
+
+import pytest
+
+from custom_components.beny_wifi.const import EXPECTED_RESPONSES, REQUEST_TYPE
+from custom_components.beny_wifi.recorder import RECEIVED, SENT, FrameRecorder, read_log
+from custom_components.beny_wifi.transport import MAX_RTO, MIN_RTO, ChargerTransport, RttEstimator
+
+# loopback chargers are real UDP sockets, which the Home Assistant test plugin blocks by default
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+REQUEST = b"55aa10000b0000cb347089"
+RESPONSE = b"55aa10001103075BCD15c0a801220d0504"
+VALUES = b"55aa1000237000000000e600e800e6000000005e05000000000000000f0000000003cb"
+DLB = b"55aa7b00217b0000001e005a0032fff6000000b5"
+
+
+class FakeCharger(asyncio.DatagramProtocol):
+    """Loopback charger answering requests with canned responses."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.received = []
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.received.append(data)
+        if self.responses:
+            response = self.responses.pop(0)
+            if response is not None:
+                self.transport.sendto(response, addr)
+
+
+async def start_charger(responses):
+    loop = asyncio.get_running_loop()
+    endpoint, charger = await loop.create_datagram_endpoint(
+        lambda: FakeCharger(responses), local_addr=("127.0.0.1", 0)
+    )
+    return endpoint, charger, endpoint.get_extra_info("sockname")[1]
+
+
+@pytest.mark.asyncio
+async def test_request_response():
+    endpoint, charger, port = await start_charger([RESPONSE])
+    transport = ChargerTransport("127.0.0.1", port)
+    try:
+        assert await transport.async_request(REQUEST, timeout=1) == RESPONSE
+        assert charger.received == [REQUEST]
+        assert transport.connected
+    finally:
+        transport.close()
+        endpoint.close()
+    assert not transport.connected
+
+
+@pytest.mark.asyncio
+async def test_request_retried_after_timeout():
+    # first request is dropped, retry is answered
+    endpoint, charger, port = await start_charger([None, RESPONSE])
+    transport = ChargerTransport("127.0.0.1", port)
+    try:
+        assert await transport.async_request(REQUEST, retries=2, timeout=0.2) == RESPONSE
+        assert charger.received == [REQUEST, REQUEST]
+    finally:
+        transport.close()
+        endpoint.close()
+
+
+@pytest.mark.asyncio
+async def test_request_timeout():
+    endpoint, charger, port = await start_charger([])
+    transport = ChargerTransport("127.0.0.1", port)
+    try:
+        with pytest.raises(asyncio.TimeoutError, match="timed out after 2 attempts"):
+            await transport.async_request(REQUEST, retries=2, timeout=0.1)
+        assert len(charger.received) == 2
+    finally:
+        transport.close()
+        endpoint.close()
+
+
+@pytest.mark.asyncio
+async def test_unexpected_datagram_discarded():
+    transport = ChargerTransport("127.0.0.1", 3333)
+    # nothing is waiting, datagram must not raise
+    transport.datagram_received(RESPONSE, ("127.0.0.1", 3333))
+    assert transport.discarded == 1
+
+
+class ReversingCharger(FakeCharger):
+    """Charger answering two requests in reverse order."""
+
+    def datagram_received(self, data, addr):
+        self.received.append(data)
+        if len(self.received) == 2:
+            for response in reversed(self.responses):
+                self.transport.sendto(response, addr)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_matched_by_header():
+    loop = asyncio.get_running_loop()
+    endpoint, charger = await loop.create_datagram_endpoint(
+        lambda: ReversingCharger([VALUES, DLB]), local_addr=("127.0.0.1", 0)
+    )
+    transport = ChargerTransport("127.0.0.1", endpoint.get_extra_info("sockname")[1])
+    try:
+        values, dlb = await asyncio.gather(
+            transport.async_request(b"values", timeout=1, expect=EXPECTED_RESPONSES[REQUEST_TYPE.VALUES]),
+            transport.async_request(b"dlb", timeout=1, expect=EXPECTED_RESPONSES[REQUEST_TYPE.DLB]),
+        )
+        assert values == VALUES
+        assert dlb == DLB
+    finally:
+        transport.close()
+        endpoint.close()
+
+
+@pytest.mark.asyncio
+async def test_stray_datagram_not_matched():
+    endpoint, charger, port = await start_charger([])
+    transport = ChargerTransport("127.0.0.1", port)
+    try:
+        pending = asyncio.ensure_future(
+            transport.async_request(b"dlb", timeout=1, expect=EXPECTED_RESPONSES[REQUEST_TYPE.DLB])
+        )
+        await asyncio.sleep(0.01)
+        # values frame is not a response to dlb request
+        transport.datagram_received(VALUES, ("127.0.0.1", port))
+        assert transport.discarded == 1
+        transport.datagram_received(DLB, ("127.0.0.1", port))
+        assert await pending == DLB
+    finally:
+        transport.close()
+        endpoint.close()
+
+
+def test_rtt_estimator():
+    rtt = RttEstimator()
+    rtt.sample(0.05)
+    assert rtt.srtt == 0.05
+    assert rtt.rto == MIN_RTO
+    for _ in range(20):
+        rtt.sample(1.0)
+    assert 0.9 < rtt.srtt < 1.0
+    assert rtt.rto > rtt.srtt
+
+
+def test_rtt_backoff():
+    rtt = RttEstimator()
+    rtt.sample(0.05)
+    assert rtt.backoff(rtt.rto) == 2 * MIN_RTO
+    # concurrent request timing out with the same timeout does not double again
+    assert rtt.backoff(MIN_RTO) == 2 * MIN_RTO
+    for _ in range(10):
+        rtt.backoff(rtt.rto)
+    assert rtt.rto == MAX_RTO
+
+
+@pytest.mark.asyncio
+async def test_lost_datagram_recovered_quickly():
+    endpoint, charger, port = await start_charger([RESPONSE, RESPONSE, None, RESPONSE])
+    transport = ChargerTransport("127.0.0.1", port)
+    loop = asyncio.get_running_loop()
+    try:
+        # learn round trip time of loopback charger
+        await transport.async_request(REQUEST)
+        await transport.async_request(REQUEST)
+        assert transport.rtt.rto == MIN_RTO
+
+        start = loop.time()
+        assert await transport.async_request(REQUEST) == RESPONSE
+        assert loop.time() - start < 1
+        assert len(charger.received) == 4
+    finally:
+        transport.close()
+        endpoint.close()
+
+
+@pytest.mark.asyncio
+async def test_exchanges_traced():
+    endpoint, charger, port = await start_charger([None, RESPONSE])
+    transport = ChargerTransport("127.0.0.1", port)
+    try:
+        await transport.async_request(REQUEST, retries=2, timeout=0.1)
+        with pytest.raises(asyncio.TimeoutError):
+            await transport.async_request(REQUEST, retries=1, timeout=0.1)
+        transport.datagram_received(DLB, ("127.0.0.1", port))
+
+        answered, timed_out, discarded = transport.trace
+        assert answered.request == REQUEST
+        assert answered.response == RESPONSE
+        assert answered.attempts == 2
+        assert answered.rtt < 0.1
+        assert answered.error is None
+        assert timed_out.response is None
+        assert timed_out.error == "timeout"
+        assert discarded.request is None
+        assert discarded.response == DLB
+        assert discarded.error == "discarded"
+    finally:
+        transport.close()
+        endpoint.close()
+
+
+@pytest.mark.asyncio
+async def test_link_quality_recorded():
+    endpoint, charger, port = await start_charger([None, RESPONSE, RESPONSE])
+    transport = ChargerTransport("127.0.0.1", port)
+    try:
+        await transport.async_request(REQUEST, retries=2, timeout=0.1)
+        await transport.async_request(REQUEST, retries=2, timeout=0.1)
+
+        assert transport.quality.retries == 1
+        # late response is ambiguous, only second request is a round trip time sample
+        assert transport.quality.rtt.total == 1
+        assert 0 < transport.quality.loss < 1
+    finally:
+        transport.close()
+        endpoint.close()
+
+
+@pytest.mark.asyncio
+async def test_frames_recorded(tmp_path):
+    endpoint, charger, port = await start_charger([None, RESPONSE])
+    transport = ChargerTransport("127.0.0.1", port)
+    transport.recorder = FrameRecorder(str(tmp_path / "charger.frames"))
+    transport.recorder.open()
+    try:
+        await transport.async_request(REQUEST, retries=2, timeout=0.1)
+    finally:
+        transport.close()
+        endpoint.close()
+        transport.recorder.close()
+
+    records = list(read_log(str(tmp_path / "charger.frames")))
+    assert [(record.direction, record.frame) for record in records] == [(SENT, REQUEST), (SENT, REQUEST), (RECEIVED, RESPONSE)]
+    assert records[0].timestamp <= records[1].timestamp <= records[2].timestamp
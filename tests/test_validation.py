@@ -0,0 +1,72 @@
+# tests/test_validation.py
+from custom_components.beny_wifi.validation import (
+    DEFAULT_BOUNDS,
+    Bounds,
+    SnapshotValidator,
+    bounds_with_limits,
+)
+
+
+def test_valid_values_passed():
+    validator = SnapshotValidator()
+    data = {"grid_power": 2.0, "voltage1": 230, "state": "CHARGING"}
+    assert validator.validate(data) == {"grid_power": 2.0, "voltage1": 230, "state": "CHARGING"}
+
+
+def test_out_of_range_replaced_with_last_valid():
+    validator = SnapshotValidator()
+    validator.validate({"grid_power": 2.0})
+
+    assert validator.validate({"grid_power": 6553.5}) == {"grid_power": 2.0}
+    assert validator.validate({"solar_power": 31.0}) == {"solar_power": None}
+    assert validator.validate({"power": None}) == {"power": None}
+    assert validator.rejected["grid_power"] == 1
+    assert validator.rejected["solar_power"] == 1
+
+
+def test_sentinel_rejected_at_field_scale():
+    # limits above sentinels, so only sentinel check can reject them
+    validator = SnapshotValidator(bounds_with_limits({"house_power": 1000.0, "power": 10000.0}))
+
+    # DLB power is 0xFFFF scaled by 10 in codec and again by 10 in snapshot
+    assert validator.validate({"house_power": 655.35}) == {"house_power": None}
+    assert validator.validate({"power": 6553.4}) == {"power": None}
+    assert validator.validate({"house_power": 655.0}) == {"house_power": 655.0}
+    assert validator.rejected["house_power"] == 1
+    assert validator.rejected["power"] == 1
+
+
+def test_negative_grid_power_is_valid():
+    # grid power is negative when exporting
+    validator = SnapshotValidator()
+    assert validator.validate({"grid_power": -1.0}) == {"grid_power": -1.0}
+
+
+def test_rolling_median_removes_single_spike():
+    validator = SnapshotValidator(window=3)
+    values = [validator.validate({"power": power})["power"] for power in (7.0, 7.1, 20.0, 7.2, 7.2)]
+    assert values == [7.0, 7.1, 7.1, 7.2, 7.2]
+
+    # real step change is followed after half of window
+    values = [validator.validate({"power": power})["power"] for power in (0.0, 0.0)]
+    assert values == [7.2, 0.0]
+
+
+def test_even_window_rounded_up():
+    # median of two samples would only halve a spike
+    validator = SnapshotValidator(window=2)
+    values = [validator.validate({"power": power})["power"] for power in (7.0, 7.1, 20.0, 7.2)]
+    assert values == [7.0, 7.1, 7.1, 7.2]
+
+
+def test_spike_filter_disabled():
+    validator = SnapshotValidator(window=1)
+    values = [validator.validate({"power": power})["power"] for power in (7.0, 20.0, 7.0)]
+    assert values == [7.0, 20.0, 7.0]
+
+
+def test_bounds_with_limits():
+    bounds = bounds_with_limits({"grid_power": 17.0, "house_power": 10.0})
+    assert bounds["grid_power"] == Bounds(-17.0, 17.0)
+    assert bounds["house_power"] == Bounds(0, 10.0)
+    assert bounds["voltage1"] == DEFAULT_BOUNDS["voltage1"]
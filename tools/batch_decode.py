@@ -0,0 +1,318 @@
+"""Vectorized decoding of equal-layout charger frames to NumPy columns.
+
+Decoding frames one by one with read_message builds a dict per frame, which is
+too slow and memory hungry for millions of frames. Here a batch of frames of
+one message type, like all SEND_DLB responses of a month, is decoded at once:
+
+- ascii hex frames are turned to a (frames, nibbles) array with a lookup table
+- checksums of all frames are validated with one sum over the byte columns
+- fields are read at the slices of the message structure in const.py, so a
+  field of n nibbles is one dot product with powers of 16
+- conversions of the codec are applied to whole columns: DECI is divided by
+  10, SIGNED_DECI is read as 16-bit two's complement and divided by 10
+
+Enum fields, like state, are kept as integer codes, labels() turns them to
+member names. Frame fields (IP, MODEL) are not numeric and are left out.
+Values are those of read_message, the coordinator scales DLB powers once more
+by 10 when building snapshot values.
+
+Frame archives are decoded straight from their segment files mapped as
+structured arrays, without iterating records in Python. Requires numpy.
+
+Run from repository root, Home Assistant is not needed:
+
+    python tools/batch_decode.py archive SEND_DLB --serial 123456789 --start 2026-01-01 -o dlb.npz
+"""
+import argparse
+from collections.abc import Sequence
+from enum import Enum
+import logging
+from pathlib import Path
+import sys
+import time
+
+import numpy as np
+
+TOOLS = Path(__file__).resolve().parent
+sys.path.insert(0, str(TOOLS))
+
+import headless  # noqa: E402, F401
+
+from custom_components.beny_wifi.const import CLIENT_MESSAGE, FIELD, SERVER_MESSAGE  # noqa: E402
+from custom_components.beny_wifi.recorder import RAW  # noqa: E402
+from frame_archive import (  # noqa: E402
+    DATA_SUFFIX,
+    FRAME_SIZE,
+    MAGIC,
+    _load_messages,
+    _timestamp,
+    segment_name,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# archive record layout, same as frame_archive.RECORD
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("serial", "<u8"),
+    ("direction", "u1"),
+    ("message", "u1"),
+    ("length", "<u2"),
+    ("frame", "u1", (FRAME_SIZE,)),
+])
+
+# ascii character to nibble value, 0xFF for non-hex characters
+_NIBBLES = np.full(256, 0xFF, dtype=np.uint8)
+for _char in b"0123456789abcdef":
+    _NIBBLES[_char] = _NIBBLES[ord(chr(_char).upper())] = int(chr(_char), 16)
+
+VALID = "valid"
+
+
+def _message(message: SERVER_MESSAGE | CLIENT_MESSAGE | str) -> SERVER_MESSAGE | CLIENT_MESSAGE:
+    if not isinstance(message, str):
+        return message
+    name = message.rsplit(".", 1)[-1]
+    for messages in (SERVER_MESSAGE, CLIENT_MESSAGE):
+        if name in messages.__members__:
+            return messages[name]
+    raise ValueError(f"Unknown message type: {message}")
+
+
+def _int_dtype(width: int) -> np.dtype:
+    """Smallest unsigned integer type of field of width nibbles."""
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if width * 4 <= np.dtype(dtype).itemsize * 8:
+            return np.dtype(dtype)
+    return np.dtype(np.uint64)
+
+
+def layout(message: SERVER_MESSAGE | CLIENT_MESSAGE | str) -> list[tuple[str, slice, object]]:
+    """Numeric fields of message with their slices and conversions.
+
+    Returns:
+        list: (field, slice in nibbles, conversion or None) in structure order
+
+    """
+    message = _message(message)
+    conversions = message.value.get("conversions", {})
+    return [
+        (param, pos, conversions.get(param))
+        for param, pos in message.value["structure"].items()
+        if conversions.get(param) not in (FIELD.IP, FIELD.MODEL)
+    ]
+
+
+def hex_nibbles(frames: Sequence[bytes | str]) -> tuple[np.ndarray, np.ndarray]:
+    """Convert equal length ascii hex frames to nibble values.
+
+    Returns:
+        tuple: (frames, nibbles) uint8 array and mask of frames with only hex characters
+
+    Raises:
+        ValueError: frames are not of equal length
+
+    """
+    frames = [frame.encode("ascii") if isinstance(frame, str) else frame for frame in frames]
+    length = len(frames[0]) if frames else 0
+    if any(len(frame) != length for frame in frames):
+        raise ValueError("Frames must be of equal length")
+    ascii_hex = np.frombuffer(b"".join(frames), dtype=np.uint8).reshape(len(frames), length)
+    nibbles = _NIBBLES[ascii_hex]
+    hex_valid = (nibbles != 0xFF).all(axis=1)
+    if length % 2:
+        hex_valid[:] = False
+    return nibbles, hex_valid
+
+
+def raw_nibbles(data: np.ndarray) -> np.ndarray:
+    """Split (frames, bytes) array of raw frames to (frames, nibbles) array."""
+    nibbles = np.empty((data.shape[0], data.shape[1] * 2), dtype=np.uint8)
+    nibbles[:, 0::2] = data >> 4
+    nibbles[:, 1::2] = data & 0x0F
+    return nibbles
+
+
+def checksums_valid(nibbles: np.ndarray, lengths: np.ndarray | None = None) -> np.ndarray:
+    """Validate checksums of frames, like codec.checksum_valid.
+
+    Args:
+        nibbles (np.ndarray): (frames, nibbles) array, frames may be padded after their end
+        lengths (np.ndarray, optional): frame lengths in bytes, all frames are full width if not given
+
+    Returns:
+        np.ndarray: bool mask of frames with valid checksum
+
+    """
+    data = (nibbles[:, 0::2].astype(np.uint32) << 4) | nibbles[:, 1::2]
+    if lengths is None:
+        if not data.shape[1]:
+            return np.zeros(data.shape[0], dtype=bool)
+        return (data[:, :-1].sum(axis=1) & 0xFF) == data[:, -1]
+
+    lengths = lengths.astype(np.int64)
+    last = np.clip(lengths - 1, 0, data.shape[1] - 1)
+    body = np.arange(data.shape[1]) < last[:, None]
+    checksum = np.take_along_axis(data, last[:, None], axis=1)[:, 0]
+    return ((np.where(body, data, 0).sum(axis=1) & 0xFF) == checksum) & (lengths > 0)
+
+
+def decode_nibbles(
+    nibbles: np.ndarray, message: SERVER_MESSAGE | CLIENT_MESSAGE | str, lengths: np.ndarray | None = None
+) -> dict[str, np.ndarray]:
+    """Decode (frames, nibbles) array of one message type to columns.
+
+    Frames too short for a field, or with invalid checksum, are marked False in
+    "valid" column. Their values are decoded from whatever the frame holds.
+    """
+    valid = checksums_valid(nibbles, lengths)
+    columns = {VALID: valid}
+    for param, pos, conversion in layout(message):
+        if pos.stop > nibbles.shape[1]:
+            raise ValueError(f"Field {param} is beyond frames of {nibbles.shape[1]} nibbles")
+        if lengths is not None:
+            valid &= lengths * 2 >= pos.stop
+
+        width = pos.stop - pos.start
+        powers = 16 ** np.arange(width - 1, -1, -1, dtype=np.uint64)
+        value = nibbles[:, pos].astype(np.uint64) @ powers
+        if conversion is FIELD.DECI:
+            columns[param] = value / 10
+        elif conversion is FIELD.SIGNED_DECI:
+            value = value.astype(np.int64)
+            columns[param] = np.where(value >= 0x8000, value - 0x10000, value) / 10
+        else:
+            columns[param] = value.astype(_int_dtype(width))
+    return columns
+
+
+def decode_frames(frames: Sequence[bytes | str], message: SERVER_MESSAGE | CLIENT_MESSAGE | str) -> dict[str, np.ndarray]:
+    """Decode equal length ascii hex frames of one message type to columns.
+
+    Args:
+        frames (Sequence): ascii hex frames, like responses from pcap_to_json or a frame log
+        message (SERVER_MESSAGE | CLIENT_MESSAGE | str): message type of frames, like "SEND_DLB"
+
+    Returns:
+        dict: column array per field and "valid" mask of frames with valid checksum
+
+    Raises:
+        ValueError: frames are not of equal length or too short for message
+
+    """
+    nibbles, hex_valid = hex_nibbles(frames)
+    columns = decode_nibbles(nibbles, message)
+    columns[VALID] &= hex_valid
+    return columns
+
+
+def to_structured(columns: dict[str, np.ndarray]) -> np.ndarray:
+    """Combine columns to structured array, one record per frame."""
+    names = list(columns)
+    array = np.empty(len(columns[names[0]]) if names else 0, dtype=[(name, columns[name].dtype) for name in names])
+    for name in names:
+        array[name] = columns[name]
+    return array
+
+
+def labels(codes: np.ndarray, enum_cls: type[Enum]) -> np.ndarray:
+    """Map enum codes to member names, None for codes not in enum."""
+    table = {member.value: member.name for member in enum_cls}
+    unique, inverse = np.unique(codes, return_inverse=True)
+    return np.array([table.get(int(code)) for code in unique], dtype=object)[inverse]
+
+
+def read_segment(path: Path) -> np.ndarray:
+    """Map segment data file of frame archive as structured array of records."""
+    size = path.stat().st_size
+    count = (size - len(MAGIC)) // RECORD_DTYPE.itemsize if size > len(MAGIC) else 0
+    if not count:
+        return np.empty(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=len(MAGIC), shape=(count,))
+
+
+def decode_archive(
+    path: str,
+    message: SERVER_MESSAGE | CLIENT_MESSAGE | str,
+    serial: int | None = None,
+    start: float | None = None,
+    end: float | None = None,
+) -> dict[str, np.ndarray]:
+    """Decode archived frames of message type to columns.
+
+    Records of segments in range are selected with masks over whole segments,
+    indexes are not needed. Frames archived as received (RAW) are skipped.
+
+    Args:
+        path (str): frame archive directory
+        message (SERVER_MESSAGE | CLIENT_MESSAGE | str): message type, like "SEND_DLB"
+        serial (int, optional): charger serial
+        start (float, optional): unix time of first frame, inclusive
+        end (float, optional): unix time of last frame, exclusive
+
+    Returns:
+        dict: "timestamp", "serial" and "direction" columns, decoded fields and "valid" mask, in time order
+
+    """
+    archive = Path(path)
+    name = _message(message).name
+    messages = _load_messages(archive)
+    code = messages.index(name) if name in messages else None
+
+    first = segment_name(start) if start is not None else ""
+    last = segment_name(end) if end is not None else "99999999"
+    selected = []
+    skipped = 0
+    for segment in sorted(archive.glob(f"*{DATA_SUFFIX}")):
+        if code is None or not first <= segment.stem <= last:
+            continue
+        records = read_segment(segment)
+        mask = records["message"] == code
+        if serial is not None:
+            mask &= records["serial"] == serial
+        if start is not None:
+            mask &= records["timestamp"] >= start
+        if end is not None:
+            mask &= records["timestamp"] < end
+        raw = (records["direction"] & RAW) != 0
+        skipped += int(np.count_nonzero(mask & raw))
+        selected.append(records[mask & ~raw])
+    if skipped:
+        _LOGGER.warning("%s frames archived as received were skipped", skipped)
+
+    records = np.concatenate(selected) if selected else np.empty(0, dtype=RECORD_DTYPE)
+    records = records[np.argsort(records["timestamp"], kind="stable")]
+    columns = {
+        "timestamp": records["timestamp"],
+        "serial": records["serial"],
+        "direction": records["direction"],
+    }
+    columns.update(decode_nibbles(raw_nibbles(records["frame"]), message, records["length"]))
+    return columns
+
+
+def main() -> None:
+    """Parse arguments and decode archive to npz file."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("archive", help="frame archive directory")
+    parser.add_argument("message", help="message type, like SEND_DLB")
+    parser.add_argument("--serial", type=int)
+    parser.add_argument("--start", type=_timestamp, help="ISO time, UTC if no offset")
+    parser.add_argument("--end", type=_timestamp, help="ISO time, UTC if no offset")
+    parser.add_argument("-o", "--output", required=True, help="npz file of column arrays")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    started = time.perf_counter()
+    columns = decode_archive(args.archive, args.message, args.serial, args.start, args.end)
+    elapsed = time.perf_counter() - started
+    np.savez(args.output, **columns)
+    count = len(columns[VALID])
+    _LOGGER.info(
+        "Decoded %s frames (%s with valid checksum) in %.3f s, %.0f frames/s",
+        count, int(np.count_nonzero(columns[VALID])), elapsed, count / elapsed if elapsed else 0,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Benchmark compiled codec against the interpreted read_message it replaced.
+
+Run from repository root, Home Assistant is not needed:
+
+    python tools/benchmark_codec.py [iterations]
+"""
+import logging
+from pathlib import Path
+import sys
+import timeit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import headless  # noqa: E402, F401
+
+from custom_components.beny_wifi.codec import get_decoder  # noqa: E402
+from custom_components.beny_wifi.communication import read_message  # noqa: E402
+from custom_components.beny_wifi.const import (  # noqa: E402
+    CHARGER_STATE,
+    CLIENT_MESSAGE,
+    REQUEST_TYPE,
+    SERVER_MESSAGE,
+    TIMER_STATE,
+)
+from custom_components.beny_wifi.conversions import (  # noqa: E402
+    convert_weekdays_to_dict,
+    get_ip,
+    get_model,
+)
+
+ITERATIONS = 20000
+
+
+def legacy_calculate_checksum(data: str) -> int:
+    """Checksum summed pair by pair as it was before the compiled codec, for reference."""
+    data = data[:-2]
+    return sum([int(data[i:i+2], 16) for i in range(0, len(data), 2)]) % 256
+
+
+def legacy_validate_checksum(data) -> bool:
+    """Checksum validation as it was before the compiled codec, for reference."""
+    return int(data[-2:], 16) == legacy_calculate_checksum(data)
+
+
+def with_checksum(body: str) -> bytes:
+    """Append checksum to message body, return as bytes like received from socket."""
+    return (body + f"{legacy_calculate_checksum(body + '00'):02x}").encode("ascii")
+
+
+FRAMES = {
+    SERVER_MESSAGE.SEND_VALUES_1P: with_checksum("55aa10001e700000000a00e6012c0123250601000800001600100a"),
+    SERVER_MESSAGE.SEND_VALUES_3P: with_checksum("55aa1000237000000000e600e800e6000000005e05000000000000000f00000000"),
+    SERVER_MESSAGE.SEND_DLB: with_checksum("55aa7b00217b0000001e005a0032fff6000000"),
+    SERVER_MESSAGE.HANDSHAKE: with_checksum("55aa10001103075BCD15c0a801220d05"),
+    SERVER_MESSAGE.SEND_SETTINGS: with_checksum("55aa100020710201000155000f00197f0c22173b0000010100011406000002"),
+}
+
+
+def legacy_get_message_type(data):  # noqa: C901
+    """If-chain message identification as it was before the dispatch registry, for reference."""
+    message_type = data[4:6]
+    msg_int = int(data[6:10], 16)
+
+    if msg_int == 11:
+        return CLIENT_MESSAGE.REQUEST_DATA
+    if msg_int == 28:
+        return CLIENT_MESSAGE.SET_TIMER
+    if msg_int == 12:
+        return CLIENT_MESSAGE.SEND_CHARGER_COMMAND
+    if msg_int == 8:
+        return SERVER_MESSAGE.ACCESS_DENIED
+    if msg_int == 30:
+        return SERVER_MESSAGE.SEND_VALUES_1P
+    if msg_int == 35:
+        return SERVER_MESSAGE.SEND_VALUES_3P
+    if msg_int == 33:
+        return SERVER_MESSAGE.SEND_DLB
+    if msg_int == 17:
+        if message_type.upper() == '7B':
+            return SERVER_MESSAGE.SEND_DLB
+        return SERVER_MESSAGE.HANDSHAKE
+    if msg_int == 32:
+        return SERVER_MESSAGE.SEND_MODEL
+    return None
+
+
+def legacy_read_message(data, msg_type=None) -> dict:  # noqa: C901
+    """Interpreted read_message as it was before the compiled codec, for reference."""
+    if not legacy_validate_checksum(data):
+        return None
+
+    if not msg_type:
+        msg_type = legacy_get_message_type(data)
+
+    msg = {"message_type": str(msg_type)}
+
+    for param, pos in {"header": slice(0, 4), "message_id": slice(6, 10)}.items():
+        msg[param] = int(data[pos], 16)
+
+    if msg_type in (SERVER_MESSAGE.SEND_VALUES_1P, SERVER_MESSAGE.SEND_VALUES_3P):
+        for param, pos in msg_type.value["structure"].items():
+            value = int(data[pos], 16)
+            try:
+                if param == "state":
+                    msg[param] = CHARGER_STATE(value).name
+                elif param == "timer_state":
+                    msg[param] = TIMER_STATE(value).name
+                elif param == "total_kwh":
+                    msg[param] = float(value) / 10
+                elif param == "request_type":
+                    msg[param] = REQUEST_TYPE(value).name
+                else:
+                    msg[param] = value
+            except ValueError:
+                msg[param] = None
+
+    if msg_type == SERVER_MESSAGE.SEND_DLB:
+        for param, pos in msg_type.value["structure"].items():
+            value = int(data[pos], 16)
+            if param == "grid_power":
+                if value >= 0x8000:
+                    value = value - 0x10000
+                msg[param] = float(value) / 10
+            elif param in ["ev_power", "house_power", "solar_power"]:
+                msg[param] = float(value) / 10
+            else:
+                msg[param] = value
+
+    if msg_type == SERVER_MESSAGE.SEND_MODEL:
+        for param, pos in msg_type.value["structure"].items():
+            if param == "model":
+                msg["model"] = get_model(data)
+            elif param == "request_type":
+                msg[param] = REQUEST_TYPE(int(data[pos], 16)).name
+
+    elif msg_type == SERVER_MESSAGE.HANDSHAKE:
+        msg["serial"] = int(data[SERVER_MESSAGE.HANDSHAKE.value["structure"]["serial"]], 16)
+        msg["ip"] = get_ip(data)
+        msg["port"] = int(data[SERVER_MESSAGE.HANDSHAKE.value["structure"]["port"]], 16)
+
+    if msg_type == SERVER_MESSAGE.SEND_SETTINGS:
+        for param, pos in msg_type.value["structure"].items():
+            value = int(data[pos], 16)
+            if param == "weekdays":
+                msg["schedule"] = "disabled" if value == 0 else "enabled"
+                msg[param] = convert_weekdays_to_dict(value)
+            else:
+                msg[param] = value
+
+    return msg
+
+
+def main(iterations: int) -> None:
+    """Run benchmark and print results per message type."""
+    # benchmark decoding, not log formatting
+    logging.disable(logging.CRITICAL)
+
+    print(f"{'message':<32}{'legacy us':>12}{'codec us':>12}{'decoder us':>12}{'speedup':>10}")
+    for msg_type, frame in FRAMES.items():
+        # legacy identification can't tell settings from model response, both have message id 32
+        legacy = legacy_read_message(frame.decode("ascii"), msg_type)
+        compiled = read_message(frame)
+        if legacy != {key: compiled[key] for key in legacy}:
+            raise SystemExit(f"{msg_type}: decoded values differ\n{legacy}\n{compiled}")
+
+        decoder = get_decoder(msg_type)
+        legacy_time = timeit.timeit(
+            lambda frame=frame: legacy_read_message(frame.decode("ascii"), msg_type), number=iterations
+        )
+        codec_time = timeit.timeit(lambda frame=frame: read_message(frame), number=iterations)
+        decoder_time = timeit.timeit(lambda frame=frame, decoder=decoder: decoder.decode(frame), number=iterations)
+
+        print(
+            f"{msg_type.name:<32}"
+            f"{legacy_time / iterations * 1e6:>12.2f}"
+            f"{codec_time / iterations * 1e6:>12.2f}"
+            f"{decoder_time / iterations * 1e6:>12.2f}"
+            f"{legacy_time / codec_time:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else ITERATIONS)
@@ -1,91 +1,941 @@
-import socket
+"""Asyncio simulator of Beny chargers for load testing without hardware.
+
+Hosts any number of virtual chargers in one event loop, each on its own UDP
+port. Virtual chargers have their own serial, pin, model (1P or 3P, with or
+without DLB) and state that evolves over time: charging current ramps up to
+the maximum current and tapers off as the car battery fills, energy is
+accumulated to total_kwh, solar and house power of DLB follow time of day.
+Start/stop, timer, schedule and maximum current commands are accepted and
+change the state like on a real charger.
+
+Responses are encoded with the same message layouts in const.py that the
+integration decodes them with, so the integration transport and coordinator
+can be run against a fleet of simulated chargers.
+
+A charger can also replay responses recorded by the integration transport to
+a frame log, in recorded order per request, or responses captured with
+pcap_to_json.py. Response table is compiled once and again when the file
+changes: exact request patterns are looked up from a dict and wildcard
+patterns are grouped by message id, so large tables are served at tens of
+thousands of requests per second.
+
+Bad networks are reproduced with seeded fault injection: lost requests and
+replies, latency with jitter, reordered and duplicated replies, corrupted
+checksums and truncated frames. Faults are configured for all chargers, per
+charger and per response message type.
+
+Run from repository root, Home Assistant is not needed:
+
+    python tools/charger_simulator.py --chargers 200 --base-port 40000 --kind mix --seed 1
+    python tools/charger_simulator.py --replay messages.json --base-port 3333
+    python tools/charger_simulator.py --recording config/beny_wifi/123456789.frames --base-port 3333
+    python tools/charger_simulator.py --chargers 10 --loss 0.05 --latency 0.02 --jitter 0.01
+    python tools/charger_simulator.py --chargers 10 --faults faults.json
+
+Fault file has a default profile, profiles per response message type and
+overrides per charger serial, fields not given default to no fault:
+
+    {
+        "seed": 1,
+        "default": {"loss": 0.02, "latency": 0.01, "jitter": 0.005},
+        "messages": {"SEND_DLB": {"corrupt": 0.1}},
+        "chargers": {"100000003": {"default": {"loss": 0.3, "distribution": "exponential"}}}
+    }
+"""
+import argparse
+import asyncio
+from binascii import unhexlify
+from dataclasses import dataclass, field, fields
+from enum import Enum
 import json
-import time
+import logging
+import math
 import os
-import binascii
+from pathlib import Path
+import random
 import re
-from copy import deepcopy
-
-from const import SERVER_MESSAGE
-from communication import build_message, calculate_checksum
-from conversions import get_hex
-import socket
-import struct
-
-CONFIG_FILE = "messages_beny_pedrov.json"
-#CONFIG_FILE = "messages_22032025.json"
-UDP_IP = "0.0.0.0"
-UDP_PORT = 3333
-
-def ip_to_hex(ip: str) -> str:
-    """Convert an IPv4 address string to a hex string."""
-    packed_ip = socket.inet_aton(ip)  
-    hex_str = packed_ip.hex()
-    return hex_str
-
-def check_message(received_message, pattern):
-    regex_pattern = pattern.replace('*', '.*')
-    
-    if re.match(regex_pattern, received_message):
-        return True
-    
-    return False
-
-def hex_to_str(hex_str):
-    try:
-        bytes_data = binascii.unhexlify(hex_str)
-        return bytes_data.decode('ascii', errors='ignore')
-    except (binascii.Error, UnicodeDecodeError):
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import headless  # noqa: E402, F401
+
+from custom_components.beny_wifi.codec import checksum_valid, identify  # noqa: E402
+from custom_components.beny_wifi.communication import read_message  # noqa: E402
+from custom_components.beny_wifi.const import (  # noqa: E402
+    CHARGER_COMMAND,
+    CHARGER_STATE,
+    EXPECTED_RESPONSES,
+    FIELD,
+    REQUEST_TYPE,
+    SERVER_MESSAGE,
+    TIMER_STATE,
+)
+from custom_components.beny_wifi.conversions import convert_pin_to_hex, convert_serial_to_hex  # noqa: E402
+from custom_components.beny_wifi.recorder import SENT, read_log  # noqa: E402
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def with_checksum(body: str) -> bytes:
+    """Append checksum to message body, return as bytes like sent to socket."""
+    return f"{body}{sum(unhexlify(body)) & 0xFF:02x}".encode("ascii")
+
+
+# Frames responses are built on, without checksum. Fields are written at the offsets
+# the integration decodes them from, bytes between fields are kept as captured.
+BASE_FRAMES = {
+    SERVER_MESSAGE.SEND_VALUES_1P: "55aa10001e700000000a00e6012c0123250601000800001600100a0000",
+    SERVER_MESSAGE.SEND_VALUES_3P: "55aa1000237000000000e600e800e6000000005e05000000000000000f0000000000",
+    SERVER_MESSAGE.SEND_DLB: "55aa7b00217b0000001e005a0032fff6000000" + "00" * 12,
+    SERVER_MESSAGE.SEND_SETTINGS: "55aa100020710201000155000f00197f0c22173b0000010100011406000002",
+    SERVER_MESSAGE.SEND_MODEL: "55aa400020040001" + "00" * 23,
+    SERVER_MESSAGE.HANDSHAKE: "55aa10001103" + "00" * 10,
+    SERVER_MESSAGE.ACCESS_DENIED: "55aa1000080000",
+}
+# model name follows the 8 byte header of model message
+MODEL_POS = slice(16, len(BASE_FRAMES[SERVER_MESSAGE.SEND_MODEL]))
+
+
+def _encode_field(value, pos: slice, conversion) -> str:
+    """Encode decoded value back to hex at field position."""
+    width = pos.stop - pos.start
+    if conversion is FIELD.IP:
+        return "".join(f"{int(octet):02x}" for octet in value.split("."))
+    if conversion is FIELD.MODEL:
+        return value.encode("ascii").hex().ljust(width, "0")[:width]
+    if isinstance(conversion, type) and issubclass(conversion, Enum):
+        raw = conversion[value].value if isinstance(value, str) else value.value
+    elif conversion is FIELD.DECI:
+        raw = round(value * 10)
+    elif conversion is FIELD.SIGNED_DECI:
+        raw = round(value * 10) & 0xFFFF
+    else:
+        raw = int(value)
+    # values not fitting the field are clipped like the charger would report them
+    return f"{min(max(raw, 0), 16 ** width - 1):0{width}x}"
+
+
+class FrameEncoder:
+    """Encodes values to server message, inverse of the integration decoder."""
+
+    def __init__(self, message: SERVER_MESSAGE) -> None:
+        """Precompute field positions and conversions of message."""
+        self.message = message
+        self.base = BASE_FRAMES[message]
+        conversions = message.value.get("conversions", {})
+        self._fields = {}
+        for param, pos in message.value["structure"].items():
+            conversion = conversions.get(param)
+            if conversion is FIELD.MODEL:
+                pos = MODEL_POS
+            elif pos.step:
+                pos = slice(pos.start, pos.stop)
+            self._fields[param] = (pos, conversion)
+
+    def encode(self, values: dict) -> bytes:
+        """Build frame with checksum from decoded values, missing fields keep base frame content."""
+        frame = list(self.base)
+        for param, value in values.items():
+            pos, conversion = self._fields[param]
+            frame[pos] = _encode_field(value, pos, conversion)
+        return with_checksum("".join(frame))
+
+
+ENCODERS = {message: FrameEncoder(message) for message in BASE_FRAMES}
+ACCESS_DENIED = ENCODERS[SERVER_MESSAGE.ACCESS_DENIED].encode({})
+
+# Client message header and parameter offsets, as laid out by CLIENT_MESSAGE templates
+MESSAGE_ID = slice(6, 10)
+PIN = slice(13, 18)
+COMMAND = slice(18, 20)  # command byte, request type of data requests
+POLL_SERIAL = slice(20, 28)
+CHARGER_COMMAND_POS = slice(20, 22)
+TIMER_SET = slice(20, 24)  # 0001 sets timer, 0000 resets it
+TIMER_END_SET = slice(31, 36)
+TIMER_START = (slice(36, 38), slice(38, 40))
+TIMER_END = (slice(42, 44), slice(44, 46))
+SCHEDULE_WEEKDAYS = slice(32, 34)
+SCHEDULE_START = (slice(34, 36), slice(36, 38))
+SCHEDULE_END = (slice(38, 40), slice(40, 42))
+MAX_CURRENT = slice(22, 24)
+MAX_SESSION_CONSUMPTION = slice(20, 22)
+
+# (message id, command byte) of client messages
+POLL_DEVICES = 0x0F
+REQUEST_DATA = 0x0B
+SEND_CHARGER_COMMAND = (0x0C, 0x06)
+SET_MAX_SESSION_CONSUMPTION = (0x0C, 0x74)
+SET_MAX_MONTHLY_CONSUMPTION = (0x0D, 0x78)
+SET_MAX_CURRENT = (0x0D, 0x6D)
+SET_TIMER = (0x1C, 0x69)
+SET_SCHEDULE = (0x16, 0x75)
+
+MIN_CURRENT = 6
+CURRENT_RAMP = 4.0  # A/s
+TAPER_SOC = 0.8  # battery state of charge where current starts to taper
+STARTING_DURATION = 3.0  # s
+
+
+def _time_of_day(frame: bytes, pos: tuple[slice, slice]) -> int:
+    """Read hour and minute parameters as minutes of day."""
+    return int(frame[pos[0]], 16) * 60 + int(frame[pos[1]], 16)
+
+
+class VirtualCharger:
+    """Simulated charger with evolving state.
+
+    Time advances by the monotonic clock multiplied by speed, so a day of
+    charging can be simulated in minutes.
+    """
+
+    def __init__(
+        self,
+        serial: int,
+        pin: int,
+        phases: int = 1,
+        dlb: bool = False,
+        seed: int | None = None,
+        speed: float = 1.0,
+        clock=time.monotonic,
+    ) -> None:
+        """Initialize charger plugged to a car waiting in standby."""
+        self.serial = serial
+        self.pin = pin
+        self.phases = phases
+        self.dlb = dlb
+        self.model = "BCP-AT3N-L" if phases == 3 else "BCP-AT1N-L"
+        self.speed = speed
+        self.ip_address = "127.0.0.1"
+        self.port = 3333
+        self._rng = random.Random(seed)
+        self._clock = clock
+        self._last = clock()
+        self._elapsed = 0.0
+        self._pin_hex = convert_pin_to_hex(pin).encode("ascii")
+        self._serial_hex = convert_serial_to_hex(serial).encode("ascii")
+
+        lt = time.localtime()
+        self.time_of_day = float(lt.tm_hour * 3600 + lt.tm_min * 60 + lt.tm_sec)
+        self.plugged = True
+        self.state = CHARGER_STATE.STANDBY
+        self._starting_until = 0.0
+        self.current = 0.0
+        self.max_current = 16
+        self.voltages = [230.0] * phases
+        self.temperature = 25.0
+        self.total_kwh = self._rng.uniform(100, 5000)
+        self.session_kwh = 0.0
+        self.maximum_session_consumption = 0  # kWh, 0 is unlimited
+        self.battery_kwh = self._rng.choice((40, 60, 77, 100))
+        self.soc = self._rng.uniform(0.1, 0.6)
+
+        self.timer_state = TIMER_STATE.UNSET
+        self.timer_start = 0  # minutes of day
+        self.timer_end = 0
+        self.weekdays = 0
+        self.schedule_start = 0
+        self.schedule_end = 0
+
+        self.solar_peak = self._rng.uniform(3, 12) if dlb else 0.0
+        self.house_base = self._rng.uniform(0.2, 0.8)
+
+        self._handlers = {
+            SEND_CHARGER_COMMAND: self._charger_command,
+            SET_MAX_SESSION_CONSUMPTION: self._set_max_session_consumption,
+            SET_MAX_MONTHLY_CONSUMPTION: self._values_response,
+            SET_MAX_CURRENT: self._set_max_current,
+            SET_TIMER: self._set_timer,
+            SET_SCHEDULE: self._set_schedule,
+        }
+
+    @property
+    def power(self) -> float:
+        """Charging power in kW."""
+        return sum(self.voltages) * self.current / 1000
+
+    @property
+    def solar_power(self) -> float:
+        """Solar power in kW, follows the sun between 6 and 18."""
+        hours = self.time_of_day / 3600
+        return self.solar_peak * max(0.0, math.sin(math.pi * (hours - 6) / 12))
+
+    def plug(self) -> None:
+        """Plug car to charger."""
+        self.plugged = True
+        self.soc = self._rng.uniform(0.1, 0.6)
+        self.state = CHARGER_STATE.WAITING if self.timer_state is not TIMER_STATE.UNSET else CHARGER_STATE.STANDBY
+
+    def unplug(self) -> None:
+        """Unplug car from charger."""
+        self.plugged = False
+        self.current = 0.0
+        self.session_kwh = 0.0
+        self.state = CHARGER_STATE.UNPLUGGED
+
+    def start(self) -> None:
+        """Start charging if car is plugged."""
+        if self.plugged and self.state not in (CHARGER_STATE.STARTING, CHARGER_STATE.CHARGING):
+            self.state = CHARGER_STATE.STARTING
+            self._starting_until = self._elapsed + STARTING_DURATION
+
+    def stop(self) -> None:
+        """Stop charging."""
+        if self.plugged:
+            self.current = 0.0
+            self.state = CHARGER_STATE.STANDBY
+
+    def advance(self, dt: float | None = None) -> None:
+        """Advance simulation by dt seconds, by elapsed clock time if not given."""
+        if dt is None:
+            now = self._clock()
+            dt = (now - self._last) * self.speed
+            self._last = now
+        if dt <= 0:
+            return
+
+        previous_minute = int(self.time_of_day // 60)
+        self._elapsed += dt
+        self.time_of_day = (self.time_of_day + dt) % 86400
+        minute = int(self.time_of_day // 60)
+        self._run_timer(previous_minute, minute)
+
+        if self.state is CHARGER_STATE.STARTING and self._elapsed >= self._starting_until:
+            self.state = CHARGER_STATE.CHARGING
+
+        target = 0.0
+        if self.state is CHARGER_STATE.CHARGING:
+            target = float(self.max_current)
+            if self.soc > TAPER_SOC:
+                target *= (1 - self.soc) / (1 - TAPER_SOC)
+        step = CURRENT_RAMP * dt
+        self.current = min(self.current + step, target) if self.current < target else max(self.current - step, target)
+
+        energy = self.power * dt / 3600
+        self.total_kwh += energy
+        self.session_kwh += energy
+        self.soc = min(1.0, self.soc + energy / self.battery_kwh)
+
+        if self.state is CHARGER_STATE.CHARGING and (
+            self.soc >= 1.0
+            or (self.maximum_session_consumption and self.session_kwh >= self.maximum_session_consumption)
+        ):
+            self.stop()
+
+        self.voltages = [min(max(voltage + self._rng.gauss(0, 0.5), 215.0), 245.0) for voltage in self.voltages]
+        # charger warms up with power, time constant of ten minutes
+        target_temperature = 25 + 2 * self.power
+        self.temperature += (target_temperature - self.temperature) * min(1.0, dt / 600)
+
+    def _run_timer(self, previous_minute: int, minute: int) -> None:
+        def passed(at: int) -> bool:
+            # minute of day was reached since last advance, over midnight too
+            return 0 < (at - previous_minute) % 1440 <= (minute - previous_minute) % 1440
+
+        if self.timer_state in (TIMER_STATE.START_TIME, TIMER_STATE.START_END_TIME) and passed(self.timer_start):
+            self.start()
+            if self.timer_state is TIMER_STATE.START_TIME:
+                self.timer_state = TIMER_STATE.UNSET
+        if self.timer_state in (TIMER_STATE.END_TIME, TIMER_STATE.START_END_TIME) and passed(self.timer_end):
+            self.stop()
+            self.timer_state = TIMER_STATE.UNSET
+
+    def handle(self, frame: bytes) -> bytes | None:
+        """Handle request frame, return response frame or None if request is ignored."""
+        if not checksum_valid(frame):
+            return None
+        try:
+            message_id = int(frame[MESSAGE_ID], 16)
+            command = int(frame[COMMAND], 16)
+        except ValueError:
+            return None
+
+        if message_id == POLL_DEVICES:
+            return self._handshake() if frame[POLL_SERIAL].lower() == self._serial_hex else None
+        if frame[PIN].lower() != self._pin_hex:
+            return ACCESS_DENIED
+
+        self.advance()
+        if message_id == REQUEST_DATA:
+            return self._data_response(command)
+        handler = self._handlers.get((message_id, command))
+        return handler(frame) if handler else None
+
+    def _data_response(self, request_type: int) -> bytes | None:
+        if request_type == REQUEST_TYPE.VALUES.value:
+            return self._values_response()
+        if request_type == REQUEST_TYPE.DLB.value:
+            return self._dlb_response() if self.dlb else None
+        if request_type == REQUEST_TYPE.SETTINGS.value:
+            return self._settings_response()
+        if request_type == REQUEST_TYPE.MODEL.value:
+            return ENCODERS[SERVER_MESSAGE.SEND_MODEL].encode({"model": self.model})
         return None
 
-def load_config():
-    try:
-        with open(CONFIG_FILE, "r") as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"Error loading config: {e}")
-        return {}
+    def _values_response(self, frame: bytes | None = None) -> bytes:
+        values = {
+            "power": round(self.power * 10),
+            "total_kwh": self.total_kwh,
+            "temperature": round(self.temperature) + 100,
+            "state": self.state,
+            "timer_state": self.timer_state,
+            "timer_start_h": self.timer_start // 60,
+            "timer_start_min": self.timer_start % 60,
+            "timer_end_h": self.timer_end // 60,
+            "timer_end_min": self.timer_end % 60,
+            "max_current": self.max_current,
+            "maximum_session_consumption": self.maximum_session_consumption,
+        }
+        for phase, voltage in enumerate(self.voltages, 1):
+            values[f"voltage{phase}"] = round(voltage)
+            values[f"current{phase}"] = round(self.current)
+        message = SERVER_MESSAGE.SEND_VALUES_3P if self.phases == 3 else SERVER_MESSAGE.SEND_VALUES_1P
+        return ENCODERS[message].encode(values)
+
+    def _dlb_response(self) -> bytes:
+        solar = self.solar_power
+        house = self.house_base + abs(self._rng.gauss(0, 0.2))
+        # coordinator scales decoded DLB values by ten once more
+        return ENCODERS[SERVER_MESSAGE.SEND_DLB].encode({
+            "solar_power": solar * 10,
+            "ev_power": self.power * 10,
+            "house_power": house * 10,
+            "grid_power": (house + self.power - solar) * 10,
+        })
+
+    def _settings_response(self, frame: bytes | None = None) -> bytes:
+        return ENCODERS[SERVER_MESSAGE.SEND_SETTINGS].encode({
+            "weekdays": self.weekdays,
+            "timer_start_h": self.schedule_start // 60,
+            "timer_start_min": self.schedule_start % 60,
+            "timer_end_h": self.schedule_end // 60,
+            "timer_end_min": self.schedule_end % 60,
+        })
+
+    def _handshake(self) -> bytes:
+        return ENCODERS[SERVER_MESSAGE.HANDSHAKE].encode(
+            {"serial": self.serial, "ip": self.ip_address, "port": self.port}
+        )
+
+    def _charger_command(self, frame: bytes) -> bytes:
+        if int(frame[CHARGER_COMMAND_POS], 16) == CHARGER_COMMAND.START.value:
+            self.start()
+        else:
+            self.stop()
+        return self._values_response()
+
+    def _set_max_current(self, frame: bytes) -> bytes:
+        self.max_current = min(max(int(frame[MAX_CURRENT], 16), MIN_CURRENT), 32)
+        return self._values_response()
+
+    def _set_max_session_consumption(self, frame: bytes) -> bytes:
+        self.maximum_session_consumption = int(frame[MAX_SESSION_CONSUMPTION], 16)
+        return self._values_response()
+
+    def _set_timer(self, frame: bytes) -> bytes:
+        if int(frame[TIMER_SET], 16) == 0:
+            self.timer_state = TIMER_STATE.UNSET
+            if self.state is CHARGER_STATE.WAITING:
+                self.state = CHARGER_STATE.STANDBY
+            return self._values_response()
+
+        self.timer_start = _time_of_day(frame, TIMER_START)
+        if int(frame[TIMER_END_SET], 16):
+            self.timer_end = _time_of_day(frame, TIMER_END)
+            self.timer_state = TIMER_STATE.START_END_TIME
+        else:
+            self.timer_state = TIMER_STATE.START_TIME
+        if self.plugged and self.state is CHARGER_STATE.STANDBY:
+            self.state = CHARGER_STATE.WAITING
+        return self._values_response()
+
+    def _set_schedule(self, frame: bytes) -> bytes:
+        self.weekdays = int(frame[SCHEDULE_WEEKDAYS], 16)
+        self.schedule_start = _time_of_day(frame, SCHEDULE_START)
+        self.schedule_end = _time_of_day(frame, SCHEDULE_END)
+        return self._settings_response()
+
+
+# header, message type and message id, wildcard patterns are grouped by it
+PATTERN_PREFIX = 10
+
+
+class ResponseTable:
+    """Request patterns compiled to indexed lookups.
+
+    Pattern without * matches request exactly, also when pattern was captured
+    without checksum. Exact patterns are looked up from dict and take precedence
+    over wildcard patterns. Wildcard patterns match from start of request, in
+    table order, and are grouped by their fixed header and message id prefix,
+    so only patterns of the same message are tried. Responses are rendered with
+    checksums when table is built.
+    """
+
+    def __init__(self, table: dict[str, str | dict]) -> None:
+        """Compile patterns and render responses."""
+        self.exact: dict[bytes, bytes] = {}
+        groups: dict[bytes, list[tuple[int, re.Pattern, bytes]]] = {}
+        fallback: list[tuple[int, re.Pattern, bytes]] = []
+
+        for position, (pattern, response) in enumerate(table.items()):
+            pattern = pattern.lower().encode("ascii")
+            rendered = self._render(response)
+            if b"*" not in pattern:
+                self.exact.setdefault(pattern, rendered)
+                continue
+            compiled = re.compile(b".*".join(re.escape(part) for part in pattern.split(b"*")))
+            if pattern.index(b"*") >= PATTERN_PREFIX:
+                groups.setdefault(pattern[:PATTERN_PREFIX], []).append((position, compiled, rendered))
+            else:
+                fallback.append((position, compiled, rendered))
+
+        # patterns with wildcard in prefix are tried for every message, in table order
+        self.groups = {
+            prefix: tuple((compiled, rendered) for _, compiled, rendered in sorted(group + fallback, key=lambda entry: entry[0]))
+            for prefix, group in groups.items()
+        }
+        self.fallback = tuple((compiled, rendered) for _, compiled, rendered in fallback)
 
-responses = load_config()
-last_modified = None
+    def __len__(self) -> int:
+        """Return number of patterns."""
+        return len(self.exact) + sum(map(len, self.groups.values())) + len(self.fallback)
 
-sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-sock.bind((UDP_IP, UDP_PORT))
+    @staticmethod
+    def _render(response: str | dict) -> bytes:
+        if isinstance(response, dict):
+            return ENCODERS[SERVER_MESSAGE[response["type"]]].encode(response["params"])
+        frame = response.encode("ascii")
+        return frame if checksum_valid(frame) else with_checksum(response)
+
+    def lookup(self, request: bytes) -> bytes | None:
+        """Return response to request, None if no pattern matches."""
+        request = request.lower()
+        response = self.exact.get(request) or self.exact.get(request[:-2])
+        if response is not None:
+            return response
+        for compiled, rendered in self.groups.get(request[:PATTERN_PREFIX], self.fallback):
+            if compiled.match(request):
+                return rendered
+        return None
+
+
+class ReplayCharger:
+    """Charger answering with responses captured from a real charger.
+
+    Response table maps request patterns, * matching anything, to responses. Response
+    is a frame as ascii hex, checksum is appended if missing, or a message with decoded
+    values {"type": SERVER_MESSAGE name, "params": {...}}. Table is compiled once and
+    again when the file changes.
+    """
+
+    RELOAD_CHECK_INTERVAL = 1.0
+
+    def __init__(self, path: str) -> None:
+        """Load response table."""
+        self.path = path
+        self._mtime = None
+        self._next_check = 0.0
+        self.table = ResponseTable({})
+        self._reload()
+
+    def _reload(self) -> None:
+        self._next_check = time.monotonic() + self.RELOAD_CHECK_INTERVAL
+        try:
+            mtime = os.path.getmtime(self.path)
+            if mtime == self._mtime:
+                return
+            with open(self.path, encoding="utf-8") as file:
+                self.table = ResponseTable(json.load(file)["responses"])
+        except (OSError, ValueError, KeyError) as err:
+            _LOGGER.error("Error loading response table %s: %s", self.path, err)
+            return
+
+        self._mtime = mtime
+        _LOGGER.info("Loaded %s responses from %s", len(self.table), self.path)
+
+    def handle(self, frame: bytes) -> bytes | None:
+        """Return response to request frame."""
+        if time.monotonic() >= self._next_check:
+            self._reload()
+        return self.table.lookup(frame)
+
+
+def expected_responses(request: bytes) -> frozenset[SERVER_MESSAGE] | None:
+    """Return messages answering data request, None for other requests."""
+    message = read_message(request)
+    request_type = message.get("request_type") if message else None
+    if request_type not in REQUEST_TYPE.__members__:
+        return None
+    return frozenset(EXPECTED_RESPONSES[REQUEST_TYPE[request_type]])
+
+
+class RecordedCharger:
+    """Charger answering with responses recorded by the integration transport.
+
+    Recorded responses are paired with the requests they answered by message
+    type and replayed in recorded order per request, so an incident like a
+    charger flapping between states plays back deterministically. After the
+    last recorded response of a request, its responses start over.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Pair requests and responses of frame log."""
+        self.path = path
+        self._responses: dict[bytes, list[bytes]] = {}
+        self._positions: dict[bytes, int] = {}
+
+        # unanswered requests in order sent, retransmissions are not repeated
+        pending: dict[bytes, frozenset[SERVER_MESSAGE] | None] = {}
+        for record in read_log(path):
+            if record.direction == SENT:
+                if record.frame not in pending:
+                    pending[record.frame] = expected_responses(record.frame)
+                continue
+            decoder = identify(record.frame)
+            message = decoder.message if decoder else None
+            for request, expect in pending.items():
+                if expect is None or message in expect:
+                    del pending[request]
+                    self._responses.setdefault(request, []).append(record.frame)
+                    break
+
+        _LOGGER.info(
+            "Loaded %s responses to %s requests from %s",
+            sum(map(len, self._responses.values())), len(self._responses), path,
+        )
+
+    def handle(self, frame: bytes) -> bytes | None:
+        """Return next recorded response to request frame."""
+        responses = self._responses.get(frame)
+        if not responses:
+            return None
+        position = self._positions.get(frame, 0)
+        self._positions[frame] = (position + 1) % len(responses)
+        return responses[position]
+
+
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "normal", "exponential")
+
+
+@dataclass(frozen=True, slots=True)
+class FaultProfile:
+    """Network faults of replies, probabilities are per datagram.
+
+    Latency is the mean delay of reply in seconds. Jitter is half width of uniform
+    distribution and standard deviation of normal distribution, exponential
+    distribution has the long tail of a congested Wi-Fi.
+    """
+
+    request_loss: float = 0.0
+    loss: float = 0.0
+    latency: float = 0.0
+    jitter: float = 0.0
+    distribution: str = "normal"
+    reorder: float = 0.0
+    reorder_delay: float = 0.2
+    duplicate: float = 0.0
+    corrupt: float = 0.0
+    truncate: float = 0.0
+
+    def __post_init__(self) -> None:
+        """Validate distribution."""
+        if self.distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {self.distribution}")
+
+    @classmethod
+    def from_dict(cls, data: dict, base: "FaultProfile | None" = None) -> "FaultProfile":
+        """Build profile from dict, missing fields are taken from base profile."""
+        known = {profile_field.name for profile_field in fields(cls)}
+        unknown = data.keys() - known
+        if unknown:
+            raise ValueError(f"Unknown fault fields: {', '.join(sorted(unknown))}")
+        values = {name: getattr(base, name) for name in known} if base else {}
+        return cls(**{**values, **data})
+
+
+NO_FAULTS = FaultProfile()
+
+
+@dataclass(slots=True)
+class FaultConfig:
+    """Fault profiles of single charger, by response message type."""
+
+    default: FaultProfile = NO_FAULTS
+    messages: dict[SERVER_MESSAGE, FaultProfile] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: dict, base: "FaultConfig | None" = None) -> "FaultConfig":
+        """Build config from dict, charger overrides are applied on top of base config."""
+        base = base or cls()
+        default = FaultProfile.from_dict(data.get("default", {}), base.default)
+        messages = dict(base.messages)
+        for name, profile in data.get("messages", {}).items():
+            message = SERVER_MESSAGE[name]
+            messages[message] = FaultProfile.from_dict(profile, messages.get(message, default))
+        return cls(default, messages)
+
+
+@dataclass(slots=True)
+class FleetFaults:
+    """Fault configuration of all chargers."""
+
+    default: FaultConfig = field(default_factory=FaultConfig)
+    chargers: dict[str, FaultConfig] = field(default_factory=dict)
+    seed: int = 0
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FleetFaults":
+        """Build fleet faults from fault file content."""
+        default = FaultConfig.from_dict(data)
+        chargers = {
+            str(serial): FaultConfig.from_dict(config, default) for serial, config in data.get("chargers", {}).items()
+        }
+        return cls(default, chargers, data.get("seed", 0))
+
+    def for_charger(self, key: str) -> FaultConfig:
+        """Fault config of charger by serial."""
+        return self.chargers.get(key, self.default)
 
-print(f"Listening for UDP packets on port {UDP_PORT}...")
 
-while True:
+class FaultInjector:
+    """Applies faults of charger to its replies, with own random generator."""
+
+    def __init__(self, config: FaultConfig, seed: int) -> None:
+        """Initialize injector, same seed injects same faults."""
+        self.config = config
+        self._rng = random.Random(seed)
+        self._by_message = bool(config.messages)
+
+    def drop_request(self) -> bool:
+        """Return True if request is lost before reaching charger."""
+        loss = self.config.default.request_loss
+        return loss > 0 and self._rng.random() < loss
+
+    def _delay(self, profile: FaultProfile) -> float:
+        rng = self._rng
+        if profile.distribution == "constant" or not profile.jitter:
+            delay = profile.latency
+        elif profile.distribution == "uniform":
+            delay = profile.latency + rng.uniform(-profile.jitter, profile.jitter)
+        elif profile.distribution == "normal":
+            delay = rng.gauss(profile.latency, profile.jitter)
+        else:
+            delay = profile.latency + rng.expovariate(1 / profile.jitter)
+        return max(delay, 0.0)
+
+    def apply(self, response: bytes) -> list[tuple[float, bytes]]:
+        """Return replies to send as (delay, frame), none if reply is lost."""
+        profile = self.config.default
+        if self._by_message:
+            decoder = identify(response)
+            profile = self.config.messages.get(decoder.message if decoder else None, profile)
+        if profile == NO_FAULTS:
+            return [(0.0, response)]
+
+        rng = self._rng
+        if profile.loss and rng.random() < profile.loss:
+            return []
+        if profile.corrupt and rng.random() < profile.corrupt:
+            checksum = (int(response[-2:], 16) + rng.randrange(1, 256)) & 0xFF
+            response = response[:-2] + f"{checksum:02x}".encode("ascii")
+        if profile.truncate and rng.random() < profile.truncate:
+            response = response[:rng.randrange(len(response))]
+
+        delay = self._delay(profile)
+        if profile.reorder and rng.random() < profile.reorder:
+            # held back, so replies to later requests overtake it
+            delay += profile.reorder_delay
+        replies = [(delay, response)]
+        if profile.duplicate and rng.random() < profile.duplicate:
+            replies.append((delay + self._delay(profile), response))
+        return replies
+
+
+class ChargerProtocol(asyncio.DatagramProtocol):
+    """Datagram endpoint of single simulated charger."""
+
+    def __init__(
+        self, charger: VirtualCharger | ReplayCharger | RecordedCharger, faults: FaultInjector | None = None
+    ) -> None:
+        """Initialize endpoint."""
+        self.charger = charger
+        self.faults = faults
+        self.transport = None
+        self.requests = 0
+        self._loop = asyncio.get_running_loop()
+
+    def connection_made(self, transport) -> None:
+        """Keep transport for responses."""
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        """Answer request."""
+        self.requests += 1
+        if self.faults is not None and self.faults.drop_request():
+            return
+        response = self.charger.handle(data.strip())
+        if response is None:
+            return
+        if self.faults is None:
+            self.transport.sendto(response, addr)
+            return
+        for delay, frame in self.faults.apply(response):
+            if delay:
+                self._loop.call_later(delay, self._send, frame, addr)
+            else:
+                self.transport.sendto(frame, addr)
+
+    def _send(self, frame: bytes, addr) -> None:
+        if not self.transport.is_closing():
+            self.transport.sendto(frame, addr)
+
+
+class ChargerSimulator:
+    """Fleet of simulated chargers, each listening on own UDP port."""
+
+    def __init__(
+        self, chargers: list, host: str = "127.0.0.1", base_port: int = 0, faults: FleetFaults | None = None
+    ) -> None:
+        """Initialize simulator, base port 0 binds chargers to free ports."""
+        self.chargers = chargers
+        self.host = host
+        self.base_port = base_port
+        self.faults = faults
+        self.endpoints: list[tuple[asyncio.DatagramTransport, ChargerProtocol]] = []
+
+    @property
+    def ports(self) -> list[int]:
+        """Ports chargers listen on, in charger order."""
+        return [transport.get_extra_info("sockname")[1] for transport, _ in self.endpoints]
+
+    @property
+    def requests(self) -> int:
+        """Requests received by all chargers."""
+        return sum(protocol.requests for _, protocol in self.endpoints)
+
+    async def start(self) -> None:
+        """Open endpoints of all chargers."""
+        loop = asyncio.get_running_loop()
+        for index, charger in enumerate(self.chargers):
+            port = self.base_port + index if self.base_port else 0
+            injector = None
+            if self.faults is not None:
+                key = str(getattr(charger, "serial", index))
+                injector = FaultInjector(self.faults.for_charger(key), self.faults.seed + index)
+            endpoint = await loop.create_datagram_endpoint(
+                lambda charger=charger, injector=injector: ChargerProtocol(charger, injector),
+                local_addr=(self.host, port),
+            )
+            self.endpoints.append(endpoint)
+            if isinstance(charger, VirtualCharger):
+                charger.ip_address, charger.port = self.host, endpoint[0].get_extra_info("sockname")[1]
+
+    def close(self) -> None:
+        """Close endpoints of all chargers."""
+        for transport, _ in self.endpoints:
+            transport.close()
+        self.endpoints.clear()
+
+    async def __aenter__(self) -> "ChargerSimulator":
+        """Start simulator."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        """Close simulator."""
+        self.close()
+
+
+def create_fleet(
+    count: int, kind: str = "mix", dlb_ratio: float = 0.5, seed: int = 0, speed: float = 1.0
+) -> list[VirtualCharger]:
+    """Create virtual chargers with unique serials and pins.
+
+    Args:
+        count (int): number of chargers
+        kind (str): "1P", "3P" or "mix" of both
+        dlb_ratio (float): share of chargers with DLB
+        seed (int): seed of fleet, same seed creates same fleet and state evolution
+        speed (float): simulated seconds per real second
+
+    Returns:
+        list[VirtualCharger]: chargers
+
+    """
+    rng = random.Random(seed)
+    fleet = []
+    for index in range(count):
+        phases = {"1P": 1, "3P": 3}.get(kind) or rng.choice((1, 3))
+        fleet.append(VirtualCharger(
+            serial=100000000 + index,
+            pin=rng.randrange(100000, 1000000),
+            phases=phases,
+            dlb=rng.random() < dlb_ratio,
+            seed=rng.randrange(2**32),
+            speed=speed,
+        ))
+    return fleet
+
+
+# command line fault options applied to all chargers
+FAULT_ARGUMENTS = ("request_loss", "loss", "latency", "jitter", "reorder", "duplicate", "corrupt", "truncate")
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Run simulator until cancelled."""
+    if args.replay:
+        chargers = [ReplayCharger(args.replay)]
+    elif args.recording:
+        chargers = [RecordedCharger(args.recording)]
+    else:
+        chargers = create_fleet(args.chargers, args.kind, args.dlb_ratio, args.seed, args.speed)
+
+    faults = None
+    if args.faults:
+        with open(args.faults, encoding="utf-8") as file:
+            faults = FleetFaults.from_dict(json.load(file))
+    elif any(getattr(args, name) for name in FAULT_ARGUMENTS):
+        profile = FaultProfile.from_dict({name: getattr(args, name) for name in FAULT_ARGUMENTS})
+        faults = FleetFaults(FaultConfig(profile), seed=args.seed)
+
+    async with ChargerSimulator(chargers, args.host, args.base_port, faults) as simulator:
+        print("serial,pin,model,dlb,port")
+        for charger, port in zip(chargers, simulator.ports, strict=True):
+            if isinstance(charger, VirtualCharger):
+                print(f"{charger.serial},{charger.pin},{charger.model},{charger.dlb},{port}")
+            else:
+                print(f"replay,,,,{port}")
+        sys.stdout.flush()
+
+        while True:
+            await asyncio.sleep(60)
+            _LOGGER.info("Requests received: %s", simulator.requests)
+
+
+def main() -> None:
+    """Parse arguments and run simulator."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chargers", type=int, default=1, help="number of virtual chargers")
+    parser.add_argument("--kind", choices=("1P", "3P", "mix"), default="mix", help="charger models")
+    parser.add_argument("--dlb-ratio", type=float, default=0.5, help="share of chargers with DLB")
+    parser.add_argument("--seed", type=int, default=0, help="seed of fleet and state evolution")
+    parser.add_argument("--speed", type=float, default=1.0, help="simulated seconds per real second")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--base-port", type=int, default=0, help="port of first charger, 0 for free ports")
+    parser.add_argument("--replay", help="response table from pcap_to_json.py to replay")
+    parser.add_argument("--recording", help="frame log recorded by the integration to replay")
+    parser.add_argument("--faults", help="fault file with profiles per charger and message type")
+    for name in FAULT_ARGUMENTS:
+        parser.add_argument(f"--{name.replace('_', '-')}", type=float, default=0.0, help=f"fault {name} of all chargers")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
     try:
-        modified_time = time.ctime(os.path.getmtime(CONFIG_FILE))
-        if modified_time != last_modified:
-            conf = load_config()
-            last_modified = modified_time
-            print("Config reloaded.")
-    except Exception as e:
-        print(f"Error checking config file: {e}")
-
-    data, addr = sock.recvfrom(1024)
-    data = str(data.decode('ascii')).strip()
-    print(f"Received from {addr}: {data}")
-
-    response = deepcopy(conf['responses'])
-    for request, response in response.items():
-        if check_message(data, request):
-            if type(response) == str:
-                response += f"{calculate_checksum(response):02x}"
-                sock.sendto(response.encode('ascii'), addr)
-            elif type(response) == dict:
-                mtype = SERVER_MESSAGE[response['type']]
-                for key, value in response['params'].items():
-                    if key == "ip":
-                        response['params'][key] = ip_to_hex(value)
-                    elif key == "model":
-                        response['params'][key] = value.encode().hex()
-                        while len(response['params'][key]) < 41:
-                            response['params'][key] += '0'
-                        response['params'][key] += '11001'
-                    else:
-                        response['params'][key] = get_hex(value)
-                response = build_message(mtype, params=response['params'])
-                sock.sendto(response.encode('ascii'), addr)
-            print(f"Sent to {addr}: {response}")
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+"""Poll and command a fleet of chargers without Home Assistant.
+
+Chargers are polled from one event loop with ChargerClient of the integration,
+so frames, retries, response checks, snapshot conversion and validation are
+the same as in production. Every charger polls on its own tick, with start
+offsets spread over the interval, and at most --concurrency polls are in
+flight at once. Snapshots are written as JSON lines or CSV to stdout or a
+file. Summary of polls, failures and round trip times of the whole fleet is
+logged at exit, so the transport can be benchmarked without the scheduler of
+Home Assistant, e.g. against the charger simulator.
+
+Chargers are read from csv file with columns ip_address and pin, and optional
+port, serial and dlb (1 if charger has DLB), or given with --charger:
+
+    ip_address,port,pin,serial,dlb
+    192.168.1.20,3333,123456,123456789,1
+
+Run from repository root, Home Assistant is not needed:
+
+    python tools/fleet_poller.py --chargers chargers.csv poll --interval 10 --format csv -o fleet.csv
+    python tools/fleet_poller.py --charger 192.168.1.20:3333=123456 poll --count 1 --requests settings,model
+    python tools/fleet_poller.py --chargers chargers.csv command stop
+    python tools/fleet_poller.py --chargers chargers.csv command set-timer 22:00 06:00
+"""
+import argparse
+import asyncio
+from contextlib import nullcontext
+import csv
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+import json
+import logging
+from pathlib import Path
+import sys
+import time
+from typing import Any, TextIO
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import headless  # noqa: E402, F401
+
+from custom_components.beny_wifi.client import ChargerClient, ChargerError  # noqa: E402
+from custom_components.beny_wifi.const import CHARGER_COMMAND, DEFAULT_PORT, REQUEST_TYPE  # noqa: E402
+from custom_components.beny_wifi.conversions import convert_pin_to_hex  # noqa: E402
+from custom_components.beny_wifi.link_quality import RttHistogram  # noqa: E402
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 64
+
+# snapshot values written to csv, json lines have all values
+CSV_COLUMNS = (
+    "timestamp", "ip_address", "serial", "error",
+    "charger_state", "power", "total_kwh",
+    "current1", "current2", "current3", "voltage1", "voltage2", "voltage3",
+    "temperature", "max_current", "maximum_session_consumption",
+    "timer_state", "timer_start", "timer_end",
+    "grid_power", "house_power", "ev_power", "solar_power",
+    "schedule", "schedule_start", "schedule_end", "model",
+    "rtt_p50", "rtt_p95", "packet_loss", "poll_retries",
+)
+
+
+@dataclass
+class Charger:
+    """Charger of fleet."""
+
+    ip_address: str
+    pin: int
+    port: int = DEFAULT_PORT
+    serial: str = ""
+    dlb: bool = False
+
+    @classmethod
+    def parse(cls, value: str) -> "Charger":
+        """Parse charger given as IP[:PORT]=PIN."""
+        address, _, pin = value.partition("=")
+        ip_address, _, port = address.partition(":")
+        if not pin:
+            raise argparse.ArgumentTypeError(f"charger must be given as IP[:PORT]=PIN: {value}")
+        return cls(ip_address, int(pin), int(port or DEFAULT_PORT))
+
+
+def read_chargers(path: str) -> list[Charger]:
+    """Read chargers from csv file with header."""
+    with open(path, newline="", encoding="utf-8") as file:
+        return [
+            Charger(
+                row["ip_address"],
+                int(row["pin"]),
+                int(row.get("port") or DEFAULT_PORT),
+                row.get("serial") or "",
+                (row.get("dlb") or "0").strip().lower() in ("1", "true", "yes"),
+            )
+            for row in csv.DictReader(file)
+        ]
+
+
+def _json_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+class SnapshotWriter:
+    """Writes snapshots as JSON lines or CSV."""
+
+    def __init__(self, output: TextIO, output_format: str) -> None:
+        """Initialize writer, csv header is written right away."""
+        self._output = output
+        self._csv = None
+        if output_format == "csv":
+            self._csv = csv.DictWriter(output, CSV_COLUMNS, extrasaction="ignore")
+            self._csv.writeheader()
+
+    def write(self, row: dict[str, Any]) -> None:
+        """Write snapshot row."""
+        if self._csv is not None:
+            self._csv.writerow({
+                key: value.isoformat() if isinstance(value, datetime) else value for key, value in row.items()
+            })
+        else:
+            self._output.write(json.dumps(row, default=_json_value) + "\n")
+        self._output.flush()
+
+
+@dataclass
+class FleetStats:
+    """Polls of fleet."""
+
+    polls: int = 0
+    failures: int = 0
+    poll_time: float = 0.0
+    max_poll_time: float = 0.0
+    errors: dict[str, int] = field(default_factory=dict)
+
+    def add(self, elapsed: float, error: str | None) -> None:
+        """Count finished poll."""
+        self.polls += 1
+        self.poll_time += elapsed
+        self.max_poll_time = max(self.max_poll_time, elapsed)
+        if error is not None:
+            self.failures += 1
+            self.errors[error] = self.errors.get(error, 0) + 1
+
+
+def fleet_rtt(clients: list[ChargerClient]) -> RttHistogram:
+    """Merge round trip time histograms of chargers."""
+    histogram = RttHistogram()
+    for client in clients:
+        counts = client.transport.quality.rtt.counts
+        histogram.counts = [total + count for total, count in zip(histogram.counts, counts, strict=True)]
+    histogram.total = sum(histogram.counts)
+    return histogram
+
+
+def request_types(charger: Charger, extra: list[REQUEST_TYPE]) -> tuple[REQUEST_TYPE, ...]:
+    """Request types polled from charger, DLB only from chargers that have it, like the coordinator."""
+    polled = [REQUEST_TYPE.VALUES, *([REQUEST_TYPE.DLB] if charger.dlb else [])]
+    return tuple(polled + [request_type for request_type in extra if request_type not in polled])
+
+
+async def poll_charger(
+    charger: Charger,
+    client: ChargerClient,
+    polled: tuple[REQUEST_TYPE, ...],
+    interval: float,
+    count: int | None,
+    offset: float,
+    semaphore: asyncio.Semaphore,
+    writer: SnapshotWriter,
+    stats: FleetStats,
+) -> None:
+    """Poll charger on its tick until count polls are done."""
+    loop = asyncio.get_running_loop()
+    await asyncio.sleep(offset)
+    next_poll = loop.time()
+    polls = 0
+    while count is None or polls < count:
+        async with semaphore:
+            started = loop.time()
+            error = None
+            try:
+                data = await client.poll(polled)
+            except ChargerError as err:
+                data, error = {}, str(err)
+            stats.add(loop.time() - started, error)
+
+        data.update(client.transport.quality.as_dict())
+        writer.write({
+            "timestamp": datetime.now(UTC),
+            "ip_address": charger.ip_address,
+            "serial": charger.serial,
+            "error": error,
+            **data,
+        })
+        polls += 1
+        if count is not None and polls >= count:
+            return
+        # ticks missed by slow poll are skipped, not caught up
+        next_poll = max(next_poll + interval, loop.time())
+        await asyncio.sleep(next_poll - loop.time())
+
+
+async def poll_fleet(
+    chargers: list[Charger],
+    writer: SnapshotWriter,
+    interval: float = 10.0,
+    count: int | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    extra: list[REQUEST_TYPE] | None = None,
+) -> FleetStats:
+    """Poll chargers concurrently until count polls of each are done, or forever.
+
+    Args:
+        chargers (list): chargers of fleet
+        writer (SnapshotWriter): output of snapshots
+        interval (float): seconds between polls of charger
+        count (int, optional): polls per charger, forever if not given
+        concurrency (int): polls in flight at once
+        extra (list, optional): request types polled in addition to values and DLB
+
+    Returns:
+        FleetStats: polls and failures
+
+    """
+    stats = FleetStats()
+    semaphore = asyncio.Semaphore(concurrency)
+    clients = [ChargerClient(charger.ip_address, charger.port, convert_pin_to_hex(charger.pin)) for charger in chargers]
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(
+            poll_charger(
+                charger,
+                client,
+                request_types(charger, extra or []),
+                interval,
+                count,
+                # first polls are spread over interval instead of bursting together
+                interval * index / len(chargers) if count != 1 else 0,
+                semaphore,
+                writer,
+                stats,
+            )
+            for index, (charger, client) in enumerate(zip(chargers, clients, strict=True))
+        ))
+    finally:
+        for client in clients:
+            client.close()
+        log_summary(stats, clients, time.perf_counter() - started)
+    return stats
+
+
+def log_summary(stats: FleetStats, clients: list[ChargerClient], elapsed: float) -> None:
+    """Log polls, failures and round trip times of fleet."""
+    if not stats.polls:
+        return
+    rtt = fleet_rtt(clients)
+
+    def ms(q: float) -> str:
+        value = rtt.percentile(q)
+        return "-" if value is None else f"{value * 1000:.1f}"
+
+    _LOGGER.info(
+        "%s polls of %s chargers in %.1f s, %.1f polls/s, %s failed (%.1f %%), "
+        "poll time mean %.1f ms max %.1f ms, rtt p50 %s ms p95 %s ms p99 %s ms",
+        stats.polls, len(clients), elapsed, stats.polls / elapsed if elapsed else 0,
+        stats.failures, 100 * stats.failures / stats.polls,
+        1000 * stats.poll_time / stats.polls, 1000 * stats.max_poll_time,
+        ms(50), ms(95), ms(99),
+    )
+    for error, count in sorted(stats.errors.items(), key=lambda item: -item[1]):
+        _LOGGER.info("%s: %s", error, count)
+
+
+def _weekdays(value: str) -> list[bool]:
+    """Parse weekdays given from Monday to Sunday to the client order, from Sunday to Saturday."""
+    if len(value) != 7 or set(value) - {"0", "1"}:
+        raise argparse.ArgumentTypeError("weekdays must be 7 digits of 0 or 1, from Monday to Sunday")
+    return [day == "1" for day in value[6] + value[:6]]
+
+
+async def run_command(client: ChargerClient, args: argparse.Namespace) -> dict[str, Any] | None:
+    """Send command of arguments to charger, return result of reading commands."""
+    if args.action in ("start", "stop"):
+        await client.send_command(CHARGER_COMMAND[args.action.upper()])
+    elif args.action == "set-timer":
+        await client.set_timer(args.start, args.end)
+    elif args.action == "reset-timer":
+        await client.reset_timer()
+    elif args.action == "set-schedule":
+        await client.set_schedule(args.weekdays, args.start, args.end)
+    elif args.action == "get-schedule":
+        return await client.request_schedule()
+    elif args.action == "set-max-current":
+        await client.set_max_current(args.current)
+    return None
+
+
+async def command_fleet(chargers: list[Charger], writer: SnapshotWriter, args: argparse.Namespace) -> int:
+    """Send command to chargers concurrently, return number of failed chargers."""
+    semaphore = asyncio.Semaphore(args.concurrency)
+    failures = 0
+
+    async def command(charger: Charger) -> None:
+        nonlocal failures
+        client = ChargerClient(charger.ip_address, charger.port, convert_pin_to_hex(charger.pin))
+        error = result = None
+        try:
+            async with semaphore:
+                result = await run_command(client, args)
+        except (ChargerError, ValueError) as err:
+            error = str(err)
+            failures += 1
+        finally:
+            client.close()
+        writer.write({
+            "timestamp": datetime.now(UTC),
+            "ip_address": charger.ip_address,
+            "serial": charger.serial,
+            "error": error,
+            **(result or {}),
+        })
+
+    await asyncio.gather(*(command(charger) for charger in chargers))
+    return failures
+
+
+def main() -> None:
+    """Parse arguments and poll or command fleet."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chargers", help="csv file of chargers")
+    parser.add_argument("--charger", type=Charger.parse, action="append", default=[], metavar="IP[:PORT]=PIN")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="chargers polled at once")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    parser.add_argument("-o", "--output", help="output file, stdout if not given")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    poll = commands.add_parser("poll", help="poll snapshots of chargers")
+    poll.add_argument("--interval", type=float, default=10.0, help="seconds between polls of charger")
+    poll.add_argument("--count", type=int, help="polls per charger, forever if not given")
+    poll.add_argument(
+        "--requests", default="", help="comma separated request types polled in addition to values and dlb: settings,model"
+    )
+
+    command = commands.add_parser("command", help="send command to chargers")
+    actions = command.add_subparsers(dest="action", required=True)
+    actions.add_parser("start", help="start charging")
+    actions.add_parser("stop", help="stop charging")
+    timer = actions.add_parser("set-timer", help="set charging timer")
+    timer.add_argument("start", help="HH:MM")
+    timer.add_argument("end", nargs="?", help="HH:MM, no end time if not given")
+    actions.add_parser("reset-timer", help="reset charging timer")
+    schedule = actions.add_parser("set-schedule", help="set weekly schedule")
+    schedule.add_argument("weekdays", type=_weekdays, help="7 digits of 0 or 1 from Monday to Sunday, like 1111100")
+    schedule.add_argument("start", help="HH:MM")
+    schedule.add_argument("end", help="HH:MM")
+    actions.add_parser("get-schedule", help="read weekly schedule")
+    current = actions.add_parser("set-max-current", help="set maximum charging current")
+    current.add_argument("current", type=int, help="6 - 32 A")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format="%(message)s", stream=sys.stderr)
+
+    chargers = (read_chargers(args.chargers) if args.chargers else []) + args.charger
+    if not chargers:
+        parser.error("no chargers given, use --chargers or --charger")
+
+    with open(args.output, "w", newline="", encoding="utf-8") if args.output else nullcontext(sys.stdout) as output:
+        writer = SnapshotWriter(output, args.format)
+        try:
+            if args.command == "poll":
+                extra = [REQUEST_TYPE[name.strip().upper()] for name in args.requests.split(",") if name.strip()]
+                asyncio.run(poll_fleet(chargers, writer, args.interval, args.count, args.concurrency, extra))
+            elif asyncio.run(command_fleet(chargers, writer, args)):
+                sys.exit(1)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
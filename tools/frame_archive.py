@@ -0,0 +1,488 @@
+"""Append-only archive of raw charger frames with time and serial indexes.
+
+Archive is a directory of daily segments (UTC). Segment data file holds fixed
+width records, so record n is at a known offset and files are read through
+mmap without parsing anything before it:
+
+    <day>.frames   header b"BENYARC1", then records
+                   <timestamp: float64> <serial: uint64> <direction: uint8>
+                   <message: uint8> <length: uint16> <frame: 44 bytes>
+    <day>.times    (timestamp, record) sorted by time
+    <day>.serials  (serial, timestamp, record) sorted by serial and time
+    messages.json  message type names by message code
+
+Frames are stored as raw bytes and typed with the codec when appended, so
+filtering by message type needs no decoding. Records are appended in arrival
+order and indexes of segments written to are rebuilt when writer is closed.
+A range query like all SEND_DLB frames of a serial between two times bisects
+the serial index to the first matching entry instead of scanning the segment.
+Records appended after the index was built are scanned.
+
+Run from repository root, Home Assistant is not needed:
+
+    python tools/frame_archive.py ingest archive 123456789.frames --serial 123456789
+    python tools/frame_archive.py ingest-pcap archive capture.pcapng --charger 192.168.1.20=123456789
+    python tools/frame_archive.py query archive --serial 123456789 --message SEND_DLB \\
+        --start 2026-01-01T00:00 --end 2026-01-02T00:00 --decode
+"""
+import argparse
+from binascii import Error as BinasciiError, hexlify, unhexlify
+from bisect import bisect_left
+from collections.abc import Iterator
+import csv
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from heapq import merge
+from ipaddress import ip_address
+import json
+import logging
+import mmap
+import os
+from pathlib import Path
+import struct
+import sys
+
+TOOLS = Path(__file__).resolve().parent
+sys.path.insert(0, str(TOOLS))
+
+import headless  # noqa: E402, F401
+
+from custom_components.beny_wifi.codec import UNKNOWN_MESSAGE, checksum_valid, identify  # noqa: E402
+from custom_components.beny_wifi.communication import read_message  # noqa: E402
+from custom_components.beny_wifi.recorder import RAW, RECEIVED, SENT, read_log  # noqa: E402
+
+_LOGGER = logging.getLogger(__name__)
+
+MAGIC = b"BENYARC1"
+INDEX_MAGIC = b"BENYIDX1"
+FRAME_SIZE = 44
+RECORD = struct.Struct(f"<dQBBH{FRAME_SIZE}s")
+# timestamp, serial, direction and message code at start of record
+RECORD_HEADER = struct.Struct("<dQBB")
+TIME_ENTRY = struct.Struct("<dI")
+SERIAL_ENTRY = struct.Struct("<QdI")
+# index header: magic and number of records indexed
+INDEX_HEADER = struct.Struct("<8sQ")
+
+DATA_SUFFIX = ".frames"
+TIME_SUFFIX = ".times"
+SERIAL_SUFFIX = ".serials"
+MESSAGES_FILE = "messages.json"
+INVALID_MESSAGE = "INVALID"
+
+
+def segment_name(timestamp: float) -> str:
+    """Return name of daily segment of timestamp."""
+    return datetime.fromtimestamp(timestamp, UTC).strftime("%Y%m%d")
+
+
+def message_name(frame: bytes) -> str:
+    """Return message type name of frame, like the codec names it without enum prefix."""
+    if not checksum_valid(frame):
+        return INVALID_MESSAGE
+    decoder = identify(frame)
+    return decoder.name.rsplit(".", 1)[-1] if decoder else UNKNOWN_MESSAGE
+
+
+@dataclass(frozen=True, slots=True)
+class ArchiveRecord:
+    """Archived frame."""
+
+    timestamp: float  # unix time
+    serial: int
+    direction: int
+    message: str
+    frame: bytes  # ascii hex, as on the wire
+
+    def decode(self) -> dict | None:
+        """Decode frame with the integration codec."""
+        return read_message(self.frame)
+
+
+class _Entries:
+    """Fixed width entries of a buffer as sequence, for bisect."""
+
+    __slots__ = ("_buffer", "_count", "_entry", "_offset")
+
+    def __init__(self, buffer, entry: struct.Struct, offset: int, count: int) -> None:
+        self._buffer = buffer
+        self._entry = entry
+        self._offset = offset
+        self._count = count
+
+    @classmethod
+    def empty(cls, entry: struct.Struct) -> "_Entries":
+        return cls(b"", entry, 0, 0)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> tuple:
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return self._entry.unpack_from(self._buffer, self._offset + index * self._entry.size)
+
+
+def _map(path: Path) -> mmap.mmap | None:
+    """Map file read only, None if file is missing or empty."""
+    try:
+        with open(path, "rb") as file:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+class Segment:
+    """Daily segment of archive, read through mmap."""
+
+    def __init__(self, path: Path, messages: list[str]) -> None:
+        """Map segment data and its indexes."""
+        self.path = path
+        self.messages = messages
+        self._data = _map(path)
+        self.count = (len(self._data) - len(MAGIC)) // RECORD.size if self._data else 0
+        self._times, self.indexed = self._index(TIME_SUFFIX, TIME_ENTRY)
+        self._serials, serials_indexed = self._index(SERIAL_SUFFIX, SERIAL_ENTRY)
+        if serials_indexed != self.indexed:
+            # indexes of different builds, records are scanned until indexes are rebuilt
+            self._times, self._serials, self.indexed = _Entries.empty(TIME_ENTRY), _Entries.empty(SERIAL_ENTRY), 0
+
+    def _index(self, suffix: str, entry: struct.Struct) -> tuple[_Entries, int]:
+        buffer = _map(self.path.with_suffix(suffix))
+        if buffer is None or len(buffer) < INDEX_HEADER.size:
+            return _Entries.empty(entry), 0
+        magic, indexed = INDEX_HEADER.unpack_from(buffer)
+        if magic != INDEX_MAGIC or indexed > self.count:
+            return _Entries.empty(entry), 0
+        return _Entries(buffer, entry, INDEX_HEADER.size, indexed), indexed
+
+    def close(self) -> None:
+        """Unmap segment."""
+        if self._data is not None:
+            self._data.close()
+
+    def record(self, number: int) -> ArchiveRecord:
+        """Read record by its number."""
+        timestamp, serial, direction, code, length, frame = RECORD.unpack_from(
+            self._data, len(MAGIC) + number * RECORD.size
+        )
+        frame = frame[:length] if direction & RAW else hexlify(frame[:length])
+        return ArchiveRecord(timestamp, serial, direction & ~RAW, self.messages[code], frame)
+
+    def _header(self, number: int) -> tuple[float, int, int]:
+        """Read timestamp, serial and message code of record without its frame."""
+        timestamp, serial, _, code = RECORD_HEADER.unpack_from(self._data, len(MAGIC) + number * RECORD.size)
+        return timestamp, serial, code
+
+    def _indexed(self, serial: int | None, start: float, end: float) -> Iterator[int]:
+        """Yield numbers of indexed records in range, in time order."""
+        if serial is not None:
+            entries = self._serials
+            position = bisect_left(entries, (serial, start), key=lambda entry: entry[:2])
+            while position < len(entries):
+                entry_serial, timestamp, number = entries[position]
+                if entry_serial != serial or timestamp >= end:
+                    return
+                yield number
+                position += 1
+        else:
+            entries = self._times
+            position = bisect_left(entries, start, key=lambda entry: entry[0])
+            while position < len(entries):
+                timestamp, number = entries[position]
+                if timestamp >= end:
+                    return
+                yield number
+                position += 1
+
+    def _unindexed(self, serial: int | None, start: float, end: float) -> list[int]:
+        """Return numbers of records appended after index was built, in time order."""
+        matches = []
+        for number in range(self.indexed, self.count):
+            timestamp, record_serial, _ = self._header(number)
+            if start <= timestamp < end and serial in (None, record_serial):
+                matches.append((timestamp, number))
+        return [number for _, number in sorted(matches)]
+
+    def query(
+        self,
+        serial: int | None = None,
+        start: float = float("-inf"),
+        end: float = float("inf"),
+        code: int | None = None,
+    ) -> Iterator[ArchiveRecord]:
+        """Yield records of serial and message code in time range [start, end), in time order."""
+        if not self.count:
+            return
+        numbers = merge(
+            self._indexed(serial, start, end),
+            self._unindexed(serial, start, end),
+            key=lambda number: self._header(number)[0],
+        )
+        for number in numbers:
+            if code is None or self._header(number)[2] == code:
+                yield self.record(number)
+
+
+def build_indexes(path: Path) -> int:
+    """Rebuild time and serial index of segment, return number of records indexed."""
+    data = _map(path)
+    entries = []
+    if data is not None:
+        count = (len(data) - len(MAGIC)) // RECORD.size
+        entries = [
+            (*RECORD_HEADER.unpack_from(data, len(MAGIC) + number * RECORD.size)[:2], number) for number in range(count)
+        ]
+        data.close()
+
+    times = sorted((timestamp, number) for timestamp, _, number in entries)
+    serials = sorted((serial, timestamp, number) for timestamp, serial, number in entries)
+    for suffix, entry, rows in ((TIME_SUFFIX, TIME_ENTRY, times), (SERIAL_SUFFIX, SERIAL_ENTRY, serials)):
+        temporary = path.with_suffix(suffix + ".tmp")
+        with open(temporary, "wb") as file:
+            file.write(INDEX_HEADER.pack(INDEX_MAGIC, len(entries)))
+            file.write(b"".join(entry.pack(*row) for row in rows))
+        os.replace(temporary, path.with_suffix(suffix))
+    return len(entries)
+
+
+def _load_messages(path: Path) -> list[str]:
+    try:
+        with open(path / MESSAGES_FILE, encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return [INVALID_MESSAGE, UNKNOWN_MESSAGE]
+
+
+class ArchiveWriter:
+    """Appends frames to archive, indexes are rebuilt on close."""
+
+    def __init__(self, path: str) -> None:
+        """Open archive directory for appending, created if missing."""
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.messages = _load_messages(self.path)
+        self._codes = {name: code for code, name in enumerate(self.messages)}
+        self._files: dict[str, object] = {}
+        self.skipped = 0
+
+    def __enter__(self) -> "ArchiveWriter":
+        """Return writer."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close writer."""
+        self.close()
+
+    def _code(self, frame: bytes) -> int:
+        name = message_name(frame)
+        code = self._codes.get(name)
+        if code is None:
+            if len(self.messages) > 0xFF:
+                raise ValueError("Too many message types in archive")
+            code = self._codes[name] = len(self.messages)
+            self.messages.append(name)
+        return code
+
+    def _file(self, timestamp: float):
+        name = segment_name(timestamp)
+        file = self._files.get(name)
+        if file is None:
+            file = self._files[name] = open(self.path / f"{name}{DATA_SUFFIX}", "ab")
+            if not file.tell():
+                file.write(MAGIC)
+        return file
+
+    def append(self, timestamp: float, serial: int, direction: int, frame: bytes) -> bool:
+        """Append frame, return False if it is too long to be archived.
+
+        Args:
+            timestamp (float): unix time
+            serial (int): charger serial
+            direction (int): recorder.SENT or recorder.RECEIVED
+            frame (bytes): ascii hex frame
+
+        """
+        data = frame
+        try:
+            if frame == frame.lower():
+                data = unhexlify(frame)
+            else:
+                direction |= RAW
+        except BinasciiError:
+            direction |= RAW
+        if len(data) > FRAME_SIZE:
+            self.skipped += 1
+            return False
+
+        self._file(timestamp).write(RECORD.pack(timestamp, serial, direction, self._code(frame), len(data), data))
+        return True
+
+    def close(self) -> None:
+        """Close segments written to, rebuild their indexes and save message types."""
+        for name, file in self._files.items():
+            file.close()
+            build_indexes(self.path / f"{name}{DATA_SUFFIX}")
+        self._files = {}
+        with open(self.path / MESSAGES_FILE, "w", encoding="utf-8") as file:
+            json.dump(self.messages, file)
+        if self.skipped:
+            _LOGGER.warning("%s frames longer than %s bytes were not archived", self.skipped, FRAME_SIZE)
+
+
+class FrameArchive:
+    """Reads archive through mmap."""
+
+    def __init__(self, path: str) -> None:
+        """Open archive directory."""
+        self.path = Path(path)
+        self.messages = _load_messages(self.path)
+        self._segments: dict[str, Segment] = {}
+
+    def __enter__(self) -> "FrameArchive":
+        """Return archive."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close archive."""
+        self.close()
+
+    def close(self) -> None:
+        """Unmap segments."""
+        for segment in self._segments.values():
+            segment.close()
+        self._segments = {}
+
+    def segment(self, name: str) -> Segment:
+        """Return mapped segment by name."""
+        segment = self._segments.get(name)
+        if segment is None:
+            segment = self._segments[name] = Segment(self.path / f"{name}{DATA_SUFFIX}", self.messages)
+        return segment
+
+    def query(
+        self,
+        serial: int | None = None,
+        start: float | None = None,
+        end: float | None = None,
+        message: str | None = None,
+    ) -> Iterator[ArchiveRecord]:
+        """Yield archived frames in time order.
+
+        Args:
+            serial (int, optional): charger serial
+            start (float, optional): unix time of first frame, inclusive
+            end (float, optional): unix time of last frame, exclusive
+            message (str, optional): message type, like SEND_DLB
+
+        """
+        code = None
+        if message is not None:
+            name = message.rsplit(".", 1)[-1]
+            if name not in self.messages:
+                return
+            code = self.messages.index(name)
+
+        first = segment_name(start) if start is not None else ""
+        last = segment_name(end) if end is not None else "99999999"
+        names = sorted(
+            path.stem for path in self.path.glob(f"*{DATA_SUFFIX}") if first <= path.stem <= last
+        )
+        for name in names:
+            yield from self.segment(name).query(
+                serial,
+                float("-inf") if start is None else start,
+                float("inf") if end is None else end,
+                code,
+            )
+
+
+def ingest_log(writer: ArchiveWriter, path: str, serial: int, offset: float | None = None) -> int:
+    """Archive frame log recorded by the integration.
+
+    Log has monotonic timestamps. They are converted to unix time with offset,
+    by default so that last record was written when the log was last modified.
+    """
+    if offset is None:
+        last = None
+        for record in read_log(path):
+            last = record.timestamp
+        offset = os.path.getmtime(path) - (last or 0)
+    count = 0
+    for record in read_log(path):
+        count += writer.append(record.timestamp + offset, serial, record.direction, record.frame)
+    return count
+
+
+def ingest_pcap(writer: ArchiveWriter, path: str, chargers: dict[str, int], port: int | None = None) -> int:
+    """Archive charger frames of capture, chargers map addresses to serials."""
+    from pcap_to_json import CHARGER_PORT, read_flows
+
+    count = 0
+    unknown = set()
+    for timestamp, flow, payload, request in read_flows(path, port or CHARGER_PORT):
+        address = str(ip_address(flow[2]))
+        serial = chargers.get(address)
+        if serial is None:
+            if address not in unknown:
+                unknown.add(address)
+                _LOGGER.warning("Serial of charger %s not given, its frames are archived with serial 0", address)
+            serial = 0
+        count += writer.append(timestamp, serial, SENT if request else RECEIVED, payload.encode("ascii"))
+    return count
+
+
+def _timestamp(value: str) -> float:
+    moment = datetime.fromisoformat(value)
+    return (moment if moment.tzinfo else moment.replace(tzinfo=UTC)).timestamp()
+
+
+def main() -> None:
+    """Parse arguments and run command."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest = commands.add_parser("ingest", help="archive frame logs recorded by the integration")
+    ingest.add_argument("archive")
+    ingest.add_argument("logs", nargs="+")
+    ingest.add_argument("--serial", type=int, required=True, help="serial of recorded charger")
+    ingest.add_argument("--offset", type=float, help="seconds added to monotonic timestamps to get unix time")
+
+    ingest_capture = commands.add_parser("ingest-pcap", help="archive charger frames of pcap or pcapng captures")
+    ingest_capture.add_argument("archive")
+    ingest_capture.add_argument("captures", nargs="+")
+    ingest_capture.add_argument("--charger", action="append", default=[], metavar="ADDRESS=SERIAL")
+    ingest_capture.add_argument("--port", type=int, help="charger UDP port")
+
+    query = commands.add_parser("query", help="print archived frames as csv")
+    query.add_argument("archive")
+    query.add_argument("--serial", type=int)
+    query.add_argument("--message", help="message type, like SEND_DLB")
+    query.add_argument("--start", type=_timestamp, help="ISO time, UTC if no offset")
+    query.add_argument("--end", type=_timestamp, help="ISO time, UTC if no offset")
+    query.add_argument("--decode", action="store_true", help="add decoded message as json")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.command == "query":
+        output = csv.writer(sys.stdout)
+        output.writerow(["timestamp", "serial", "direction", "message", "frame", *(["decoded"] if args.decode else [])])
+        with FrameArchive(args.archive) as archive:
+            for record in archive.query(args.serial, args.start, args.end, args.message):
+                row = [record.timestamp, record.serial, record.direction, record.message, record.frame.decode()]
+                if args.decode:
+                    row.append(json.dumps(record.decode(), default=str))
+                output.writerow(row)
+        return
+
+    with ArchiveWriter(args.archive) as writer:
+        if args.command == "ingest":
+            count = sum(ingest_log(writer, log, args.serial, args.offset) for log in args.logs)
+        else:
+            chargers = {address: int(serial) for address, serial in (item.split("=", 1) for item in args.charger)}
+            count = sum(ingest_pcap(writer, capture, chargers, args.port) for capture in args.captures)
+    _LOGGER.info("Archived %s frames to %s", count, args.archive)
+
+
+if __name__ == "__main__":
+    main()
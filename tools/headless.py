@@ -0,0 +1,44 @@
+"""Import protocol modules of the integration without Home Assistant.
+
+Importing custom_components.beny_wifi.<module> runs the package __init__, which
+sets up the integration and imports Home Assistant. Importing this module
+registers the package without running its __init__, so the dependency free
+core (const, codec, conversions, communication, recorder, transport,
+validation, link_quality) is imported with the same module names as in the
+integration, and tools exercise the very same codec. Modules that need Home
+Assistant, like coordinator, still import it when imported.
+
+Tools import this before the integration:
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    import headless  # noqa: E402, F401
+
+Check cold start cost with:
+
+    python -X importtime -c "import sys; sys.path.insert(0, 'tools'); import headless; \\
+        import custom_components.beny_wifi.communication"
+"""
+import os
+import sys
+from types import ModuleType
+
+# pathlib and importlib.util are not imported, they would cost more than the protocol core
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "custom_components.beny_wifi"
+
+
+def register() -> None:
+    """Register integration package without running its __init__, unless already imported."""
+    if PACKAGE in sys.modules:
+        return
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+    # module with __path__ is a package, its submodules are found from there
+    package = ModuleType(PACKAGE)
+    package.__path__ = [os.path.join(ROOT, "custom_components", "beny_wifi")]
+    package.__file__ = os.path.join(package.__path__[0], "__init__.py")
+    sys.modules[PACKAGE] = package
+
+
+register()
@@ -1,40 +1,683 @@
+"""Convert captured charger traffic to response table of charger simulator.
+
+Captures are streamed packet by packet, so memory stays flat regardless of
+capture size. Both pcap and pcapng files are read without scapy: only link,
+IP and UDP headers are parsed and packets not to or from the charger port are
+skipped before their payload is touched.
+
+Requests are paired with responses of the same client and charger as they
+are read. Several requests of a client can be pending at once, like the
+concurrent polls of the integration, and responses are matched to them by
+message type the same way the integration transport does. Unanswered requests
+are kept until timeout or until the number of pending requests reaches its
+limit, the oldest are dropped first.
+
+Several captures, like overnight captures of several chargers, can be
+converted in parallel processes, one file per process. Tables are merged in
+the order the files are given, later responses replacing earlier ones.
+
+Analysis mode decodes every exchange with the integration's read_message
+instead and writes a row per exchange as csv: client, request and response
+message type and header, round trip time, attempts and checksum validity.
+Summary per client and message type has loss and retry rates, unknown
+responses, round trip time percentiles and median poll interval, so poll rate
+of the vendor app can be compared to ours. Home Assistant is not needed.
+
+    python tools/pcap_to_json.py capture.pcap -o messages.json
+    python tools/pcap_to_json.py charger1.pcapng charger2.pcapng -o messages.json --jobs 2
+    python tools/pcap_to_json.py capture.pcapng --analyze exchanges.csv --summary summary.csv --client 192.168.1.10
+"""
+import argparse
+from array import array
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+import csv
+from dataclasses import dataclass, field
+from functools import partial
+from ipaddress import ip_address
 import json
+import logging
+from pathlib import Path
+from statistics import median, quantiles
+import struct
 import sys
-from scapy.all import rdpcap, UDP, IP
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import headless  # noqa: E402, F401
+
+from custom_components.beny_wifi.codec import UNKNOWN_MESSAGE, identify  # noqa: E402
+from custom_components.beny_wifi.communication import read_message  # noqa: E402
+from custom_components.beny_wifi.const import CLIENT_MESSAGE, EXPECTED_RESPONSES, REQUEST_TYPE  # noqa: E402
+
+_LOGGER = logging.getLogger(__name__)
 
 PCAP_FILE = "capture.pcap"
 OUTPUT_FILE = "output.json"
+CHARGER_PORT = 3333
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_MAX_PENDING = 10000
+
+PCAP_MAGIC = {
+    b"\xd4\xc3\xb2\xa1": ("<", 1e-6),
+    b"\xa1\xb2\xc3\xd4": (">", 1e-6),
+    b"\x4d\x3c\xb2\xa1": ("<", 1e-9),
+    b"\xa1\xb2\x3c\x4d": (">", 1e-9),
+}
+PCAPNG_MAGIC = b"\x0a\x0d\x0d\x0a"
+PCAPNG_BYTE_ORDER = {b"\x4d\x3c\x2b\x1a": "<", b"\x1a\x2b\x3c\x4d": ">"}
+
+# pcapng block types
+INTERFACE_DESCRIPTION = 0x00000001
+SIMPLE_PACKET = 0x00000003
+ENHANCED_PACKET = 0x00000006
+IF_TSRESOL = 9
+
+# link types
+LINKTYPE_NULL = 0
+LINKTYPE_ETHERNET = 1
+LINKTYPE_RAW = 101
+LINKTYPE_LINUX_SLL = 113
+LINKTYPE_IPV4 = 228
+LINKTYPE_IPV6 = 229
+LINKTYPE_LINUX_SLL2 = 276
+
+ETHERTYPE_IPV4 = 0x0800
+ETHERTYPE_IPV6 = 0x86DD
+ETHERTYPE_VLAN = (0x8100, 0x88A8)
+IPPROTO_UDP = 17
+
+# request type of data requests, REQUEST_DLB has the same layout as REQUEST_DATA
+DATA_REQUEST_TYPE = CLIENT_MESSAGE.REQUEST_DATA.value["structure"]["request_type"]
+IPV6_EXTENSION_HEADERS = (0, 43, 60)
+
+UINT16 = struct.Struct("!H")
+UDP_HEADER = struct.Struct("!HHHH")
+
+# (timestamp, link type, frame)
+Packet = tuple[float, int, bytes]
+# (client address, client port, charger address, charger port)
+Flow = tuple[bytes, int, bytes, int]
+
+
+def _read_pcap(file, header: bytes) -> Iterator[Packet]:
+    byte_order, resolution = PCAP_MAGIC[header[:4]]
+    file_header = header + file.read(16)
+    if len(file_header) < 24:
+        return
+    (link_type,) = struct.unpack_from(byte_order + "I", file_header, 20)
+    record = struct.Struct(byte_order + "IIII")
+
+    while len(data := file.read(record.size)) == record.size:
+        seconds, fraction, captured, _ = record.unpack(data)
+        frame = file.read(captured)
+        if len(frame) < captured:
+            _LOGGER.warning("Capture %s is truncated", file.name)
+            return
+        yield seconds + fraction * resolution, link_type & 0xFFFF, frame
+
+
+def _read_pcapng(file, header: bytes) -> Iterator[Packet]:
+    byte_order = "<"
+    # per interface of current section: (link type, timestamp resolution)
+    interfaces: list[tuple[int, float]] = []
+
+    while len(header) == 8:
+        if header[:4] == PCAPNG_MAGIC:
+            byte_order = PCAPNG_BYTE_ORDER.get(file.read(4), "<")
+            (length,) = struct.unpack(byte_order + "I", header[4:])
+            expected = length - 12
+            interfaces = []
+        else:
+            block_type, length = struct.unpack(byte_order + "II", header)
+            expected = length - 8
+        body = file.read(expected)
+        if len(body) < expected:
+            _LOGGER.warning("Capture %s is truncated", file.name)
+            return
+
+        if header[:4] != PCAPNG_MAGIC:
+            if block_type == INTERFACE_DESCRIPTION:
+                interfaces.append((struct.unpack_from(byte_order + "H", body)[0], _tsresol(body, byte_order)))
+            elif block_type == ENHANCED_PACKET:
+                interface, high, low, captured = struct.unpack_from(byte_order + "IIII", body)
+                link_type, resolution = interfaces[interface]
+                yield ((high << 32) | low) * resolution, link_type, body[20:20 + captured]
+            elif block_type == SIMPLE_PACKET and interfaces:
+                # simple packets have no timestamp
+                (original,) = struct.unpack_from(byte_order + "I", body)
+                yield 0.0, interfaces[0][0], body[4:4 + min(original, length - 16)]
+
+        header = file.read(8)
+
+
+def _tsresol(body: bytes, byte_order: str) -> float:
+    """Return timestamp resolution from options of interface description block."""
+    offset = 8
+    while offset + 4 <= len(body) - 4:
+        code, length = struct.unpack_from(byte_order + "HH", body, offset)
+        if code == 0:
+            break
+        if code == IF_TSRESOL:
+            value = body[offset + 4]
+            return 2.0 ** -(value & 0x7F) if value & 0x80 else 10.0 ** -value
+        offset += 4 + (length + 3) // 4 * 4
+    return 1e-6
+
+
+def read_packets(path: str) -> Iterator[Packet]:
+    """Stream packets of pcap or pcapng capture.
+
+    Args:
+        path (str): capture file
+
+    Yields:
+        tuple: timestamp in seconds, link type and captured frame
+
+    """
+    with open(path, "rb") as file:
+        header = file.read(8)
+        if header[:4] in PCAP_MAGIC:
+            yield from _read_pcap(file, header)
+        elif header[:4] == PCAPNG_MAGIC:
+            yield from _read_pcapng(file, header)
+        else:
+            raise ValueError(f"{path} is not a pcap or pcapng capture")
+
+
+def udp_datagram(link_type: int, frame: bytes, port: int) -> tuple[bytes, int, bytes, int, bytes] | None:
+    """Parse UDP datagram to or from port.
+
+    Args:
+        link_type (int): link type of frame
+        frame (bytes): captured frame
+        port (int): charger port
+
+    Returns:
+        tuple: source address, source port, destination address, destination port and
+            payload, None if frame is not UDP to or from port
+
+    """
+    if link_type == LINKTYPE_ETHERNET:
+        offset, ethertype = 14, UINT16.unpack_from(frame, 12)[0] if len(frame) >= 14 else 0
+        while ethertype in ETHERTYPE_VLAN and len(frame) >= offset + 4:
+            ethertype = UINT16.unpack_from(frame, offset + 2)[0]
+            offset += 4
+    elif link_type == LINKTYPE_LINUX_SLL:
+        offset, ethertype = 16, UINT16.unpack_from(frame, 14)[0] if len(frame) >= 16 else 0
+    elif link_type == LINKTYPE_LINUX_SLL2:
+        offset, ethertype = 20, UINT16.unpack_from(frame, 0)[0] if len(frame) >= 20 else 0
+    elif link_type == LINKTYPE_NULL:
+        offset, ethertype = 4, ETHERTYPE_IPV4 if frame[:1] == b"\x02" or frame[3:4] == b"\x02" else ETHERTYPE_IPV6
+    elif link_type in (LINKTYPE_RAW, LINKTYPE_IPV4, LINKTYPE_IPV6):
+        offset, ethertype = 0, ETHERTYPE_IPV4 if frame[:1] and frame[0] >> 4 == 4 else ETHERTYPE_IPV6
+    else:
+        return None
+
+    if ethertype == ETHERTYPE_IPV4:
+        if len(frame) < offset + 20 or frame[offset + 9] != IPPROTO_UDP:
+            return None
+        # only first fragment has UDP header
+        if UINT16.unpack_from(frame, offset + 6)[0] & 0x1FFF:
+            return None
+        source, destination = frame[offset + 12:offset + 16], frame[offset + 16:offset + 20]
+        offset += (frame[offset] & 0x0F) * 4
+    elif ethertype == ETHERTYPE_IPV6:
+        if len(frame) < offset + 40:
+            return None
+        next_header = frame[offset + 6]
+        source, destination = frame[offset + 8:offset + 24], frame[offset + 24:offset + 40]
+        offset += 40
+        while next_header in IPV6_EXTENSION_HEADERS and len(frame) >= offset + 8:
+            next_header = frame[offset]
+            offset += (frame[offset + 1] + 1) * 8
+        if next_header != IPPROTO_UDP:
+            return None
+    else:
+        return None
+
+    if len(frame) < offset + UDP_HEADER.size:
+        return None
+    source_port, destination_port, length, _ = UDP_HEADER.unpack_from(frame, offset)
+    if port not in (source_port, destination_port):
+        return None
+    payload = frame[offset + UDP_HEADER.size:offset + max(length, UDP_HEADER.size)]
+    return source, source_port, destination, destination_port, payload
+
+
+@dataclass(slots=True)
+class Exchange:
+    """Request to charger and its response."""
+
+    flow: Flow
+    request: str
+    # first and latest transmission of request
+    first_sent: float
+    sent: float
+    attempts: int = 1
+    response: str | None = None
+    received: float | None = None
+
+
+class RequestPairer:
+    """Pairs requests to charger with its responses as packets are read.
+
+    Requests of a flow can be pending at the same time. Response is matched
+    like in ChargerTransport.datagram_received: to the oldest pending data
+    request expecting its message type (EXPECTED_RESPONSES), else to the oldest
+    pending request without expected responses, like a command. Response that
+    can't be identified, unknown header or broken frame, is counted against the
+    oldest pending request of the flow. Repeated identical pending request of a
+    flow is counted as retransmission. Request timed out or dropped for the
+    limit of pending requests is passed to on_unanswered.
+    """
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        on_unanswered: Callable[[Exchange], None] | None = None,
+    ) -> None:
+        """Initialize pairer.
+
+        Args:
+            timeout (float): seconds to wait for response to request
+            max_pending (int): maximum number of unanswered requests kept
+            on_unanswered (Callable, optional): called with requests left without response
+
+        """
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self.on_unanswered = on_unanswered
+        # (flow, request) -> exchange, latest transmission last
+        self.pending: OrderedDict[tuple[Flow, str], Exchange] = OrderedDict()
+        # flow -> request -> exchange, in order of first transmission
+        self._flows: dict[Flow, dict[str, Exchange]] = {}
+        self._expected: dict[str, frozenset | None] = {}
+        self.expired = 0
+        self.unmatched = 0
+
+    def expected(self, request: str) -> frozenset | None:
+        """Return messages accepted as response to request, None if any response is accepted."""
+        try:
+            return self._expected[request]
+        except KeyError:
+            pass
+
+        expect = None
+        decoder = identify(request)
+        if decoder is not None and decoder.message is CLIENT_MESSAGE.REQUEST_DATA:
+            try:
+                expect = frozenset(EXPECTED_RESPONSES[REQUEST_TYPE(int(request[DATA_REQUEST_TYPE], 16))])
+            except (KeyError, ValueError):
+                pass
+        # requests repeat between polls, resolved once
+        self._expected[request] = expect
+        return expect
+
+    def _remove(self, exchange: Exchange) -> None:
+        del self.pending[exchange.flow, exchange.request]
+        requests = self._flows[exchange.flow]
+        del requests[exchange.request]
+        if not requests:
+            del self._flows[exchange.flow]
+
+    def _expire(self, exchange: Exchange) -> None:
+        self._remove(exchange)
+        self.expired += 1
+        if self.on_unanswered is not None:
+            self.on_unanswered(exchange)
+
+    def _match(self, flow: Flow, response: str) -> Exchange | None:
+        exchanges = self._flows.get(flow)
+        if not exchanges:
+            return None
 
-def extract_udp_pairs(pcap_file):
-    packets = rdpcap(pcap_file)
-    transactions = []
-    last_request = {}
+        message = None
+        if any(self.expected(request) for request in exchanges):
+            decoder = identify(response)
+            message = decoder.message if decoder else None
+            for request, exchange in exchanges.items():
+                expect = self.expected(request)
+                if expect and message in expect:
+                    return exchange
 
-    for pkt in packets:
-        if pkt.haslayer(UDP) and pkt.haslayer(IP):
-            src = str(pkt[UDP].sport)
-            dst = str(pkt[UDP].dport)
-            payload = bytes(pkt[UDP].payload).decode(errors="ignore")  # Decode to ASCII
+        for request, exchange in exchanges.items():
+            if self.expected(request) is None:
+                return exchange
 
-            key = (pkt[IP].src, pkt[IP].dst, src, dst)
-            reverse_key = (pkt[IP].dst, pkt[IP].src, dst, src)
+        # unknown or broken response can't be matched by type
+        return next(iter(exchanges.values())) if message is None else None
 
-            if key in last_request:
-                transactions.append((last_request[key], payload))
-                del last_request[key]
-            else:
-                last_request[reverse_key] = payload
+    def get(self, flow: Flow, request: str) -> Exchange | None:
+        """Return pending exchange of request."""
+        return self.pending.get((flow, request))
+
+    def add(self, timestamp: float, flow: Flow, payload: str, request: bool) -> Exchange | None:
+        """Add packet of flow, return exchange when response pairs with request."""
+        pending = self.pending
+        while pending:
+            exchange = next(iter(pending.values()))
+            if timestamp - exchange.sent <= self.timeout:
+                break
+            self._expire(exchange)
+
+        if request:
+            exchange = pending.get((flow, payload))
+            if exchange is not None:
+                exchange.attempts += 1
+                exchange.sent = timestamp
+                pending.move_to_end((flow, payload))
+                return None
+
+            exchange = pending[flow, payload] = Exchange(flow, payload, timestamp, timestamp)
+            self._flows.setdefault(flow, {})[payload] = exchange
+            if len(pending) > self.max_pending:
+                self._expire(next(iter(pending.values())))
+            return None
+
+        exchange = self._match(flow, payload)
+        if exchange is None:
+            self.unmatched += 1
+            return None
+        self._remove(exchange)
+        exchange.response = payload
+        exchange.received = timestamp
+        return exchange
+
+    def flush(self) -> None:
+        """Pass requests still waiting for response as unanswered."""
+        while self.pending:
+            self._expire(next(iter(self.pending.values())))
+
+
+def read_flows(pcap_file: str, port: int = CHARGER_PORT) -> Iterator[tuple[float, Flow, str, bool]]:
+    """Stream charger datagrams of capture.
+
+    Yields:
+        tuple: timestamp, flow, payload and whether datagram is request to charger
+
+    """
+    for timestamp, link_type, frame in read_packets(pcap_file):
+        datagram = udp_datagram(link_type, frame, port)
+        if datagram is None:
+            continue
+        source, source_port, destination, destination_port, payload = datagram
+        request = destination_port == port
+        flow = (source, source_port, destination, destination_port) if request else (
+            destination, destination_port, source, source_port
+        )
+        yield timestamp, flow, payload.decode("ascii", "ignore"), request
+
+
+def extract_udp_pairs(
+    pcap_file: str,
+    port: int = CHARGER_PORT,
+    timeout: float = DEFAULT_TIMEOUT,
+    max_pending: int = DEFAULT_MAX_PENDING,
+) -> dict[str, str]:
+    """Return responses by request from capture, latest response of request wins."""
+    pairer = RequestPairer(timeout, max_pending)
+    transactions: dict[str, str] = {}
+
+    for timestamp, flow, payload, request in read_flows(pcap_file, port):
+        exchange = pairer.add(timestamp, flow, payload, request)
+        if exchange is not None:
+            transactions[exchange.request] = exchange.response
+
+    if pairer.expired or pairer.pending:
+        _LOGGER.info("%s: %s requests without response", pcap_file, pairer.expired + len(pairer.pending))
+    if pairer.unmatched:
+        _LOGGER.info("%s: %s responses without matching request", pcap_file, pairer.unmatched)
+    return transactions
+
+
+def extract_files(
+    pcap_files: list[str],
+    jobs: int = 1,
+    port: int = CHARGER_PORT,
+    timeout: float = DEFAULT_TIMEOUT,
+    max_pending: int = DEFAULT_MAX_PENDING,
+) -> dict[str, str]:
+    """Return responses by request from captures, converting one file per process."""
+    transactions: dict[str, str] = {}
+    if jobs > 1 and len(pcap_files) > 1:
+        with ProcessPoolExecutor(min(jobs, len(pcap_files))) as executor:
+            extract = partial(extract_udp_pairs, port=port, timeout=timeout, max_pending=max_pending)
+            for pairs in executor.map(extract, pcap_files):
+                transactions.update(pairs)
+    else:
+        for pcap_file in pcap_files:
+            transactions.update(extract_udp_pairs(pcap_file, port, timeout, max_pending))
+    return transactions
+
+
+EXCHANGE_COLUMNS = (
+    "time", "client", "client_port", "charger", "request", "request_header",
+    "response", "response_header", "rtt_ms", "attempts", "checksum_valid",
+)
+SUMMARY_COLUMNS = (
+    "client", "request", "requests", "answered", "loss_percent", "retry_percent", "unknown_responses",
+    "rtt_p50_ms", "rtt_p95_ms", "rtt_p99_ms", "rtt_max_ms", "poll_interval_s",
+)
+# message_type and message_id of frame
+HEADER = slice(4, 10)
+
+
+@dataclass(slots=True)
+class MessageStats:
+    """Statistics of requests of one message type from one client."""
+
+    requests: int = 0
+    answered: int = 0
+    attempts: int = 0
+    unknown_responses: int = 0
+    rtts: array = field(default_factory=lambda: array("d"))
+    intervals: array = field(default_factory=lambda: array("d"))
+    last_request: float | None = None
+
+
+def _percentiles(values: array) -> tuple[float | None, float | None, float | None, float | None]:
+    """Return 50th, 95th and 99th percentile and maximum."""
+    if not values:
+        return None, None, None, None
+    if len(values) == 1:
+        return values[0], values[0], values[0], values[0]
+    cuts = quantiles(values, n=100, method="inclusive")
+    return cuts[49], cuts[94], cuts[98], max(values)
+
+
+def _ms(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+class CaptureAnalyzer:
+    """Decodes exchanges with the integration and collects statistics per client and message type.
+
+    Concurrent requests of a client are paired by message type, so statistics
+    of each request type are kept apart. Round trip times are counted only for
+    requests answered on first attempt, as response to a retransmitted request
+    can't be matched to transmission. Poll interval is time between first
+    transmissions of consecutive requests.
+    """
+
+    def __init__(self, exchanges=None) -> None:
+        """Initialize analyzer.
+
+        Args:
+            exchanges (csv.writer, optional): writer for row per exchange
+
+        """
+        self._exchanges = exchanges
+        self._labels: dict[str, str] = {}
+        self.stats: dict[tuple[str, str], MessageStats] = {}
+        # responses not matching any pending request
+        self.unmatched = 0
+
+    def label(self, frame: str) -> str:
+        """Return message type of frame, with request type or header if known."""
+        msg = read_message(frame)
+        if msg is None:
+            return "INVALID"
+        name = msg["message_type"].rsplit(".", 1)[-1]
+        if name == UNKNOWN_MESSAGE:
+            return f"{name} {frame[HEADER]}"
+        request_type = msg.get("request_type")
+        return name if request_type is None else f"{name} {request_type}"
+
+    def _request_label(self, frame: str) -> str:
+        # requests repeat between polls, decoded once
+        label = self._labels.get(frame)
+        if label is None:
+            label = self._labels[frame] = self.label(frame)
+        return label
+
+    def _stats(self, flow: Flow, request: str) -> MessageStats:
+        key = (str(ip_address(flow[0])), self._request_label(request))
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = MessageStats()
+        return stats
+
+    def add_request(self, timestamp: float, flow: Flow, request: str) -> None:
+        """Count first transmission of request for poll interval."""
+        stats = self._stats(flow, request)
+        if stats.last_request is not None:
+            stats.intervals.append(timestamp - stats.last_request)
+        stats.last_request = timestamp
+
+    def add_exchange(self, exchange: Exchange) -> None:
+        """Count answered or unanswered exchange."""
+        stats = self._stats(exchange.flow, exchange.request)
+        stats.requests += 1
+        stats.attempts += exchange.attempts
+
+        response_label = rtt = checksum = None
+        if exchange.response is not None:
+            stats.answered += 1
+            response_label = self.label(exchange.response)
+            checksum = response_label != "INVALID"
+            if response_label.startswith(UNKNOWN_MESSAGE):
+                stats.unknown_responses += 1
+            rtt = exchange.received - exchange.sent
+            if exchange.attempts == 1:
+                stats.rtts.append(rtt)
+
+        if self._exchanges is not None:
+            client, client_port, charger, _ = exchange.flow
+            self._exchanges.writerow((
+                exchange.first_sent, ip_address(client), client_port, ip_address(charger),
+                self._request_label(exchange.request), exchange.request[HEADER],
+                response_label, exchange.response[HEADER] if exchange.response else None,
+                _ms(rtt), exchange.attempts, checksum,
+            ))
+
+    def analyze(
+        self, pcap_file: str, port: int = CHARGER_PORT, timeout: float = DEFAULT_TIMEOUT, max_pending: int = DEFAULT_MAX_PENDING
+    ) -> None:
+        """Analyze exchanges of capture."""
+        pairer = RequestPairer(timeout, max_pending, self.add_exchange)
+        for timestamp, flow, payload, request in read_flows(pcap_file, port):
+            exchange = pairer.add(timestamp, flow, payload, request)
+            if exchange is not None:
+                self.add_exchange(exchange)
+            elif request and (pending := pairer.get(flow, payload)) is not None and pending.attempts == 1:
+                self.add_request(timestamp, flow, payload)
+        pairer.flush()
+        self.unmatched += pairer.unmatched
+
+    def summary(self) -> Iterator[tuple]:
+        """Yield summary row per client and message type."""
+        for (client, request), stats in sorted(self.stats.items()):
+            yield (
+                client, request, stats.requests, stats.answered,
+                round((1 - stats.answered / stats.requests) * 100, 1) if stats.requests else None,
+                round((stats.attempts - stats.requests) / stats.attempts * 100, 1) if stats.attempts else None,
+                stats.unknown_responses,
+                *(_ms(value) for value in _percentiles(stats.rtts)),
+                round(median(stats.intervals), 3) if stats.intervals else None,
+            )
+
+    def poll_gaps(self, client: str) -> dict[str, tuple[float, float]]:
+        """Return median poll interval of client and of other clients per message type."""
+        ours: dict[str, array] = {}
+        others: dict[str, array] = {}
+        for (address, request), stats in self.stats.items():
+            (ours if address == client else others).setdefault(request, array("d")).extend(stats.intervals)
+        return {
+            request: (median(ours[request]), median(intervals))
+            for request, intervals in others.items()
+            if intervals and ours.get(request)
+        }
+
+
+def analyze_files(
+    pcap_files: list[str],
+    exchanges_file: str,
+    summary_file: str | None = None,
+    client: str | None = None,
+    port: int = CHARGER_PORT,
+    timeout: float = DEFAULT_TIMEOUT,
+    max_pending: int = DEFAULT_MAX_PENDING,
+) -> CaptureAnalyzer:
+    """Write exchanges of captures and their summary as csv, summary to stdout if no file given."""
+    with open(exchanges_file, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(EXCHANGE_COLUMNS)
+        analyzer = CaptureAnalyzer(writer)
+        for pcap_file in pcap_files:
+            analyzer.analyze(pcap_file, port, timeout, max_pending)
+
+    with open(summary_file, "w", newline="") if summary_file else nullcontext(sys.stdout) as file:
+        writer = csv.writer(file)
+        writer.writerow(SUMMARY_COLUMNS)
+        writer.writerows(analyzer.summary())
+
+    if analyzer.unmatched:
+        _LOGGER.info("%s responses without matching request", analyzer.unmatched)
+    if client is not None:
+        for request, (ours, others) in analyzer.poll_gaps(client).items():
+            _LOGGER.info("%s poll interval: %.3f s, other clients: %.3f s, gap %.3f s", request, ours, others, ours - others)
+    return analyzer
 
-    return {req: resp for req, resp in transactions}
 
 def save_to_json(data, output_file):
     with open(output_file, "w") as f:
         json.dump({"responses": data}, f, indent=4)
     print(f"Saved {len(data)} request-response pairs to {output_file}")
 
-if __name__ == "__main__":
-    pcap_file = sys.argv[1] if len(sys.argv) > 1 else PCAP_FILE
-    output_file = sys.argv[2] if len(sys.argv) > 2 else OUTPUT_FILE
 
-    udp_pairs = extract_udp_pairs(pcap_file)
-    save_to_json(udp_pairs, output_file)
+def main() -> None:
+    """Run converter from command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("captures", nargs="*", default=[PCAP_FILE], help="pcap or pcapng files")
+    parser.add_argument("-o", "--output", help=f"response table, default {OUTPUT_FILE}")
+    parser.add_argument("--port", type=int, default=CHARGER_PORT, help="charger UDP port")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds to wait for response")
+    parser.add_argument("--max-pending", type=int, default=DEFAULT_MAX_PENDING, help="unanswered requests kept")
+    parser.add_argument("--jobs", type=int, default=1, help="files converted in parallel")
+    parser.add_argument("--analyze", metavar="CSV", help="write decoded exchanges to csv instead of response table")
+    parser.add_argument("--summary", metavar="CSV", help="write analysis summary to csv, default stdout")
+    parser.add_argument("--client", help="address of our client for poll interval gap to other clients")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.analyze:
+        analyze_files(
+            args.captures, args.analyze, args.summary, args.client, args.port, args.timeout, args.max_pending
+        )
+        return
+
+    captures, output = args.captures, args.output
+    # output file as last argument, like before
+    if output is None and len(captures) > 1 and captures[-1].endswith(".json"):
+        captures, output = captures[:-1], captures[-1]
+
+    udp_pairs = extract_files(captures, args.jobs, args.port, args.timeout, args.max_pending)
+    save_to_json(udp_pairs, output or OUTPUT_FILE)
+
+
+if __name__ == "__main__":
+    main()
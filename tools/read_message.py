@@ -1,5 +1,15 @@
-from communication import read_message
+"""Decode ascii hex frame given as argument with the integration codec.
 
-hex = "hex_heres"
-result = read_message(hex)
-print(result)
\ No newline at end of file
+    python tools/read_message.py 55aa10001e700000000a00e6012c0123250601000800001600100a0b
+"""
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import headless  # noqa: E402, F401
+
+from custom_components.beny_wifi.communication import read_message  # noqa: E402
+
+if __name__ == "__main__":
+    print(read_message(sys.argv[1]))
@@ -0,0 +1,185 @@
+"""Replay frame log recorded by the integration transport.
+
+Recorded responses are fed through the decode pipeline of the coordinator:
+read_message, conversion to snapshot values and value validation. Recorded
+requests can also be sent to a charger simulator or a real charger. Playback
+follows recorded timestamps at 1x, Nx or maximum speed, so an incident
+recorded in production, like a charger flapping between STANDBY and CHARGING
+or DLB power spikes, can be replayed deterministically as a benchmark or
+regression test of the decode and filtering pipeline.
+
+Run from repository root, Home Assistant is not needed:
+
+    python tools/replay_frames.py config/beny_wifi/123456789.frames decode --speed max
+    python tools/replay_frames.py config/beny_wifi/123456789.frames send 127.0.0.1 3333 --speed 10
+"""
+import argparse
+import asyncio
+from collections import Counter
+from collections.abc import Iterator
+import logging
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import headless  # noqa: E402, F401
+
+from custom_components.beny_wifi.client import snapshot_values  # noqa: E402
+from custom_components.beny_wifi.communication import read_message  # noqa: E402
+from custom_components.beny_wifi.const import EXPECTED_RESPONSES, SERVER_MESSAGE  # noqa: E402
+from custom_components.beny_wifi.recorder import RECEIVED, SENT, FrameRecord, read_log  # noqa: E402
+from custom_components.beny_wifi.validation import SnapshotValidator  # noqa: E402
+
+_LOGGER = logging.getLogger(__name__)
+
+# data responses by decoded message type, to request type they answer
+RESPONSE_REQUEST_TYPES = {
+    str(message): request_type
+    for request_type, messages in EXPECTED_RESPONSES.items()
+    for message in messages
+    if message is not SERVER_MESSAGE.ACCESS_DENIED
+}
+
+
+def paced(records: Iterator[FrameRecord], speed: float | None) -> Iterator[tuple[float, FrameRecord]]:
+    """Pair records with their playback time in seconds from start.
+
+    Args:
+        records (Iterator): recorded frames
+        speed (float, optional): playback speed, None for maximum speed
+
+    Yields:
+        tuple: seconds from start of playback, 0 at maximum speed, and record
+
+    """
+    first = None
+    for record in records:
+        if first is None:
+            first = record.timestamp
+        yield (0.0 if speed is None else (record.timestamp - first) / speed), record
+
+
+def decode(
+    path: str, speed: float | None = None, start: float | None = None, validator: SnapshotValidator | None = None
+) -> Iterator[tuple[FrameRecord, dict | None, dict | None]]:
+    """Decode, convert and validate recorded responses in playback time.
+
+    Args:
+        path (str): frame log
+        speed (float, optional): playback speed, None for maximum speed
+        start (float, optional): recorded timestamp to start from
+        validator (SnapshotValidator, optional): validator of decoded values, default bounds if not given
+
+    Yields:
+        tuple: response record, decoded message, None if checksum is not valid, and
+            validated snapshot values, None if response is not data response
+
+    """
+    validator = validator or SnapshotValidator()
+    playback_start = time.monotonic()
+    for offset, record in paced(read_log(path, start), speed):
+        if record.direction != RECEIVED:
+            continue
+        delay = playback_start + offset - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        message = read_message(record.frame)
+        request_type = RESPONSE_REQUEST_TYPES.get(message["message_type"]) if message else None
+        if request_type is None:
+            yield record, message, None
+            continue
+        yield record, message, validator.validate(snapshot_values(request_type, dict(message)))
+
+
+def run_decode(args: argparse.Namespace) -> None:
+    """Decode log and report state transitions, rejected values and throughput."""
+    validator = SnapshotValidator()
+    messages = Counter()
+    state = None
+    started = time.perf_counter()
+    for record, message, snapshot in decode(args.log, args.speed, args.start, validator):
+        if message is None:
+            messages["invalid checksum"] += 1
+            continue
+        messages[message["message_type"]] += 1
+        if snapshot and snapshot.get("state") not in (None, state):
+            print(f"{record.timestamp:.3f} state {state} -> {snapshot['state']}")
+            state = snapshot["state"]
+    elapsed = time.perf_counter() - started
+
+    total = sum(messages.values())
+    for message_type, count in messages.most_common():
+        print(f"{message_type}: {count}")
+    print(f"rejected values: { {field: count for field, count in validator.rejected.items() if count} }")
+    print(f"{total} responses in {elapsed:.3f} s, {total / elapsed if elapsed else 0:.0f} responses/s")
+
+
+class ReplayProtocol(asyncio.DatagramProtocol):
+    """Counts responses to replayed requests."""
+
+    def __init__(self) -> None:
+        """Initialize counters."""
+        self.received = 0
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        """Count response."""
+        self.received += 1
+
+
+async def send(
+    path: str, host: str, port: int, speed: float | None = None, start: float | None = None
+) -> tuple[int, int]:
+    """Send recorded requests to charger in playback time.
+
+    Returns:
+        tuple: number of requests sent and responses received
+
+    """
+    loop = asyncio.get_running_loop()
+    transport, protocol = await loop.create_datagram_endpoint(ReplayProtocol, remote_addr=(host, port))
+    sent = 0
+    try:
+        playback_start = loop.time()
+        for offset, record in paced(read_log(path, start), speed):
+            if record.direction != SENT:
+                continue
+            delay = playback_start + offset - loop.time()
+            # yield to event loop for responses also at maximum speed
+            await asyncio.sleep(max(delay, 0))
+            transport.sendto(record.frame)
+            sent += 1
+        # wait for responses to last requests
+        await asyncio.sleep(1)
+    finally:
+        transport.close()
+    return sent, protocol.received
+
+
+def main() -> None:
+    """Parse arguments and replay log."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("log", help="frame log recorded by the integration")
+    parser.add_argument(
+        "--speed", default="1", help="playback speed, 1 for recorded pace, N for N times faster, max for no waits"
+    )
+    parser.add_argument("--start", type=float, help="recorded timestamp to start from")
+    targets = parser.add_subparsers(dest="target", required=True)
+    targets.add_parser("decode", help="decode and validate responses")
+    send_parser = targets.add_parser("send", help="send requests to charger or simulator")
+    send_parser.add_argument("host")
+    send_parser.add_argument("port", type=int)
+    args = parser.parse_args()
+    args.speed = None if args.speed == "max" else float(args.speed)
+
+    logging.basicConfig(level=logging.WARNING)
+    if args.target == "decode":
+        run_decode(args)
+    else:
+        sent, received = asyncio.run(send(args.log, args.host, args.port, args.speed, args.start))
+        print(f"{sent} requests sent, {received} responses received")
+
+
+if __name__ == "__main__":
+    main()